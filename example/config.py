@@ -25,6 +25,30 @@ if 'CTRL_SERVER_URL' not in config:
 if 'CTRL_SERVER_MAX_WORKERS' not in config:
     config['CTRL_SERVER_MAX_WORKERS'] = 10
 
+# lvm commands are killed after this many seconds or at the deadline of their request, dd only at the deadline
+if 'CTRL_COMMAND_TIMEOUT' not in config:
+    config['CTRL_COMMAND_TIMEOUT'] = 300
+
+if 'CTRL_COMMAND_MAX_PROCESSES' not in config:
+    config['CTRL_COMMAND_MAX_PROCESSES'] = 4
+
+if 'CTRL_METRICS_URL' not in config:
+    config['CTRL_METRICS_URL'] = None
+
+if 'CTRL_TRACE_FILE' not in config:
+    config['CTRL_TRACE_FILE'] = None
+
+if 'NVMET_CONFIGFS_ROOT' not in config:
+    config['NVMET_CONFIGFS_ROOT'] = '/sys/kernel/config/nvmet'
+
+# The cached nvmet tree looks for changes made outside this process at most this often, and reloads at least
+# every CTRL_NVMET_CACHE_MAX_AGE seconds to pick up attributes others wrote
+if 'CTRL_NVMET_CACHE_CHECK_INTERVAL' not in config:
+    config['CTRL_NVMET_CACHE_CHECK_INTERVAL'] = 1
+
+if 'CTRL_NVMET_CACHE_MAX_AGE' not in config:
+    config['CTRL_NVMET_CACHE_MAX_AGE'] = 60
+
 if 'VG' not in config:
     logger.fatal('%s needs to contain a parameter "VG"', CONFIG_FILE_PATH)
     sys.exit('Bad config')
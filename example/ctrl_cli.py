@@ -6,6 +6,8 @@
 import grpc
 import click
 
+from sofa_storage.bdev_qos import qos_options, setQos
+
 from .generated import storage_ctrl_pb2_grpc, storage_ctrl_pb2
 
 CTRL_DEFAULT_URL = "localhost:50051"
@@ -41,7 +43,8 @@ def create(name, capacity_bytes, source_image=None, ctrl_url=CTRL_DEFAULT_URL):
 @click.argument('target_path', type=str)
 @click.argument('encryption_key', type=str, required=False)
 @click.option('--ctrl_url', type=str)
-def attach(volume_id, controller_id, node_id, network, target_path, encryption_key, ctrl_url=CTRL_DEFAULT_URL):
+@qos_options
+def attach(volume_id, controller_id, node_id, network, target_path, encryption_key, ctrl_url=CTRL_DEFAULT_URL, **limits):
     """Attach volume"""
     with grpc.insecure_channel(ctrl_url) as channel:
         stub = storage_ctrl_pb2_grpc.CtrlStub(channel)
@@ -58,6 +61,7 @@ def attach(volume_id, controller_id, node_id, network, target_path, encryption_k
             print('Encryption key must be length 128 bits (16 integers)')
             return
 
+        setQos(request.qos, limits)  # pylint: disable=E1101
         stub.CTRLAttachVolume(request)
     print('Attach volume response:')
 
@@ -78,6 +82,22 @@ def detach(volume_id, node_id, target_path, ctrl_url=CTRL_DEFAULT_URL):
         stub.CTRLDetachVolume(request)
 
 
+@volume.command()
+@click.argument('volume_id', type=str)
+@click.argument('node_id', type=str)
+@click.option('--ctrl_url', type=str)
+@qos_options
+def qos(volume_id, node_id, ctrl_url=CTRL_DEFAULT_URL, **limits):
+    """Change the QoS limits of an attached volume"""
+    with grpc.insecure_channel(ctrl_url) as channel:
+        stub = storage_ctrl_pb2_grpc.CtrlStub(channel)
+        request = storage_ctrl_pb2.CTRLSetVolumeQosRequest()
+        request.volume_id = volume_id
+        request.node_id = node_id
+        setQos(request.qos, limits)  # pylint: disable=E1101
+        stub.CTRLSetVolumeQos(request)
+
+
 @volume.command()
 @click.argument('volume_id', type=str)
 @click.option('--ctrl_url', type=str)
@@ -8,6 +8,8 @@ from concurrent import futures
 from signal import signal, SIGTERM, SIGINT
 
 import grpc
+from sofa_storage import command, metrics, tracing
+
 from .config import config
 from .log import logger
 from .generated import storage_ctrl_pb2_grpc
@@ -18,11 +20,17 @@ class Server:
 
     @staticmethod
     def run():
+        command.configure(config['CTRL_COMMAND_MAX_PROCESSES'], config['CTRL_COMMAND_TIMEOUT'])
         with futures.ThreadPoolExecutor(max_workers=config['CTRL_SERVER_MAX_WORKERS']) as thread_pool:
-            server = grpc.server(thread_pool)
+            if config['CTRL_TRACE_FILE']:
+                tracing.configure('ctrl', tracing.JsonlExporter(config['CTRL_TRACE_FILE']))
+            server = grpc.server(thread_pool, interceptors=[tracing.TracingInterceptor(), metrics.MetricsInterceptor(),
+                                                            command.CommandContextInterceptor()])
             storage_ctrl_pb2_grpc.add_CtrlServicer_to_server(ControlService(), server)
             server.add_insecure_port(config['CTRL_SERVER_URL'])
             server.start()
+            if config['CTRL_METRICS_URL']:
+                metrics.serve(config['CTRL_METRICS_URL'])
 
             def handle_sigterm(*_):
                 logger.info("Received shutdown signal")
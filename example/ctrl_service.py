@@ -9,6 +9,7 @@ import grpc
 from sofa_storage.generated import storage_pb2
 from sofa_storage.generated import storage_pb2_grpc
 from sofa_storage.error import SofaStorageException
+from sofa_storage import tracing
 
 from .config import config
 from .log import logger
@@ -23,6 +24,16 @@ from . import nvmet
 NODES = config['NODES']
 
 
+def dpuChannel(dpu_server_url):
+    return grpc.intercept_channel(grpc.insecure_channel(dpu_server_url), tracing.ClientInterceptor())
+
+
+def copyQos(ctrl_qos, dpu_qos):
+    # storage_ctrl.VolumeQos mirrors storage.VolumeQos, only the limits that are set are copied
+    for field, value in ctrl_qos.ListFields():
+        setattr(dpu_qos, field.name, value)
+
+
 class ControlService(storage_ctrl_pb2_grpc.CtrlServicer):
 
     def CTRLCreateVolume(self, request, context):
@@ -65,7 +76,8 @@ class ControlService(storage_ctrl_pb2_grpc.CtrlServicer):
         dpu_req.target_path = request.target_path
 
         try:
-            po = nvmet.Nvmet().getPortBySubsystem(request.volume_id)
+            with tracing.span('nvmet.getPortBySubsystem'):
+                po = nvmet.Nvmet().getPortBySubsystem(request.volume_id)
             dpu_req.volume_context['addr_adrfam'] = po.addr_adrfam
             dpu_req.volume_context['addr_traddr'] = po.addr_traddr
             dpu_req.volume_context['addr_trsvcid'] = str(po.addr_trsvcid)
@@ -77,9 +89,15 @@ class ControlService(storage_ctrl_pb2_grpc.CtrlServicer):
         if request.secrets:
             dpu_req.secrets['encryption_key'] = request.secrets['encryption_key']
 
-        with grpc.insecure_channel(dpu_server_url) as channel:
+        copyQos(request.qos, dpu_req.qos)
+
+        with dpuChannel(dpu_server_url) as channel:
             stub = storage_pb2_grpc.StorageStub(channel)
-            stub.DPUPublishVolume(dpu_req)
+            try:
+                stub.DPUPublishVolume(dpu_req)
+            except grpc.RpcError as e:
+                context.set_code(e.code())
+                context.set_details(e.details())
         return storage_ctrl_pb2.CTRLAttachVolumeResponse()
 
     def CTRLDetachVolume(self, request, context):
@@ -88,9 +106,13 @@ class ControlService(storage_ctrl_pb2_grpc.CtrlServicer):
         dpu_req = storage_pb2.DPUUnpublishVolumeRequest()
         dpu_req.volume_id = request.volume_id
         dpu_req.target_path = request.target_path
-        with grpc.insecure_channel(dpu_server_url) as channel:
+        with dpuChannel(dpu_server_url) as channel:
             stub = storage_pb2_grpc.StorageStub(channel)
-            stub.DPUUnpublishVolume(dpu_req)
+            try:
+                stub.DPUUnpublishVolume(dpu_req)
+            except grpc.RpcError as e:
+                context.set_code(e.code())
+                context.set_details(e.details())
         return storage_ctrl_pb2.CTRLDetachVolumeResponse()
 
     def CTRLListVolumes(self, request, context):
@@ -136,7 +158,7 @@ class ControlService(storage_ctrl_pb2_grpc.CtrlServicer):
         if request.HasField('model_number'):
             dpu_req.model_number = request.model_number
 
-        with grpc.insecure_channel(dpu_server_url) as channel:
+        with dpuChannel(dpu_server_url) as channel:
             stub = storage_pb2_grpc.StorageStub(channel)
             dpu_rsp = stub.DPUCreateController(dpu_req)
 
@@ -152,8 +174,26 @@ class ControlService(storage_ctrl_pb2_grpc.CtrlServicer):
         dpu_req = storage_pb2.DPUDeleteControllerRequest()
         dpu_req.controller_id = request.controller_id
 
-        with grpc.insecure_channel(dpu_server_url) as channel:
+        with dpuChannel(dpu_server_url) as channel:
             stub = storage_pb2_grpc.StorageStub(channel)
             stub.DPUDeleteController(dpu_req)
 
         return storage_ctrl_pb2.CTRLDeleteControllerResponse()
+
+    def CTRLSetVolumeQos(self, request, context):
+        logger.info('Set Volume QoS %s', request.volume_id)
+        dpu_server_url = NODES[request.node_id]['dpu_server_url']
+
+        dpu_req = storage_pb2.DPUSetVolumeQosRequest()
+        dpu_req.volume_id = request.volume_id
+        copyQos(request.qos, dpu_req.qos)
+
+        with dpuChannel(dpu_server_url) as channel:
+            stub = storage_pb2_grpc.StorageStub(channel)
+            try:
+                stub.DPUSetVolumeQos(dpu_req)
+            except grpc.RpcError as e:
+                context.set_code(e.code())
+                context.set_details(e.details())
+
+        return storage_ctrl_pb2.CTRLSetVolumeQosResponse()
@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\x12storage_ctrl.proto\x12\x0cstorage_ctrl\"\x81\x01\n\x17\x43TRLCreateVolumeRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x16\n\x0e\x63\x61pacity_bytes\x18\x02 \x01(\x04\x12@\n\x15volume_content_source\x18\x03 \x01(\x0b\x32!.storage_ctrl.VolumeContentSource\"\xef\x01\n\x13VolumeContentSource\x12\x44\n\x08snapshot\x18\x01 \x01(\x0b\x32\x30.storage_ctrl.VolumeContentSource.SnapshotSourceH\x00\x12@\n\x06volume\x18\x02 \x01(\x0b\x32..storage_ctrl.VolumeContentSource.VolumeSourceH\x00\x1a%\n\x0eSnapshotSource\x12\x13\n\x0bsnapshot_id\x18\x01 \x01(\t\x1a!\n\x0cVolumeSource\x12\x11\n\tvolume_id\x18\x01 \x01(\tB\x06\n\x04type\"@\n\x18\x43TRLCreateVolumeResponse\x12$\n\x06volume\x18\x01 \x01(\x0b\x32\x14.storage_ctrl.Volume\"\xa1\x01\n\x17\x43TRLDeleteVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x43\n\x07secrets\x18\x02 \x03(\x0b\x32\x32.storage_ctrl.CTRLDeleteVolumeRequest.SecretsEntry\x1a.\n\x0cSecretsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x1a\n\x18\x43TRLDeleteVolumeResponse\"\xef\x01\n\x17\x43TRLAttachVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x15\n\rcontroller_id\x18\x02 \x01(\t\x12\x0f\n\x07node_id\x18\x03 \x01(\t\x12\x0f\n\x07network\x18\x04 \x01(\t\x12\x13\n\x0btarget_path\x18\x05 \x01(\t\x12\x43\n\x07secrets\x18\x06 \x03(\x0b\x32\x32.storage_ctrl.CTRLAttachVolumeRequest.SecretsEntry\x1a.\n\x0cSecretsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x1a\n\x18\x43TRLAttachVolumeResponse\"R\n\x17\x43TRLDetachVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x13\n\x0btarget_path\x18\x03 \x01(\t\"\x1a\n\x18\x43TRLDetachVolumeResponse\"=\n\x16\x43TRLListVolumesRequest\x12\x13\n\x0bmax_entries\x18\x01 \x01(\x05\x12\x0e\n\x06vsi_id\x18\x02 \x01(\t\"\x86\x01\n\x17\x43TRLListVolumesResponse\x12<\n\x07\x65ntries\x18\x01 \x03(\x0b\x32+.storage_ctrl.CTRLListVolumesResponse.Entry\x1a-\n\x05\x45ntry\x12$\n\x06volume\x18\x01 \x01(\x0b\x32\x14.storage_ctrl.Volume\"\xaa\x01\n\x06Volume\x12\x16\n\x0e\x63\x61pacity_bytes\x18\x01 \x01(\x03\x12\x11\n\tvolume_id\x18\x02 \x01(\t\x12?\n\x0evolume_context\x18\x03 \x03(\x0b\x32\'.storage_ctrl.Volume.VolumeContextEntry\x1a\x34\n\x12VolumeContextEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xe7\x01\n\x1b\x43TRLCreateControllerRequest\x12\x15\n\rsubsystem_nqn\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x15\n\x08pf_index\x18\x03 \x01(\x03H\x00\x88\x01\x01\x12\x15\n\x08vf_index\x18\x04 \x01(\x03H\x01\x88\x01\x01\x12\x1a\n\rserial_number\x18\x05 \x01(\tH\x02\x88\x01\x01\x12\x19\n\x0cmodel_number\x18\x06 \x01(\tH\x03\x88\x01\x01\x42\x0b\n\t_pf_indexB\x0b\n\t_vf_indexB\x10\n\x0e_serial_numberB\x0f\n\r_model_number\"5\n\x1c\x43TRLCreateControllerResponse\x12\x15\n\rcontroller_id\x18\x01 \x01(\t\"E\n\x1b\x43TRLDeleteControllerRequest\x12\x15\n\rcontroller_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\"\x1e\n\x1c\x43TRLDeleteControllerResponse2\xde\x05\n\x04\x43trl\x12\x63\n\x10\x43TRLCreateVolume\x12%.storage_ctrl.CTRLCreateVolumeRequest\x1a&.storage_ctrl.CTRLCreateVolumeResponse\"\x00\x12\x63\n\x10\x43TRLDeleteVolume\x12%.storage_ctrl.CTRLDeleteVolumeRequest\x1a&.storage_ctrl.CTRLDeleteVolumeResponse\"\x00\x12\x63\n\x10\x43TRLAttachVolume\x12%.storage_ctrl.CTRLAttachVolumeRequest\x1a&.storage_ctrl.CTRLAttachVolumeResponse\"\x00\x12\x63\n\x10\x43TRLDetachVolume\x12%.storage_ctrl.CTRLDetachVolumeRequest\x1a&.storage_ctrl.CTRLDetachVolumeResponse\"\x00\x12`\n\x0f\x43TRLListVolumes\x12$.storage_ctrl.CTRLListVolumesRequest\x1a%.storage_ctrl.CTRLListVolumesResponse\"\x00\x12o\n\x14\x43TRLCreateController\x12).storage_ctrl.CTRLCreateControllerRequest\x1a*.storage_ctrl.CTRLCreateControllerResponse\"\x00\x12o\n\x14\x43TRLDeleteController\x12).storage_ctrl.CTRLDeleteControllerRequest\x1a*.storage_ctrl.CTRLDeleteControllerResponse\"\x00\x62\x06proto3'
+  serialized_pb=b'\n\x12storage_ctrl.proto\x12\x0cstorage_ctrl\"\x81\x01\n\x17\x43TRLCreateVolumeRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x16\n\x0e\x63\x61pacity_bytes\x18\x02 \x01(\x04\x12@\n\x15volume_content_source\x18\x03 \x01(\x0b\x32!.storage_ctrl.VolumeContentSource\"\xef\x01\n\x13VolumeContentSource\x12\x44\n\x08snapshot\x18\x01 \x01(\x0b\x32\x30.storage_ctrl.VolumeContentSource.SnapshotSourceH\x00\x12@\n\x06volume\x18\x02 \x01(\x0b\x32..storage_ctrl.VolumeContentSource.VolumeSourceH\x00\x1a%\n\x0eSnapshotSource\x12\x13\n\x0bsnapshot_id\x18\x01 \x01(\t\x1a!\n\x0cVolumeSource\x12\x11\n\tvolume_id\x18\x01 \x01(\tB\x06\n\x04type\"@\n\x18\x43TRLCreateVolumeResponse\x12$\n\x06volume\x18\x01 \x01(\x0b\x32\x14.storage_ctrl.Volume\"\xa1\x01\n\x17\x43TRLDeleteVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x43\n\x07secrets\x18\x02 \x03(\x0b\x32\x32.storage_ctrl.CTRLDeleteVolumeRequest.SecretsEntry\x1a.\n\x0cSecretsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x1a\n\x18\x43TRLDeleteVolumeResponse\"\x95\x02\n\x17\x43TRLAttachVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x15\n\rcontroller_id\x18\x02 \x01(\t\x12\x0f\n\x07node_id\x18\x03 \x01(\t\x12\x0f\n\x07network\x18\x04 \x01(\t\x12\x13\n\x0btarget_path\x18\x05 \x01(\t\x12\x43\n\x07secrets\x18\x06 \x03(\x0b\x32\x32.storage_ctrl.CTRLAttachVolumeRequest.SecretsEntry\x12$\n\x03qos\x18\x07 \x01(\x0b\x32\x17.storage_ctrl.VolumeQos\x1a.\n\x0cSecretsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd9\x01\n\tVolumeQos\x12\x1b\n\x0erw_ios_per_sec\x18\x01 \x01(\x04H\x00\x88\x01\x01\x12\x1e\n\x11rw_mbytes_per_sec\x18\x02 \x01(\x04H\x01\x88\x01\x01\x12\x1d\n\x10r_mbytes_per_sec\x18\x03 \x01(\x04H\x02\x88\x01\x01\x12\x1d\n\x10w_mbytes_per_sec\x18\x04 \x01(\x04H\x03\x88\x01\x01\x42\x11\n\x0f_rw_ios_per_secB\x14\n\x12_rw_mbytes_per_secB\x13\n\x11_r_mbytes_per_secB\x13\n\x11_w_mbytes_per_sec\"\x1a\n\x18\x43TRLAttachVolumeResponse\"R\n\x17\x43TRLDetachVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x13\n\x0btarget_path\x18\x03 \x01(\t\"\x1a\n\x18\x43TRLDetachVolumeResponse\"=\n\x16\x43TRLListVolumesRequest\x12\x13\n\x0bmax_entries\x18\x01 \x01(\x05\x12\x0e\n\x06vsi_id\x18\x02 \x01(\t\"\x86\x01\n\x17\x43TRLListVolumesResponse\x12<\n\x07\x65ntries\x18\x01 \x03(\x0b\x32+.storage_ctrl.CTRLListVolumesResponse.Entry\x1a-\n\x05\x45ntry\x12$\n\x06volume\x18\x01 \x01(\x0b\x32\x14.storage_ctrl.Volume\"\xaa\x01\n\x06Volume\x12\x16\n\x0e\x63\x61pacity_bytes\x18\x01 \x01(\x03\x12\x11\n\tvolume_id\x18\x02 \x01(\t\x12?\n\x0evolume_context\x18\x03 \x03(\x0b\x32\'.storage_ctrl.Volume.VolumeContextEntry\x1a\x34\n\x12VolumeContextEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xe7\x01\n\x1b\x43TRLCreateControllerRequest\x12\x15\n\rsubsystem_nqn\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12\x15\n\x08pf_index\x18\x03 \x01(\x03H\x00\x88\x01\x01\x12\x15\n\x08vf_index\x18\x04 \x01(\x03H\x01\x88\x01\x01\x12\x1a\n\rserial_number\x18\x05 \x01(\tH\x02\x88\x01\x01\x12\x19\n\x0cmodel_number\x18\x06 \x01(\tH\x03\x88\x01\x01\x42\x0b\n\t_pf_indexB\x0b\n\t_vf_indexB\x10\n\x0e_serial_numberB\x0f\n\r_model_number\"5\n\x1c\x43TRLCreateControllerResponse\x12\x15\n\rcontroller_id\x18\x01 \x01(\t\"E\n\x1b\x43TRLDeleteControllerRequest\x12\x15\n\rcontroller_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\"\x1e\n\x1c\x43TRLDeleteControllerResponse\"c\n\x17\x43TRLSetVolumeQosRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x0f\n\x07node_id\x18\x02 \x01(\t\x12$\n\x03qos\x18\x03 \x01(\x0b\x32\x17.storage_ctrl.VolumeQos\"\x1a\n\x18\x43TRLSetVolumeQosResponse2\xc3\x06\n\x04\x43trl\x12\x63\n\x10\x43TRLCreateVolume\x12%.storage_ctrl.CTRLCreateVolumeRequest\x1a&.storage_ctrl.CTRLCreateVolumeResponse\"\x00\x12\x63\n\x10\x43TRLDeleteVolume\x12%.storage_ctrl.CTRLDeleteVolumeRequest\x1a&.storage_ctrl.CTRLDeleteVolumeResponse\"\x00\x12\x63\n\x10\x43TRLAttachVolume\x12%.storage_ctrl.CTRLAttachVolumeRequest\x1a&.storage_ctrl.CTRLAttachVolumeResponse\"\x00\x12\x63\n\x10\x43TRLDetachVolume\x12%.storage_ctrl.CTRLDetachVolumeRequest\x1a&.storage_ctrl.CTRLDetachVolumeResponse\"\x00\x12`\n\x0f\x43TRLListVolumes\x12$.storage_ctrl.CTRLListVolumesRequest\x1a%.storage_ctrl.CTRLListVolumesResponse\"\x00\x12o\n\x14\x43TRLCreateController\x12).storage_ctrl.CTRLCreateControllerRequest\x1a*.storage_ctrl.CTRLCreateControllerResponse\"\x00\x12o\n\x14\x43TRLDeleteController\x12).storage_ctrl.CTRLDeleteControllerRequest\x1a*.storage_ctrl.CTRLDeleteControllerResponse\"\x00\x12\x63\n\x10\x43TRLSetVolumeQos\x12%.storage_ctrl.CTRLSetVolumeQosRequest\x1a&.storage_ctrl.CTRLSetVolumeQosResponse\"\x00\x62\x06proto3'
 )
 
 
@@ -399,6 +399,13 @@ _CTRLATTACHVOLUMEREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='qos', full_name='storage_ctrl.CTRLAttachVolumeRequest.qos', index=6,
+      number=7, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -412,7 +419,80 @@ _CTRLATTACHVOLUMEREQUEST = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=669,
-  serialized_end=908,
+  serialized_end=946,
+)
+
+
+_VOLUMEQOS = _descriptor.Descriptor(
+  name='VolumeQos',
+  full_name='storage_ctrl.VolumeQos',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='rw_ios_per_sec', full_name='storage_ctrl.VolumeQos.rw_ios_per_sec', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='rw_mbytes_per_sec', full_name='storage_ctrl.VolumeQos.rw_mbytes_per_sec', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='r_mbytes_per_sec', full_name='storage_ctrl.VolumeQos.r_mbytes_per_sec', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='w_mbytes_per_sec', full_name='storage_ctrl.VolumeQos.w_mbytes_per_sec', index=3,
+      number=4, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='_rw_ios_per_sec', full_name='storage_ctrl.VolumeQos._rw_ios_per_sec',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_rw_mbytes_per_sec', full_name='storage_ctrl.VolumeQos._rw_mbytes_per_sec',
+      index=1, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_r_mbytes_per_sec', full_name='storage_ctrl.VolumeQos._r_mbytes_per_sec',
+      index=2, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_w_mbytes_per_sec', full_name='storage_ctrl.VolumeQos._w_mbytes_per_sec',
+      index=3, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+  ],
+  serialized_start=949,
+  serialized_end=1166,
 )
 
 
@@ -436,8 +516,8 @@ _CTRLATTACHVOLUMERESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=910,
-  serialized_end=936,
+  serialized_start=1168,
+  serialized_end=1194,
 )
 
 
@@ -482,8 +562,8 @@ _CTRLDETACHVOLUMEREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=938,
-  serialized_end=1020,
+  serialized_start=1196,
+  serialized_end=1278,
 )
 
 
@@ -507,8 +587,8 @@ _CTRLDETACHVOLUMERESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1022,
-  serialized_end=1048,
+  serialized_start=1280,
+  serialized_end=1306,
 )
 
 
@@ -546,8 +626,8 @@ _CTRLLISTVOLUMESREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1050,
-  serialized_end=1111,
+  serialized_start=1308,
+  serialized_end=1369,
 )
 
 
@@ -578,8 +658,8 @@ _CTRLLISTVOLUMESRESPONSE_ENTRY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1203,
-  serialized_end=1248,
+  serialized_start=1461,
+  serialized_end=1506,
 )
 
 _CTRLLISTVOLUMESRESPONSE = _descriptor.Descriptor(
@@ -609,8 +689,8 @@ _CTRLLISTVOLUMESRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1114,
-  serialized_end=1248,
+  serialized_start=1372,
+  serialized_end=1506,
 )
 
 
@@ -648,8 +728,8 @@ _VOLUME_VOLUMECONTEXTENTRY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1369,
-  serialized_end=1421,
+  serialized_start=1627,
+  serialized_end=1679,
 )
 
 _VOLUME = _descriptor.Descriptor(
@@ -693,8 +773,8 @@ _VOLUME = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1251,
-  serialized_end=1421,
+  serialized_start=1509,
+  serialized_end=1679,
 )
 
 
@@ -780,8 +860,8 @@ _CTRLCREATECONTROLLERREQUEST = _descriptor.Descriptor(
       create_key=_descriptor._internal_create_key,
     fields=[]),
   ],
-  serialized_start=1424,
-  serialized_end=1655,
+  serialized_start=1682,
+  serialized_end=1913,
 )
 
 
@@ -812,8 +892,8 @@ _CTRLCREATECONTROLLERRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1657,
-  serialized_end=1710,
+  serialized_start=1915,
+  serialized_end=1968,
 )
 
 
@@ -851,8 +931,8 @@ _CTRLDELETECONTROLLERREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1712,
-  serialized_end=1781,
+  serialized_start=1970,
+  serialized_end=2039,
 )
 
 
@@ -876,8 +956,79 @@ _CTRLDELETECONTROLLERRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=1783,
-  serialized_end=1813,
+  serialized_start=2041,
+  serialized_end=2071,
+)
+
+
+_CTRLSETVOLUMEQOSREQUEST = _descriptor.Descriptor(
+  name='CTRLSetVolumeQosRequest',
+  full_name='storage_ctrl.CTRLSetVolumeQosRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='volume_id', full_name='storage_ctrl.CTRLSetVolumeQosRequest.volume_id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='node_id', full_name='storage_ctrl.CTRLSetVolumeQosRequest.node_id', index=1,
+      number=2, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='qos', full_name='storage_ctrl.CTRLSetVolumeQosRequest.qos', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2073,
+  serialized_end=2172,
+)
+
+
+_CTRLSETVOLUMEQOSRESPONSE = _descriptor.Descriptor(
+  name='CTRLSetVolumeQosResponse',
+  full_name='storage_ctrl.CTRLSetVolumeQosResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=2174,
+  serialized_end=2200,
 )
 
 _CTRLCREATEVOLUMEREQUEST.fields_by_name['volume_content_source'].message_type = _VOLUMECONTENTSOURCE
@@ -896,6 +1047,19 @@ _CTRLDELETEVOLUMEREQUEST_SECRETSENTRY.containing_type = _CTRLDELETEVOLUMEREQUEST
 _CTRLDELETEVOLUMEREQUEST.fields_by_name['secrets'].message_type = _CTRLDELETEVOLUMEREQUEST_SECRETSENTRY
 _CTRLATTACHVOLUMEREQUEST_SECRETSENTRY.containing_type = _CTRLATTACHVOLUMEREQUEST
 _CTRLATTACHVOLUMEREQUEST.fields_by_name['secrets'].message_type = _CTRLATTACHVOLUMEREQUEST_SECRETSENTRY
+_CTRLATTACHVOLUMEREQUEST.fields_by_name['qos'].message_type = _VOLUMEQOS
+_VOLUMEQOS.oneofs_by_name['_rw_ios_per_sec'].fields.append(
+  _VOLUMEQOS.fields_by_name['rw_ios_per_sec'])
+_VOLUMEQOS.fields_by_name['rw_ios_per_sec'].containing_oneof = _VOLUMEQOS.oneofs_by_name['_rw_ios_per_sec']
+_VOLUMEQOS.oneofs_by_name['_rw_mbytes_per_sec'].fields.append(
+  _VOLUMEQOS.fields_by_name['rw_mbytes_per_sec'])
+_VOLUMEQOS.fields_by_name['rw_mbytes_per_sec'].containing_oneof = _VOLUMEQOS.oneofs_by_name['_rw_mbytes_per_sec']
+_VOLUMEQOS.oneofs_by_name['_r_mbytes_per_sec'].fields.append(
+  _VOLUMEQOS.fields_by_name['r_mbytes_per_sec'])
+_VOLUMEQOS.fields_by_name['r_mbytes_per_sec'].containing_oneof = _VOLUMEQOS.oneofs_by_name['_r_mbytes_per_sec']
+_VOLUMEQOS.oneofs_by_name['_w_mbytes_per_sec'].fields.append(
+  _VOLUMEQOS.fields_by_name['w_mbytes_per_sec'])
+_VOLUMEQOS.fields_by_name['w_mbytes_per_sec'].containing_oneof = _VOLUMEQOS.oneofs_by_name['_w_mbytes_per_sec']
 _CTRLLISTVOLUMESRESPONSE_ENTRY.fields_by_name['volume'].message_type = _VOLUME
 _CTRLLISTVOLUMESRESPONSE_ENTRY.containing_type = _CTRLLISTVOLUMESRESPONSE
 _CTRLLISTVOLUMESRESPONSE.fields_by_name['entries'].message_type = _CTRLLISTVOLUMESRESPONSE_ENTRY
@@ -913,12 +1077,14 @@ _CTRLCREATECONTROLLERREQUEST.fields_by_name['serial_number'].containing_oneof =
 _CTRLCREATECONTROLLERREQUEST.oneofs_by_name['_model_number'].fields.append(
   _CTRLCREATECONTROLLERREQUEST.fields_by_name['model_number'])
 _CTRLCREATECONTROLLERREQUEST.fields_by_name['model_number'].containing_oneof = _CTRLCREATECONTROLLERREQUEST.oneofs_by_name['_model_number']
+_CTRLSETVOLUMEQOSREQUEST.fields_by_name['qos'].message_type = _VOLUMEQOS
 DESCRIPTOR.message_types_by_name['CTRLCreateVolumeRequest'] = _CTRLCREATEVOLUMEREQUEST
 DESCRIPTOR.message_types_by_name['VolumeContentSource'] = _VOLUMECONTENTSOURCE
 DESCRIPTOR.message_types_by_name['CTRLCreateVolumeResponse'] = _CTRLCREATEVOLUMERESPONSE
 DESCRIPTOR.message_types_by_name['CTRLDeleteVolumeRequest'] = _CTRLDELETEVOLUMEREQUEST
 DESCRIPTOR.message_types_by_name['CTRLDeleteVolumeResponse'] = _CTRLDELETEVOLUMERESPONSE
 DESCRIPTOR.message_types_by_name['CTRLAttachVolumeRequest'] = _CTRLATTACHVOLUMEREQUEST
+DESCRIPTOR.message_types_by_name['VolumeQos'] = _VOLUMEQOS
 DESCRIPTOR.message_types_by_name['CTRLAttachVolumeResponse'] = _CTRLATTACHVOLUMERESPONSE
 DESCRIPTOR.message_types_by_name['CTRLDetachVolumeRequest'] = _CTRLDETACHVOLUMEREQUEST
 DESCRIPTOR.message_types_by_name['CTRLDetachVolumeResponse'] = _CTRLDETACHVOLUMERESPONSE
@@ -929,6 +1095,8 @@ DESCRIPTOR.message_types_by_name['CTRLCreateControllerRequest'] = _CTRLCREATECON
 DESCRIPTOR.message_types_by_name['CTRLCreateControllerResponse'] = _CTRLCREATECONTROLLERRESPONSE
 DESCRIPTOR.message_types_by_name['CTRLDeleteControllerRequest'] = _CTRLDELETECONTROLLERREQUEST
 DESCRIPTOR.message_types_by_name['CTRLDeleteControllerResponse'] = _CTRLDELETECONTROLLERRESPONSE
+DESCRIPTOR.message_types_by_name['CTRLSetVolumeQosRequest'] = _CTRLSETVOLUMEQOSREQUEST
+DESCRIPTOR.message_types_by_name['CTRLSetVolumeQosResponse'] = _CTRLSETVOLUMEQOSRESPONSE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 CTRLCreateVolumeRequest = _reflection.GeneratedProtocolMessageType('CTRLCreateVolumeRequest', (_message.Message,), {
@@ -1005,6 +1173,13 @@ CTRLAttachVolumeRequest = _reflection.GeneratedProtocolMessageType('CTRLAttachVo
 _sym_db.RegisterMessage(CTRLAttachVolumeRequest)
 _sym_db.RegisterMessage(CTRLAttachVolumeRequest.SecretsEntry)
 
+VolumeQos = _reflection.GeneratedProtocolMessageType('VolumeQos', (_message.Message,), {
+  'DESCRIPTOR' : _VOLUMEQOS,
+  '__module__' : 'storage_ctrl_pb2'
+  # @@protoc_insertion_point(class_scope:storage_ctrl.VolumeQos)
+  })
+_sym_db.RegisterMessage(VolumeQos)
+
 CTRLAttachVolumeResponse = _reflection.GeneratedProtocolMessageType('CTRLAttachVolumeResponse', (_message.Message,), {
   'DESCRIPTOR' : _CTRLATTACHVOLUMERESPONSE,
   '__module__' : 'storage_ctrl_pb2'
@@ -1091,6 +1266,20 @@ CTRLDeleteControllerResponse = _reflection.GeneratedProtocolMessageType('CTRLDel
   })
 _sym_db.RegisterMessage(CTRLDeleteControllerResponse)
 
+CTRLSetVolumeQosRequest = _reflection.GeneratedProtocolMessageType('CTRLSetVolumeQosRequest', (_message.Message,), {
+  'DESCRIPTOR' : _CTRLSETVOLUMEQOSREQUEST,
+  '__module__' : 'storage_ctrl_pb2'
+  # @@protoc_insertion_point(class_scope:storage_ctrl.CTRLSetVolumeQosRequest)
+  })
+_sym_db.RegisterMessage(CTRLSetVolumeQosRequest)
+
+CTRLSetVolumeQosResponse = _reflection.GeneratedProtocolMessageType('CTRLSetVolumeQosResponse', (_message.Message,), {
+  'DESCRIPTOR' : _CTRLSETVOLUMEQOSRESPONSE,
+  '__module__' : 'storage_ctrl_pb2'
+  # @@protoc_insertion_point(class_scope:storage_ctrl.CTRLSetVolumeQosResponse)
+  })
+_sym_db.RegisterMessage(CTRLSetVolumeQosResponse)
+
 
 _CTRLDELETEVOLUMEREQUEST_SECRETSENTRY._options = None
 _CTRLATTACHVOLUMEREQUEST_SECRETSENTRY._options = None
@@ -1103,8 +1292,8 @@ _CTRL = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_start=1816,
-  serialized_end=2550,
+  serialized_start=2203,
+  serialized_end=3038,
   methods=[
   _descriptor.MethodDescriptor(
     name='CTRLCreateVolume',
@@ -1176,6 +1365,16 @@ _CTRL = _descriptor.ServiceDescriptor(
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='CTRLSetVolumeQos',
+    full_name='storage_ctrl.Ctrl.CTRLSetVolumeQos',
+    index=7,
+    containing_service=None,
+    input_type=_CTRLSETVOLUMEQOSREQUEST,
+    output_type=_CTRLSETVOLUMEQOSRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_CTRL)
 
@@ -51,6 +51,11 @@ class CtrlStub(object):
                 request_serializer=storage__ctrl__pb2.CTRLDeleteControllerRequest.SerializeToString,
                 response_deserializer=storage__ctrl__pb2.CTRLDeleteControllerResponse.FromString,
                 )
+        self.CTRLSetVolumeQos = channel.unary_unary(
+                '/storage_ctrl.Ctrl/CTRLSetVolumeQos',
+                request_serializer=storage__ctrl__pb2.CTRLSetVolumeQosRequest.SerializeToString,
+                response_deserializer=storage__ctrl__pb2.CTRLSetVolumeQosResponse.FromString,
+                )
 
 
 class CtrlServicer(object):
@@ -100,6 +105,12 @@ class CtrlServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CTRLSetVolumeQos(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_CtrlServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -138,6 +149,11 @@ def add_CtrlServicer_to_server(servicer, server):
                     request_deserializer=storage__ctrl__pb2.CTRLDeleteControllerRequest.FromString,
                     response_serializer=storage__ctrl__pb2.CTRLDeleteControllerResponse.SerializeToString,
             ),
+            'CTRLSetVolumeQos': grpc.unary_unary_rpc_method_handler(
+                    servicer.CTRLSetVolumeQos,
+                    request_deserializer=storage__ctrl__pb2.CTRLSetVolumeQosRequest.FromString,
+                    response_serializer=storage__ctrl__pb2.CTRLSetVolumeQosResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'storage_ctrl.Ctrl', rpc_method_handlers)
@@ -268,3 +284,20 @@ class Ctrl(object):
             storage__ctrl__pb2.CTRLDeleteControllerResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CTRLSetVolumeQos(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/storage_ctrl.Ctrl/CTRLSetVolumeQos',
+            storage__ctrl__pb2.CTRLSetVolumeQosRequest.SerializeToString,
+            storage__ctrl__pb2.CTRLSetVolumeQosResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
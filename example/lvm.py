@@ -3,7 +3,8 @@
   All rights reserved.
   SPDX-License-Identifier: Apache-2.0
 """
-import subprocess  # nosec
+from sofa_storage.command import CommandException, runCommand
+
 from .config import config
 from .log import logger
 from .error import SofaStorageControlExampleException
@@ -11,9 +12,17 @@ from .error import SofaStorageControlExampleException
 VG = config['VG']
 
 
+def _run(argv, command, **kwargs):
+    try:
+        return runCommand(argv, 'lvm', command, **kwargs)
+    except (CommandException, OSError) as e:
+        logger.error('%s failed: %s', command, e)
+        raise SofaStorageControlExampleException from e
+
+
 def listVolumes():
     volumes = []
-    cmd = subprocess.run(['lvs', '-o', 'lv_name,lv_size', '--units', 'B'], capture_output=True, check=False)  # nosec
+    cmd = _run(['lvs', '-o', 'lv_name,lv_size', '--units', 'B'], 'lvs')
     if cmd.returncode == 0:
         lines = cmd.stdout.splitlines()
         for line in lines[1:]:
@@ -29,14 +38,14 @@ def listVolumes():
 
 def createVolume(name, size):
     size_str = str(size) + 'B'
-    cmd = subprocess.run(['lvcreate', '-L', size_str, '-n', name, VG], capture_output=True, check=False)  # nosec
+    cmd = _run(['lvcreate', '-L', size_str, '-n', name, VG], 'lvcreate')
     if cmd.returncode != 0:
         logger.error('Creating volume failed: %s', cmd.stderr)
         raise SofaStorageControlExampleException
 
 
 def deleteVolume(name):
-    cmd = subprocess.run(['lvremove', '-y', f'/dev/{VG}/{name}'], capture_output=True, check=False)  # nosec
+    cmd = _run(['lvremove', '-y', f'/dev/{VG}/{name}'], 'lvremove')
     if cmd.returncode != 0:
         logger.error('Deleting volume failed: %s', cmd.stderr)
         raise SofaStorageControlExampleException
@@ -45,7 +54,8 @@ def deleteVolume(name):
 def populateVolume(name, src_name):
     if_path = f'if=/dev/{VG}/{src_name}'
     of_path = f'of=/dev/{VG}/{name}'
-    cmd = subprocess.run(['dd', if_path, of_path], capture_output=True, check=False)  # nosec
+    # Copying a whole volume takes as long as it takes, only the request deadline applies
+    cmd = _run(['dd', if_path, of_path], 'dd', timeout=None)
     if cmd.returncode != 0:
         logger.error('Populating volume failed: %s', cmd.stderr)
         raise SofaStorageControlExampleException
@@ -3,47 +3,263 @@
   All rights reserved.
   SPDX-License-Identifier: Apache-2.0
 """
+import os
+import threading
+import time
 from os import listdir, symlink, unlink, mkdir, rmdir
 from os.path import isdir, isfile, islink, join, realpath
 
+from sofa_storage.metrics import timed
+
 from .config import config
 
 
+def _parse(data):
+    try:
+        return int(data)
+    except ValueError:
+        return data
+
+
+class NvmetTree():
+    """In-process snapshot of the nvmet configfs tree: ports, subsystems, namespaces, port links and attributes.
+
+    Structure is loaded once and kept up to date by the mutations of this module, attributes are read once each.
+    Changes made by others are noticed by the modification times and link counts of the tree's directories, checked
+    at most every check_interval seconds. Attributes others write are only seen after a reload, at the latest
+    max_age seconds after the last one.
+    """
+
+    def __init__(self, root, check_interval, max_age):
+        self._root = root
+        self._check_interval = check_interval
+        self._max_age = max_age
+        self._lock = threading.RLock()
+        self._loaded_at = None
+        self._checked_at = None
+        self._stats = {}
+        self._ports = {}
+        self._subsystems = {}
+        self._port_by_subsystem = {}
+        self._attrs = {}
+
+    def _path(self, *names):
+        return join(self._root, *names)
+
+    @staticmethod
+    def _stat(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_nlink
+
+    @staticmethod
+    def _list(path):
+        try:
+            return listdir(realpath(path))
+        except FileNotFoundError:
+            return []
+
+    def _track(self, *names):
+        # Called after our own changes, so they don't look like somebody else's on the next check
+        path = self._path(*names)
+        self._stats[path] = self._stat(path)
+
+    def _load(self):
+        with timed('configfs', 'load'):
+            self._stats = {}
+            self._ports = {}
+            self._subsystems = {}
+            self._port_by_subsystem = {}
+            self._attrs = {}
+            for name in ('ports', 'subsystems'):
+                self._track(name)
+            for subsystem in self._list(self._path('subsystems')):
+                self._track('subsystems', subsystem, 'namespaces')
+                self._subsystems[subsystem] = set(self._list(self._path('subsystems', subsystem, 'namespaces')))
+            for port in self._list(self._path('ports')):
+                self._track('ports', port, 'subsystems')
+                self._ports[port] = set(self._list(self._path('ports', port, 'subsystems')))
+                for subsystem in self._ports[port]:
+                    self._port_by_subsystem.setdefault(subsystem, port)
+        self._loaded_at = self._checked_at = time.monotonic()
+
+    def _fresh(self):
+        now = time.monotonic()
+        if self._loaded_at is None or now - self._loaded_at >= self._max_age:
+            self._load()
+        elif now - self._checked_at >= self._check_interval:
+            with timed('configfs', 'check'):
+                changed = any(self._stat(path) != stat for path, stat in self._stats.items())
+            if changed:
+                self._load()
+            self._checked_at = now
+
+    def ports(self):
+        with self._lock:
+            self._fresh()
+            return sorted(self._ports)
+
+    def subsystems(self):
+        with self._lock:
+            self._fresh()
+            return sorted(self._subsystems)
+
+    def namespaces(self, subsystem):
+        with self._lock:
+            self._fresh()
+            return sorted(self._subsystems.get(subsystem, ()))
+
+    def portSubsystems(self, port):
+        with self._lock:
+            self._fresh()
+            return sorted(self._ports.get(port, ()))
+
+    def portBySubsystem(self, subsystem):
+        with self._lock:
+            self._fresh()
+            return self._port_by_subsystem.get(subsystem)
+
+    def getAttr(self, path, name):
+        with self._lock:
+            self._fresh()
+            if (path, name) not in self._attrs:
+                p = realpath(join(path, name))
+                if isfile(p):
+                    with timed('configfs', 'read'), open(p, 'r', encoding='utf-8') as f:
+                        self._attrs[(path, name)] = _parse(f.read()[:-1])
+                else:
+                    self._attrs[(path, name)] = None
+            return self._attrs[(path, name)]
+
+    def setAttr(self, path, name, val):
+        with self._lock:
+            p = realpath(join(path, name))
+            if not isfile(p):
+                raise RuntimeError
+            with timed('configfs', 'write'), open(p, 'w', encoding='utf-8') as f:
+                f.write(str(val))
+            self._attrs[(path, name)] = _parse(str(val))
+
+    def _forget(self, path):
+        for key in [key for key in self._attrs if key[0] == path]:
+            del self._attrs[key]
+
+    def addSubsystem(self, subsystem):
+        with self._lock:
+            self._fresh()
+            self._subsystems.setdefault(subsystem, set())
+            self._track('subsystems')
+            self._track('subsystems', subsystem, 'namespaces')
+
+    def removeSubsystem(self, subsystem, path):
+        with self._lock:
+            self._subsystems.pop(subsystem, None)
+            self._stats.pop(self._path('subsystems', subsystem, 'namespaces'), None)
+            self._track('subsystems')
+            self._forget(path)
+
+    def addNamespace(self, subsystem, namespace):
+        with self._lock:
+            self._fresh()
+            self._subsystems.setdefault(subsystem, set()).add(namespace)
+            self._track('subsystems', subsystem, 'namespaces')
+
+    def removeNamespace(self, subsystem, namespace, path):
+        with self._lock:
+            self._subsystems.get(subsystem, set()).discard(namespace)
+            self._track('subsystems', subsystem, 'namespaces')
+            self._forget(path)
+
+    def addPort(self, port):
+        with self._lock:
+            self._fresh()
+            self._ports.setdefault(port, set())
+            self._track('ports')
+            self._track('ports', port, 'subsystems')
+
+    def allocatePort(self, first=1):
+        """Creates the lowest numbered free port and returns its name.
+
+        The snapshot only picks the candidates, mkdir decides, so a port created by someone else since the last check
+        is skipped instead of shared.
+        """
+        with self._lock:
+            self._fresh()
+            port = first
+            while True:
+                if str(port) not in self._ports:
+                    try:
+                        with timed('configfs', 'mkdir'):
+                            mkdir(realpath(self._path('ports', str(port))))
+                    except FileExistsError:
+                        pass
+                    else:
+                        self.addPort(str(port))
+                        return str(port)
+                port += 1
+
+    def removePort(self, port, path):
+        with self._lock:
+            for subsystem in self._ports.pop(port, ()):
+                if self._port_by_subsystem.get(subsystem) == port:
+                    del self._port_by_subsystem[subsystem]
+            self._stats.pop(self._path('ports', port, 'subsystems'), None)
+            self._track('ports')
+            self._forget(path)
+
+    def link(self, port, subsystem):
+        with self._lock:
+            self._fresh()
+            self._ports.setdefault(port, set()).add(subsystem)
+            self._port_by_subsystem.setdefault(subsystem, port)
+            self._track('ports', port, 'subsystems')
+
+    def unlink(self, port, subsystem):
+        with self._lock:
+            self._ports.get(port, set()).discard(subsystem)
+            if self._port_by_subsystem.get(subsystem) == port:
+                del self._port_by_subsystem[subsystem]
+                # Another port may still export it
+                for other, subsystems in self._ports.items():
+                    if subsystem in subsystems:
+                        self._port_by_subsystem[subsystem] = other
+                        break
+            self._track('ports', port, 'subsystems')
+
+
+_tree = NvmetTree(config['NVMET_CONFIGFS_ROOT'], config['CTRL_NVMET_CACHE_CHECK_INTERVAL'], config['CTRL_NVMET_CACHE_MAX_AGE'])
+
+
 class Component():
     def __init__(self, path):
         self._path = path
 
     def getAttr(self, name):
-        p = realpath(join(self._path, name))
-        if isfile(p):
-            with open(p, 'r', encoding='utf-8') as f:
-                data = f.read()[:-1]
-                try:
-                    return int(data)
-                except ValueError:
-                    return data
-        else:
-            return None
+        return _tree.getAttr(self._path, name)
 
     def setAttr(self, name, val):
-        p = realpath(join(self._path, name))
-        if isfile(p):
-            with open(p, 'w', encoding='utf-8') as f:
-                f.write(str(val))
-        else:
-            raise RuntimeError
+        _tree.setAttr(self._path, name, val)
 
     def delete(self):
         p = self._path
         if isdir(p):
-            rmdir(p)
+            with timed('configfs', 'rmdir'):
+                rmdir(p)
+            return True
+        return False
 
 
 class Subsystem(Component):
     def __init__(self, name):
-        super().__init__('/sys/kernel/config/nvmet/subsystems/' + name + '/')
+        super().__init__(join(config['NVMET_CONFIGFS_ROOT'], 'subsystems', name, ''))
         self.name = name
 
+    def delete(self):
+        if super().delete():
+            _tree.removeSubsystem(self.name, self._path)
+
     @property
     def attr_allow_any_host(self):
         return self.getAttr('attr_allow_any_host')
@@ -53,10 +269,7 @@ class Subsystem(Component):
         self.setAttr('attr_allow_any_host', val)
 
     def namespaces(self):
-        ns = []
-        for i in listdir(realpath(join(self._path, 'namespaces'))):
-            ns.append(Namespace(self.name, i))
-        return ns
+        return [Namespace(self.name, i) for i in _tree.namespaces(self.name)]
 
     def dump(self):
         print('Subsystem: ' + self.name
@@ -65,16 +278,22 @@ class Subsystem(Component):
     def createNamespace(self, namespace_name):
         p = realpath(join(self._path, 'namespaces', namespace_name))
         if not isdir(p):
-            mkdir(p)
+            with timed('configfs', 'mkdir'):
+                mkdir(p)
+        _tree.addNamespace(self.name, namespace_name)
         return Namespace(self.name, namespace_name)
 
 
 class Namespace(Component):
     def __init__(self, subsysname, name):
-        super().__init__('/sys/kernel/config/nvmet/subsystems/' + subsysname + '/namespaces/' + name + '/')
+        super().__init__(join(config['NVMET_CONFIGFS_ROOT'], 'subsystems', subsysname, 'namespaces', name, ''))
         self.subsysname = subsysname
         self.name = name
 
+    def delete(self):
+        if super().delete():
+            _tree.removeNamespace(self.subsysname, self.name, self._path)
+
     @property
     def enable(self):
         return self.getAttr('enable')
@@ -107,9 +326,13 @@ class Namespace(Component):
 
 class Port(Component):
     def __init__(self, name):
-        super().__init__('/sys/kernel/config/nvmet/ports/' + name + '/')
+        super().__init__(join(config['NVMET_CONFIGFS_ROOT'], 'ports', name, ''))
         self.name = name
 
+    def delete(self):
+        if super().delete():
+            _tree.removePort(self.name, self._path)
+
     @property
     def addr_adrfam(self):
         return self.getAttr('addr_adrfam')  # ipv4
@@ -153,20 +376,21 @@ class Port(Component):
 
     @property
     def subsystems(self):
-        subsystem_list = []
-        for i in listdir(realpath(join(self._path, 'subsystems'))):
-            subsystem_list.append(Subsystem(i))
-        return subsystem_list
+        return [Subsystem(i) for i in _tree.portSubsystems(self.name)]
 
     def linkSubsystem(self, subsys):
         p = join(self._path, 'subsystems', subsys.name)
         if not islink(p):
-            symlink(subsys._path, p, target_is_directory=True)
+            with timed('configfs', 'symlink'):
+                symlink(subsys._path, p, target_is_directory=True)
+        _tree.link(self.name, subsys.name)
 
     def removeSubsystem(self, subsys):
         p = join(self._path, 'subsystems', subsys.name)
         if islink(p):
-            unlink(p)
+            with timed('configfs', 'unlink'):
+                unlink(p)
+        _tree.unlink(self.name, subsys.name)
 
     def dump(self):
         print('Port: ' + self.name
@@ -178,40 +402,38 @@ class Port(Component):
 
 class Nvmet(Component):
     def __init__(self):
-        super().__init__('/sys/kernel/config/nvmet/')
+        super().__init__(join(config['NVMET_CONFIGFS_ROOT'], ''))
 
     @property
     def ports(self):
-        port_list = []
-        for i in listdir(realpath(join(self._path, 'ports'))):
-            port_list.append(Port(i))
-        return port_list
+        return [Port(i) for i in _tree.ports()]
 
     @property
     def subsystems(self):
-        subsystem_list = []
-        for i in listdir(realpath(join(self._path, 'subsystems'))):
-            subsystem_list.append(Subsystem(i))
-        return subsystem_list
+        return [Subsystem(i) for i in _tree.subsystems()]
 
     def createSubsystem(self, subsys_name):
         p = realpath(join(self._path, 'subsystems', subsys_name))
         if not isdir(p):
-            mkdir(p)
+            with timed('configfs', 'mkdir'):
+                mkdir(p)
+        _tree.addSubsystem(subsys_name)
         return Subsystem(subsys_name)
 
     def createPort(self, port_name):
         p = realpath(join(self._path, 'ports', port_name))
         if not isdir(p):
-            mkdir(p)
+            with timed('configfs', 'mkdir'):
+                mkdir(p)
+        _tree.addPort(port_name)
         return Port(port_name)
 
+    def createFreePort(self):
+        return Port(_tree.allocatePort())
+
     def getPortBySubsystem(self, subsys_name):
-        for po in self.ports:
-            for s in po.subsystems:
-                if s.name == subsys_name:
-                    return po
-        return None
+        port_name = _tree.portBySubsystem(subsys_name)
+        return Port(port_name) if port_name is not None else None
 
 
 def publishVolume(volume_id):
@@ -222,14 +444,10 @@ def publishVolume(volume_id):
     tn.device_path = '/dev/' + config['VG'] + '/' + volume_id
     tn.enable = 1
 
-    port = 1
-    while str(port) in [port.name for port in nvmet.ports]:
-        port = port + 1
-
-    tp = nvmet.createPort(str(port))
+    tp = nvmet.createFreePort()
     tp.addr_adrfam = 'ipv4'
     tp.addr_traddr = config['NVMET_TRADDR']
-    tp.addr_trsvcid = 4420 + port - 1
+    tp.addr_trsvcid = 4420 + int(tp.name) - 1
     tp.addr_trtype = config['TRANSPORT_TYPE']
 
     tp.linkSubsystem(ts)
@@ -240,13 +458,9 @@ def publishVolume(volume_id):
 
 
 def unpublishVolume(volume_id):
-    nvmet = Nvmet()
-    for po in nvmet.ports:
-        for s in po.subsystems:
-            if s.name == volume_id:
-                po.removeSubsystem(s)
-                po.delete()
-                break
+    for po in [Port(name) for name in _tree.ports() if volume_id in _tree.portSubsystems(name)]:
+        po.removeSubsystem(Subsystem(volume_id))
+        po.delete()
     ns = Namespace(volume_id, config['NAMESPACE'])
     ss = Subsystem(volume_id)
     ns.delete()
@@ -0,0 +1,257 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+
+import grpc
+
+from .error import SofaStorageException
+
+TEARDOWN = 'teardown'
+PUBLISH = 'publish'
+CONTROLLER = 'controller'
+INFO = 'info'
+LANES = [TEARDOWN, PUBLISH, CONTROLLER, INFO]  # highest priority first
+
+METHOD_LANES = {'DPUUnpublishVolume': TEARDOWN, 'DPUUnpublishVolumes': TEARDOWN, 'DPUDeleteController': TEARDOWN,
+                'DPUPublishVolume': PUBLISH, 'DPUPublishVolumes': PUBLISH, 'DPUSetVolumeQos': PUBLISH,
+                'DPUCreateController': CONTROLLER,
+                'DPUGetInfo': INFO}
+
+RETRY_AFTER_KEY = 'retry-after-ms'
+MIN_RETRY_AFTER_MS = 100
+MAX_WAIT = 86400  # longer deadlines are treated as none
+
+
+class AdmissionLaneException(SofaStorageException):
+
+    def __init__(self, lane):
+        super().__init__()
+        self.lane = lane
+
+    def __str__(self):
+        return f'Unknown admission lane {self.lane}, expected one of {", ".join(LANES)}'
+
+
+class AdmissionRejected(SofaStorageException):
+
+    def __init__(self, lane, retry_after_ms):
+        super().__init__()
+        self.lane = lane
+        self.retry_after_ms = retry_after_ms
+
+    def __str__(self):
+        return f'Too many {self.lane} requests, retry in {self.retry_after_ms} ms'
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class _Lane():
+
+    def __init__(self, limit, queue):
+        self.limit = limit
+        self.queue = queue
+        self.running = 0
+        self.waiters = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.service_seconds = None
+
+
+class _Waiter():
+
+    def __init__(self, grant):
+        self.granted = False
+        self.enqueued = time.monotonic()
+        self._grant = grant
+
+    def grant(self):
+        self.granted = True
+        self._grant()
+
+
+class Admission():
+    """Admits requests into slots shared by priority lanes.
+
+    Each lane runs at most limit requests at once and queues at most queue more, further requests are rejected
+    with a retry hint. A freed slot goes to the highest priority lane with a queued request below its limit, so
+    a lane whose limit is below slots can never take the slots a higher lane needs.
+    """
+
+    def __init__(self, slots, lanes):
+        for lane in lanes:
+            if lane not in LANES:
+                raise AdmissionLaneException(lane)
+        self._free = slots
+        self._lock = threading.Lock()
+        self._lanes = {}
+        for lane in LANES:
+            settings = lanes.get(lane, {})
+            self._lanes[lane] = _Lane(settings.get('limit', slots), settings.get('queue', slots))
+
+    @property
+    def queue_bound(self):
+        return sum(lane.queue for lane in self._lanes.values())
+
+    def _retryAfter(self, lane):
+        if lane.service_seconds is None:
+            return 1000
+        return max(MIN_RETRY_AFTER_MS, int(lane.service_seconds * (len(lane.waiters) + 1) / lane.limit * 1000))
+
+    def _start(self, lane):
+        lane.running += 1
+        lane.admitted += 1
+        self._free -= 1
+
+    def _admit(self, name, waiter):
+        """Called with the lock held, True if the request may run now and False if it was queued."""
+        lane = self._lanes[name]
+        if self._free > 0 and lane.running < lane.limit and not lane.waiters:
+            self._start(lane)
+            return True
+        if len(lane.waiters) >= lane.queue:
+            lane.rejected += 1
+            raise AdmissionRejected(name, self._retryAfter(lane))
+        lane.waiters.append(waiter)
+        return False
+
+    def _waited(self, name, waiter):
+        seconds = time.monotonic() - waiter.enqueued
+        with self._lock:
+            lane = self._lanes[name]
+            lane.waited += 1
+            lane.wait_seconds += seconds
+            lane.max_wait_seconds = max(lane.max_wait_seconds, seconds)
+
+    def _abandon(self, name, waiter):
+        """Takes a waiter whose caller gave up out of its queue, returns False if it was granted meanwhile."""
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._lanes[name].waiters.remove(waiter)
+            return True
+
+    def _release(self, name, seconds=None):
+        with self._lock:
+            lane = self._lanes[name]
+            lane.running -= 1
+            self._free += 1
+            if seconds is not None:
+                lane.service_seconds = seconds if lane.service_seconds is None else 0.8 * lane.service_seconds + 0.2 * seconds
+            for other in LANES:
+                other = self._lanes[other]
+                while self._free > 0 and other.waiters and other.running < other.limit:
+                    self._start(other)
+                    other.waiters.popleft().grant()
+
+    def _run(self, name, method, *args):
+        started = time.monotonic()
+        try:
+            return method(*args)
+        finally:
+            self._release(name, time.monotonic() - started)
+
+    def call(self, name, timeout, method, *args):
+        granted = threading.Event()
+        waiter = _Waiter(granted.set)
+        with self._lock:
+            admitted = self._admit(name, waiter)
+        if not admitted:
+            if not granted.wait(timeout if timeout is not None and timeout < MAX_WAIT else None) \
+                    and self._abandon(name, waiter):
+                with self._lock:
+                    retry_after_ms = self._retryAfter(self._lanes[name])
+                raise AdmissionRejected(name, retry_after_ms)
+            self._waited(name, waiter)
+        return self._run(name, method, *args)
+
+    async def callAsync(self, name, method, *args):
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+        waiter = _Waiter(lambda: loop.call_soon_threadsafe(_resolve, granted))
+        with self._lock:
+            admitted = self._admit(name, waiter)
+        if not admitted:
+            try:
+                await granted
+            except asyncio.CancelledError:
+                if not self._abandon(name, waiter):
+                    self._release(name)
+                raise
+            self._waited(name, waiter)
+        started = time.monotonic()
+        try:
+            return await method(*args)
+        finally:
+            self._release(name, time.monotonic() - started)
+
+    def stats(self):
+        with self._lock:
+            return {name: {'running': lane.running, 'queued': len(lane.waiters), 'admitted': lane.admitted,
+                           'rejected': lane.rejected, 'waited': lane.waited, 'wait_seconds': lane.wait_seconds,
+                           'max_wait_seconds': lane.max_wait_seconds}
+                    for name, lane in self._lanes.items()}
+
+
+def _wrap(handler, behavior):
+    return grpc.unary_unary_rpc_method_handler(behavior, request_deserializer=handler.request_deserializer,
+                                               response_serializer=handler.response_serializer)
+
+
+def _lane(handler, handler_call_details):
+    if handler is None or handler.unary_unary is None:
+        return None
+    return METHOD_LANES.get(handler_call_details.method.rsplit('/', 1)[-1])
+
+
+class AdmissionInterceptor(grpc.ServerInterceptor):
+
+    def __init__(self, admission):
+        self._admission = admission
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        lane = _lane(handler, handler_call_details)
+        if lane is None:
+            return handler
+
+        def behavior(request, context):
+            try:
+                return self._admission.call(lane, context.time_remaining(), handler.unary_unary, request, context)
+            except AdmissionRejected as e:
+                context.set_trailing_metadata(((RETRY_AFTER_KEY, str(e.retry_after_ms)),))
+                context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+                return None
+        return _wrap(handler, behavior)
+
+
+class AsyncAdmissionInterceptor(grpc.aio.ServerInterceptor):
+
+    def __init__(self, admission):
+        self._admission = admission
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        lane = _lane(handler, handler_call_details)
+        if lane is None:
+            return handler
+
+        async def behavior(request, context):
+            try:
+                return await self._admission.callAsync(lane, handler.unary_unary, request, context)
+            except AdmissionRejected as e:
+                context.set_trailing_metadata(((RETRY_AFTER_KEY, str(e.retry_after_ms)),))
+                await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+                return None
+        return _wrap(handler, behavior)
@@ -0,0 +1,66 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import click
+
+from .error import SofaStorageException
+
+# VolumeQos fields, named like the bdev_set_qos_limit parameters they set
+QOS_LIMITS = ['rw_ios_per_sec', 'rw_mbytes_per_sec', 'r_mbytes_per_sec', 'w_mbytes_per_sec']
+# SPDK enforces IOPS limits in steps of its minimum
+QOS_IOS_PER_SEC_STEP = 1000
+
+
+class QosException(SofaStorageException):
+
+    def __init__(self, limit, value, reason):
+        super().__init__()
+        self.limit = limit
+        self.value = value
+        self.reason = reason
+
+    def __str__(self):
+        return f'Invalid QoS limit {self.limit}={self.value}: {self.reason}'
+
+
+def qosFromMessage(message):
+    """Returns the limits set in a VolumeQos message, 0 meaning unlimited."""
+    return {field.name: value for field, value in message.ListFields()}
+
+
+def setQos(message, limits):
+    """Sets the limits given to qos_options on a VolumeQos message."""
+    for limit, value in limits.items():
+        if value is not None:
+            setattr(message, limit, value)
+
+
+def qos_options(command):
+    """Adds a CLI option for each QoS limit to a click command."""
+    command = click.option('--rw_ios_per_sec', type=int, help='Read/write IOPS limit, multiple of 1000, 0 for none')(command)
+    command = click.option('--rw_mbytes_per_sec', type=int, help='Read/write bandwidth limit in MB/s, 0 for none')(command)
+    command = click.option('--r_mbytes_per_sec', type=int, help='Read bandwidth limit in MB/s, 0 for none')(command)
+    command = click.option('--w_mbytes_per_sec', type=int, help='Write bandwidth limit in MB/s, 0 for none')(command)
+    return command
+
+
+def validateQos(qos):
+    for limit, value in qos.items():
+        if limit not in QOS_LIMITS:
+            raise QosException(limit, value, f'expected one of {", ".join(QOS_LIMITS)}')
+        if value < 0:
+            raise QosException(limit, value, 'must not be negative')
+        if limit == 'rw_ios_per_sec' and value % QOS_IOS_PER_SEC_STEP != 0:
+            raise QosException(limit, value, f'must be a multiple of {QOS_IOS_PER_SEC_STEP}')
+
+
+def qosParams(bdev_name, qos):
+    params = {'name': bdev_name}
+    params.update(qos)
+    return params
+
+
+def qosReset(qos):
+    return {limit: 0 for limit in qos}
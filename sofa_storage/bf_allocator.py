@@ -0,0 +1,113 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import threading
+import time
+
+
+class FunctionAllocator():
+    """Tracks used emulation functions as one bitmap per PF.
+
+    Bit 0 of a PF's bitmap is the PF itself, bit vf + 1 is its VF vf.
+    """
+
+    def __init__(self, number_of_pf, number_of_vf_per_pf, reservation_ttl):
+        self._number_of_pf = number_of_pf
+        self._bits = number_of_vf_per_pf + 1
+        self._full_mask = (1 << self._bits) - 1
+        self._reservation_ttl = reservation_ttl
+        self._lock = threading.Lock()
+        self._used = [0] * number_of_pf
+        self._free = [self._bits] * number_of_pf
+        self._reservations = {}
+
+    def _valid(self, pf_index, vf_index):
+        return 0 <= pf_index < self._number_of_pf and -1 <= vf_index < self._bits - 1
+
+    def _set(self, pf_index, vf_index):
+        bit = 1 << (vf_index + 1)
+        if not self._used[pf_index] & bit:
+            self._used[pf_index] |= bit
+            self._free[pf_index] -= 1
+
+    def _clear(self, pf_index, vf_index):
+        bit = 1 << (vf_index + 1)
+        if self._used[pf_index] & bit:
+            self._used[pf_index] &= ~bit
+            self._free[pf_index] += 1
+
+    def _expireReservations(self):
+        now = time.monotonic()
+        expired = [function for function, deadline in self._reservations.items() if deadline <= now]
+        for function in expired:
+            del self._reservations[function]
+            self._clear(*function)
+
+    def _candidates(self, pf_index, vf_index, order):
+        # Same selection rules as the original getAvailableFunctions: no VF index means the PF itself,
+        # no index at all means any function
+        if vf_index is not None:
+            mask = 1 << (vf_index + 1)
+        elif pf_index is not None:
+            mask = 1
+        else:
+            mask = self._full_mask
+        if pf_index is not None:
+            pf_indexes = [pf_index]
+        elif order is not None:
+            # Evaluated under the lock, so concurrent reservations see each other
+            pf_indexes = order([self._bits - free for free in self._free])
+        else:
+            pf_indexes = range(self._number_of_pf)
+        return pf_indexes, mask
+
+    def reset(self, functions):
+        with self._lock:
+            self._used = [0] * self._number_of_pf
+            self._free = [self._bits] * self._number_of_pf
+            for function in list(functions) + list(self._reservations):
+                if self._valid(*function):
+                    self._set(*function)
+
+    def reserve(self, pf_index=None, vf_index=None, order=None):
+        with self._lock:
+            if self._reservations:
+                self._expireReservations()
+            if pf_index is not None and not 0 <= pf_index < self._number_of_pf:
+                return -1, -1
+            if vf_index is not None and not 0 <= vf_index < self._bits - 1:
+                return -1, -1
+            candidates, mask = self._candidates(pf_index, vf_index, order)
+            for pf in candidates:
+                free = ~self._used[pf] & mask
+                if free:
+                    vf = (free & -free).bit_length() - 2
+                    self._set(pf, vf)
+                    self._reservations[(pf, vf)] = time.monotonic() + self._reservation_ttl
+                    return pf, vf
+            return -1, -1
+
+    def commit(self, pf_index, vf_index):
+        with self._lock:
+            self._reservations.pop((pf_index, vf_index), None)
+            if self._valid(pf_index, vf_index):
+                self._set(pf_index, vf_index)
+
+    def release(self, pf_index, vf_index):
+        with self._lock:
+            if self._reservations.pop((pf_index, vf_index), None) is not None:
+                self._clear(pf_index, vf_index)
+
+    def free(self, pf_index, vf_index):
+        with self._lock:
+            self._reservations.pop((pf_index, vf_index), None)
+            if self._valid(pf_index, vf_index):
+                self._clear(pf_index, vf_index)
+
+    def freeCount(self, pf_index=None):
+        with self._lock:
+            if pf_index is None:
+                return sum(self._free)
+            return self._free[pf_index]
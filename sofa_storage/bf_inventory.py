@@ -0,0 +1,119 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import re
+import threading
+import time
+
+from .log import logger
+from .error import SofaStorageException
+from .jsonrpc import JsonRpcException
+
+
+class TargetPathException(SofaStorageException):
+
+    def __init__(self, target_path):
+        super().__init__()
+        self.target_path = target_path
+
+    def __str__(self):
+        return f'Invalid target path {self.target_path!r}: expected a namespace id at its end, e.g. /dev/nvme0n2'
+
+
+def controllerName(pf_index, vf_index):
+    name = 'NvmeEmu0pf' + str(pf_index)
+    if vf_index >= 0:
+        name = name + 'vf' + str(vf_index)
+    return name
+
+
+def parseControllerId(controller_id):
+    # Controller ids are the PF index followed by the VF index, if any: '0' is PF0, '012' is PF0 VF12
+    pf_index = int(controller_id[0])
+    vf_index = -1
+
+    if len(str(controller_id)) > 1:
+        vf_index = int(controller_id[1:])
+    return pf_index, vf_index
+
+
+def parseNamespaceId(target_path):
+    match = re.search(r'\d+$', target_path)  # i.e. /dev/nvme0n2  --> 2
+    if match is None or int(match.group()) == 0:
+        raise TargetPathException(target_path)
+    return int(match.group())
+
+
+def parseControllerName(name):
+    digits = list(map(int, re.findall(r'\d+', name)))
+
+    if len(digits) == 2:
+        return digits[1], -1  # This is a PF
+    if len(digits) == 3:
+        return digits[1], digits[2]  # This is a VF
+    return None
+
+
+class ControllerInventory():
+    """Emulated controllers known to SNAP, loaded once and kept up to date by the plugin's own create/delete calls."""
+
+    def __init__(self, snap, refresh_interval, allocator):
+        self._snap = snap
+        self._refresh_interval = refresh_interval
+        self._allocator = allocator
+        self._lock = threading.Lock()
+        self._loaded_at = None
+
+    def load(self, controllers=None):
+        if controllers is None:
+            try:
+                controllers = self._snap.call('controller_list')
+            except (JsonRpcException, OSError) as e:
+                logger.error('controller_list failed: %s', e)
+                return False
+
+        functions = set()
+        for controller in controllers:
+            function = parseControllerName(controller['name'])
+            if function is not None:
+                functions.add(function)
+
+        self._allocator.reset(functions)
+        with self._lock:
+            self._loaded_at = time.monotonic()
+        logger.debug('Controller inventory loaded: %d controllers', len(functions))
+        return True
+
+    def _refresh(self):
+        with self._lock:
+            if self._loaded_at is None:
+                stale = True
+            elif self._refresh_interval <= 0:
+                stale = False
+            else:
+                stale = time.monotonic() - self._loaded_at > self._refresh_interval
+        if stale:
+            self.load()
+
+    def reserve(self, pf_index, vf_index, order=None):
+        self._refresh()
+        return self._allocator.reserve(pf_index, vf_index, order)
+
+    def commit(self, pf_index, vf_index):
+        self._allocator.commit(pf_index, vf_index)
+
+    def release(self, pf_index, vf_index):
+        self._allocator.release(pf_index, vf_index)
+
+    def remove(self, pf_index, vf_index):
+        self._allocator.free(pf_index, vf_index)
+
+    def freeCount(self):
+        return self._allocator.freeCount()
+
+    def invalidate(self):
+        # Our view disagreed with SNAP, re-check it on the next allocation
+        with self._lock:
+            self._loaded_at = None
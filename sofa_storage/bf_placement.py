@@ -0,0 +1,103 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import threading
+import time
+
+from .log import logger
+from .error import SofaStorageException
+from .jsonrpc import JsonRpcException
+from .bf_inventory import parseControllerName
+
+FIRST_FIT = 'first_fit'
+BALANCED = 'balanced'
+PLACEMENT_POLICIES = [FIRST_FIT, BALANCED]
+
+
+class PlacementPolicyException(SofaStorageException):
+
+    def __init__(self, policy):
+        super().__init__()
+        self.policy = policy
+
+    def __str__(self):
+        return f'Unknown placement policy {self.policy}, expected one of {", ".join(PLACEMENT_POLICIES)}'
+
+
+class Placement():
+    """Decides on which PF a new emulated controller is created.
+
+    first_fit fills PF0 before PF1. balanced prefers the emulation manager and then the PF with the lowest load, where
+    the load of a PF is its used functions plus its attached namespaces plus its I/O rate in units of
+    iops_per_controller, taken from SPDK's bdev_get_iostat at most every iostat_interval seconds.
+    """
+
+    def __init__(self, policy, managers, state, spdk, iostat_interval, iops_per_controller):
+        if policy not in PLACEMENT_POLICIES:
+            raise PlacementPolicyException(policy)
+        self._policy = policy
+        self._managers = managers
+        self._state = state
+        self._spdk = spdk
+        self._iostat_interval = iostat_interval
+        self._iops_per_controller = iops_per_controller
+        self._lock = threading.Lock()
+        self._sampled_at = None
+        self._ops = {}
+        self._rates = {}
+
+    @staticmethod
+    def _bdevOps(iostat):
+        # Newer SPDK returns {'tick_rate': .., 'bdevs': [..]}, older a list starting with the tick rate
+        bdevs = iostat.get('bdevs', []) if isinstance(iostat, dict) else iostat
+        return {bdev['name']: bdev.get('num_read_ops', 0) + bdev.get('num_write_ops', 0)
+                for bdev in bdevs if 'name' in bdev}
+
+    def _ioRates(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._sampled_at is not None and now - self._sampled_at < self._iostat_interval:
+                return self._rates
+            try:
+                ops = self._bdevOps(self._spdk.call('bdev_get_iostat'))
+            except (JsonRpcException, OSError) as e:
+                logger.warning('bdev_get_iostat failed, placing by namespace count only: %s', e)
+                return self._rates
+            if self._sampled_at is not None:
+                elapsed = now - self._sampled_at
+                self._rates = {name: max(0, count - self._ops.get(name, count)) / elapsed for name, count in ops.items()}
+            self._sampled_at = now
+            self._ops = ops
+            return self._rates
+
+    def _namespaceLoad(self):
+        rates = self._ioRates()
+        load = {}
+        for controller, attached in self._state.namespaces().items():
+            function = parseControllerName(controller)
+            if function is None:
+                continue
+            pf_load = len(attached) + sum(rates.get(bdev, 0) for bdev in attached.values()) / self._iops_per_controller
+            load[function[0]] = load.get(function[0], 0) + pf_load
+        return load
+
+    def emulationManager(self, pf_index):
+        return self._managers[min(pf_index, len(self._managers) - 1)]
+
+    def order(self):
+        """Returns None for first_fit, else a function ordering PFs by load given their used function counts."""
+        if self._policy == FIRST_FIT:
+            return None
+        namespace_load = self._namespaceLoad()
+
+        def byLoad(used):
+            load = [used[pf] + namespace_load.get(pf, 0) for pf in range(len(used))]
+            manager_load = {}
+            for pf, pf_load in enumerate(load):
+                manager_load.setdefault(self.emulationManager(pf), []).append(pf_load)
+            # Mean load per PF, so managers with more PFs are not penalized
+            manager_load = {manager: sum(loads) / len(loads) for manager, loads in manager_load.items()}
+            return sorted(range(len(used)), key=lambda pf: (manager_load[self.emulationManager(pf)], load[pf], pf))
+        return byLoad
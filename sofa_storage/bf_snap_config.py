@@ -0,0 +1,128 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import copy
+import json
+import os
+import tempfile
+import threading
+
+from .log import logger
+from .command import CommandException, runCommand
+
+
+class SnapConfig():
+    """In-memory copy of mlnx_snap.json.
+
+    Backend changes only touch the in-memory copy. The first change of a burst arms a timer, when it fires the whole
+    batch is written with one atomic replace of the file and SNAP is reloaded once, then on_reload is called.
+    """
+
+    def __init__(self, path, debounce, reload_cmd, on_reload=None):
+        self._path = path
+        self._debounce = debounce
+        self._reload_cmd = reload_cmd
+        self._on_reload = on_reload
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._config = None
+        self._timer = None
+        # Volumes sharing a backend, so it is only dropped with the last one
+        self._users = {}
+
+    def _load(self):
+        if self._config is None:
+            with open(self._path, 'r', encoding='utf-8') as json_file:
+                self._config = json.load(json_file)
+            self._config.setdefault('backends', [])
+
+    def _schedule(self):
+        if self._timer is None:
+            # Not a daemon thread, so a pending batch is still written when the server exits
+            self._timer = threading.Timer(self._debounce, self.flush)
+            self._timer.start()
+
+    def addBackend(self, name, addr, port, hostnqn='host1'):
+        with self._lock:
+            self._load()
+            users = self._users.setdefault((addr, port), set())
+            users.add(name)
+            for backend in self._config['backends']:
+                for path in backend['paths']:
+                    if (path['addr'] == addr) and (path['port'] == port):
+                        return
+            self._config['backends'].append(
+                {
+                    'type': 'nvmf_rdma',
+                    'name': name,
+                    'paths': [{
+                        'addr': addr,
+                        'port': port,
+                        'hostnqn': hostnqn
+                    }]
+                }
+            )
+            self._schedule()
+
+    def removeBackend(self, name, addr, port):
+        with self._lock:
+            self._load()
+            users = self._users.get((addr, port), set())
+            users.discard(name)
+            if users:
+                return
+            self._users.pop((addr, port), None)
+            backends = [backend for backend in self._config['backends']
+                        if not any((path['addr'] == addr) and (path['port'] == port) for path in backend['paths'])]
+            if len(backends) != len(self._config['backends']):
+                self._config['backends'] = backends
+                self._schedule()
+
+    def _write(self, snap_config):
+        directory = os.path.dirname(self._path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.mlnx_snap.', suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as outfile:
+                json.dump(snap_config, outfile, indent=4)
+                outfile.flush()
+                os.fsync(outfile.fileno())
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def flush(self):
+        # Serialize flushes so an older snapshot can never replace a newer one on disk
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is None:
+                    return
+                self._timer.cancel()
+                self._timer = None
+                snap_config = copy.deepcopy(self._config)
+
+            try:
+                self._write(snap_config)
+            except OSError as e:
+                logger.error('Writing %s failed: %s', self._path, e)
+                return
+            logger.info('Wrote %s with %d backends', self._path, len(snap_config['backends']))
+
+            if self._reload_cmd:
+                try:
+                    cmd = runCommand(self._reload_cmd, 'snap', 'reload')
+                except (CommandException, OSError) as e:
+                    logger.error('Reloading SNAP failed: %s', e)
+                    return
+                if cmd.returncode != 0:
+                    logger.error('Reloading SNAP failed\n%s\n%s', cmd.stdout, cmd.stderr)
+                    return
+                if self._on_reload is not None:
+                    self._on_reload()
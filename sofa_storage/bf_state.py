@@ -0,0 +1,237 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import re
+import threading
+
+from .log import logger
+
+
+def nvmeControllerName(bdev_name):
+    # bdev_nvme_attach_controller names its bdevs <controller>n<nsid>
+    return re.sub(r'n\d+$', '', bdev_name)
+
+
+class DPUState():
+    """In-memory model of the volumes and emulated controller namespaces on the DPU.
+
+    Built with a single scan of SPDK and SNAP at startup and then kept in sync by the plugin's own mutations. With a
+    journal the volume ids survive restarts, without it scanned volumes are named after their NVMe-oF controller.
+    A journal shared with other processes also carries their volume changes, sync() applies them, bdev_name names
+    the bdev a volume attaches to its namespace.
+    """
+
+    def __init__(self, journal=None, bdev_name=None):
+        self._lock = threading.Lock()
+        self._journal = journal
+        self._bdev_name = bdev_name
+        self._volumes = journal.volumes() if journal is not None else {}
+        self._namespaces = {}
+        self._idle = []
+
+    @staticmethod
+    def _scanBdevs(spdk):
+        bdevs = {}
+        for bdev in spdk.call('bdev_get_bdevs'):
+            driver_specific = bdev.get('driver_specific', {})
+            entry = {'base': None, 'trid': None, 'key_name': None,
+                     'qos': {limit: value for limit, value in bdev.get('assigned_rate_limits', {}).items() if value}}
+            if 'nvme' in driver_specific:
+                nvme = driver_specific['nvme']
+                if isinstance(nvme, list):
+                    nvme = nvme[0] if nvme else {}
+                entry['trid'] = nvme.get('trid')
+            elif 'crypto' in driver_specific:
+                entry['base'] = driver_specific['crypto'].get('base_bdev_name')
+                entry['key_name'] = driver_specific['crypto'].get('key_name')
+            bdevs[bdev['name']] = entry
+        return bdevs
+
+    @staticmethod
+    def _scanNamespaces(snap, controllers):
+        namespaces = {}
+        for controller in controllers:
+            listing = snap.call('controller_nvme_namespace_list', {'ctrl': controller['name']})
+            if isinstance(listing, dict):
+                listing = listing.get('Namespaces', [])
+            namespaces[controller['name']] = {int(ns['nsid']): ns['bdev'] for ns in listing}
+        return namespaces
+
+    @staticmethod
+    def _volumeFromChain(bdevs, bdev_name):
+        crypto_bdev_name = None
+        crypto_key = None
+        bdev = bdevs.get(bdev_name)
+        qos = bdev['qos'] if bdev is not None else {}
+        if bdev is not None and bdev['base'] is not None:
+            crypto_bdev_name = bdev_name
+            crypto_key = bdev['key_name']
+            bdev_name = bdev['base']
+            bdev = bdevs.get(bdev_name)
+        if bdev is None or not bdev['trid']:
+            return None
+        trid = bdev['trid']
+        target = (trid.get('trtype', '').lower(), trid.get('traddr'), str(trid.get('trsvcid')), trid.get('subnqn'))
+        return {'target': target, 'nvme': nvmeControllerName(bdev_name), 'crypto': crypto_bdev_name, 'crypto_key': crypto_key,
+                'qos': qos}
+
+    def _scan(self, spdk, snap, journaled):
+        bdevs = self._scanBdevs(spdk)
+        controllers = snap.call('controller_list')
+        namespaces = self._scanNamespaces(snap, controllers)
+
+        journaled = {(volume['controller'], volume['nsid']): volume_id for volume_id, volume in journaled.items()}
+        volumes = {}
+        for controller, attached in namespaces.items():
+            for nsid, bdev_name in attached.items():
+                volume = self._volumeFromChain(bdevs, bdev_name)
+                if volume is not None:
+                    volume.update({'controller': controller, 'nsid': nsid})
+                    volumes[journaled.get((controller, nsid), volume['nvme'])] = volume
+
+        # NVMe-oF controllers that are connected but not exposed to the host, e.g. warm pool leftovers
+        in_use = {volume['nvme'] for volume in volumes.values()}
+        idle = []
+        for bdev_name in bdevs:
+            volume = self._volumeFromChain(bdevs, bdev_name)
+            if volume is not None and volume['crypto'] is None and volume['nvme'] not in in_use:
+                in_use.add(volume['nvme'])
+                idle.append((volume['target'], volume['nvme']))
+        return volumes, namespaces, idle, controllers
+
+    def scan(self, spdk, snap):
+        if self._journal is None:
+            scanned = self._scan(spdk, snap, {})
+        else:
+            scanned = []
+
+            def build(journaled):
+                scanned.extend(self._scan(spdk, snap, journaled))
+                # Drop volumes that disappeared while the plugin was down
+                return scanned[0]
+            # Holds the journal, so no other worker process journals a volume the scan already missed
+            self._journal.rebuild(build)
+        volumes, namespaces, idle, controllers = scanned
+
+        with self._lock:
+            self._volumes = volumes
+            self._namespaces = namespaces
+            self._idle = idle
+        return controllers
+
+    def _apply(self, changes):
+        # Called with the lock held
+        for volume_id, volume in changes:
+            previous = self._volumes.pop(volume_id, None)
+            if previous is not None:
+                self._namespaces.get(previous['controller'], {}).pop(previous['nsid'], None)
+            if volume is not None:
+                self._volumes[volume_id] = volume
+                self._namespaces.setdefault(volume['controller'], {})[volume['nsid']] = self._bdev_name(volume)
+
+    def sync(self):
+        if self._journal is None:
+            return
+        changes = self._journal.sync()
+        if changes:
+            with self._lock:
+                self._apply(changes)
+
+    def idleControllers(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+            return idle
+
+    def volume(self, volume_id):
+        with self._lock:
+            return self._volumes.get(volume_id)
+
+    def namespaces(self):
+        with self._lock:
+            return {controller: dict(attached) for controller, attached in self._namespaces.items()}
+
+    def volumes(self):
+        with self._lock:
+            return dict(self._volumes)
+
+    def addVolume(self, volume_id, target, nvme_name, crypto_bdev_name, controller, nsid, bdev_name, crypto_key=None, qos=None):
+        volume = {'target': target, 'nvme': nvme_name, 'crypto': crypto_bdev_name,
+                  'crypto_key': crypto_key, 'controller': controller, 'nsid': nsid, 'qos': qos or {}}
+        changes = self._journal.add(volume_id, volume) if self._journal is not None else []
+        with self._lock:
+            self._apply(changes)
+            self._volumes[volume_id] = volume
+            self._namespaces.setdefault(controller, {})[nsid] = bdev_name
+
+    def updateQos(self, volume_id, qos):
+        with self._lock:
+            volume = self._volumes.get(volume_id)
+            if volume is None:
+                return
+            qos = {limit: value for limit, value in dict(volume.get('qos') or {}, **qos).items() if value}
+            volume = dict(volume, qos=qos)
+            self._volumes[volume_id] = volume
+        if self._journal is not None:
+            try:
+                changes = self._journal.add(volume_id, volume)
+            except OSError as e:
+                logger.error('Journaling QoS of volume %s failed: %s', volume_id, e)
+                return
+            with self._lock:
+                self._apply(changes)
+
+    def removeVolume(self, volume_id):
+        with self._lock:
+            volume = self._volumes.pop(volume_id, None)
+        # Also when only the journal has it, left there by an add whose write failed half way
+        if self._journal is not None:
+            try:
+                changes = self._journal.remove(volume_id)
+            except OSError as e:
+                logger.error('Journaling removal of volume %s failed: %s', volume_id, e)
+                return volume
+            with self._lock:
+                self._apply(changes)
+        return volume
+
+    def attachNamespace(self, controller, nsid, bdev_name):
+        with self._lock:
+            self._namespaces.setdefault(controller, {})[nsid] = bdev_name
+
+    def detachNamespace(self, controller, nsid):
+        with self._lock:
+            self._namespaces.get(controller, {}).pop(nsid, None)
+
+    def addController(self, controller):
+        with self._lock:
+            self._namespaces.setdefault(controller, {})
+
+    def removeController(self, controller):
+        with self._lock:
+            self._namespaces.pop(controller, None)
+
+    def syncControllers(self, controllers):
+        # Controllers created or deleted by other processes, as listed by SNAP
+        names = {controller['name'] for controller in controllers}
+        with self._lock:
+            for name in names:
+                self._namespaces.setdefault(name, {})
+            for name in [name for name in self._namespaces if name not in names]:
+                del self._namespaces[name]
+
+    def lostNamespaces(self, snap, controllers):
+        """Volumes whose namespace SNAP does not list, e.g. after it restarted."""
+        namespaces = self._scanNamespaces(snap, controllers)
+        with self._lock:
+            return {volume_id: volume for volume_id, volume in self._volumes.items()
+                    if volume['nsid'] not in namespaces.get(volume['controller'], {})}
+
+    def counts(self):
+        with self._lock:
+            return {
+                'volumes': len(self._volumes),
+                'controllers': len(self._namespaces),
+                'namespaces': sum(len(attached) for attached in self._namespaces.values())
+            }
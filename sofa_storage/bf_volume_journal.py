@@ -0,0 +1,161 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from .log import logger
+from .process_lock import ProcessLock
+
+
+class VolumeJournal():
+    """Published volumes of the BF or Linux plugin, persisted as an append-only JSON lines file.
+
+    Every publish and unpublish appends one record. The file is rewritten with only the live volumes once the
+    records outnumber them by more than compact_after. A shared journal is written by several processes, each
+    one catches up with the records of the others under a lock file.
+    """
+
+    def __init__(self, path, compact_after, shared=False):
+        self._path = path
+        self._compact_after = compact_after
+        self._lock = threading.Lock()
+        self._volumes = {}
+        self._records = 0
+        self._file = None
+        self._inode = None
+        self._offset = 0
+        os.makedirs(os.path.dirname(self._path) or '.', exist_ok=True)
+        # Shared by the worker processes of the DPU server, every operation first reads what the others journaled
+        self._process_lock = ProcessLock(self._path + '.lock') if shared else None
+        self._load()
+
+    @staticmethod
+    def _decode(volume):
+        volume['target'] = tuple(volume['target'])
+        return volume
+
+    def _apply(self, data):
+        changes = []
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn last record of a crash, the volume is picked up by the startup scan instead
+                logger.warning('Skipping invalid record in %s', self._path)
+                continue
+            volume = None
+            if record['op'] == 'add':
+                volume = self._volumes[record['volume_id']] = self._decode(record['volume'])
+            else:
+                self._volumes.pop(record['volume_id'], None)
+            self._records += 1
+            changes.append((record['volume_id'], volume))
+        return changes
+
+    def _load(self):
+        try:
+            with open(self._path, 'rb') as journal:
+                self._inode = os.fstat(journal.fileno()).st_ino
+                data = journal.read()
+        except FileNotFoundError:
+            return
+        self._offset = len(data)
+        self._apply(data)
+
+    def _catchUp(self):
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return []
+        if stat.st_ino == self._inode:
+            if stat.st_size == self._offset:
+                return []
+            with open(self._path, 'rb') as journal:
+                journal.seek(self._offset)
+                data = journal.read()
+            self._offset += len(data)
+            return self._apply(data)
+
+        # Compacted by another process, the changes are the difference to the new file
+        before = self._volumes
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._volumes = {}
+        self._records = 0
+        self._load()
+        changes = [(volume_id, None) for volume_id in before if volume_id not in self._volumes]
+        changes.extend((volume_id, volume) for volume_id, volume in self._volumes.items() if before.get(volume_id) != volume)
+        return changes
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if self._process_lock is None:
+                yield []
+                return
+            with self._process_lock.hold(update=False):
+                yield self._catchUp()
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self._path, 'a', encoding='utf-8')  # pylint: disable=R1732
+            self._inode = os.fstat(self._file.fileno()).st_ino
+
+    def _append(self, record):
+        self._open()
+        line = json.dumps(record) + '\n'
+        self._file.write(line)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._offset += len(line)
+        self._records += 1
+        if self._records - len(self._volumes) > self._compact_after:
+            self._compact()
+
+    def _compact(self):
+        tmp_path = self._path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as journal:
+            for volume_id, volume in self._volumes.items():
+                journal.write(json.dumps({'op': 'add', 'volume_id': volume_id, 'volume': volume}) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+            self._inode = os.fstat(journal.fileno()).st_ino
+            self._offset = journal.tell()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        os.replace(tmp_path, self._path)
+        self._records = len(self._volumes)
+
+    def volumes(self):
+        with self._lock:
+            return dict(self._volumes)
+
+    def sync(self):
+        """Returns (volume_id, volume or None) for every change other processes journaled since this one looked."""
+        with self._locked() as changes:
+            return changes
+
+    def add(self, volume_id, volume):
+        with self._locked() as changes:
+            self._volumes[volume_id] = volume
+            self._append({'op': 'add', 'volume_id': volume_id, 'volume': volume})
+            return changes
+
+    def remove(self, volume_id):
+        with self._locked() as changes:
+            if self._volumes.pop(volume_id, None) is not None:
+                self._append({'op': 'remove', 'volume_id': volume_id})
+            return changes
+
+    def rebuild(self, build):
+        """Replaces the volumes with build(volumes), no other process can journal before it returns."""
+        with self._locked():
+            self._volumes = dict(build(dict(self._volumes)))
+            self._compact()
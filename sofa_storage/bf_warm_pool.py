@@ -0,0 +1,111 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from .log import logger
+from .jsonrpc import JsonRpcException
+from .nvme_transport import TransportOptionException, transportOptions
+
+
+class WarmPool():
+    """Idle, still connected NVMe-oF controllers keyed by (trtype, traddr, trsvcid, subnqn).
+
+    A publish to a pooled target takes the existing connection and skips bdev_nvme_attach_controller. Connections
+    are returned to the pool by unpublish or pre-connected at startup, and detached once idle for longer than ttl. A ttl
+    of 0 disables the pool like a size of 0.
+    """
+
+    def __init__(self, spdk, size, ttl):
+        self._spdk = spdk
+        # Connections that may not idle at all would be detached as soon as they are pooled
+        self._size = size if ttl > 0 else 0
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._idle = OrderedDict()
+        self._stop = threading.Event()
+        self._reaper = None
+
+    @property
+    def enabled(self):
+        return self._size > 0
+
+    def _detach(self, name):
+        try:
+            self._spdk.call('bdev_nvme_detach_controller', {'name': name})
+        except (JsonRpcException, OSError) as e:
+            logger.error('bdev_nvme_detach_controller failed: %s', e)
+
+    def take(self, key):
+        with self._lock:
+            entry = self._idle.pop(key, None)
+        if entry is None:
+            return None
+        logger.debug('Warm pool hit for %s', key)
+        return entry[0]
+
+    def evict(self, key):
+        # Detach the pooled connection to key, if any, e.g. to connect to the same target with other options
+        name = self.take(key)
+        if name is not None:
+            self._detach(name)
+
+    def put(self, key, name):
+        evicted = []
+        with self._lock:
+            if self._size > 0:
+                self._idle[key] = (name, time.monotonic())
+                self._idle.move_to_end(key)
+            while len(self._idle) > self._size:
+                evicted.append(self._idle.popitem(last=False)[1][0])
+        if self._size <= 0:
+            evicted.append(name)
+        for evicted_name in evicted:
+            self._detach(evicted_name)
+
+    def prewarm(self, targets, trtype, transport_defaults):
+        for target in targets:
+            params = {'name': target['subnqn'],
+                      'trtype': target.get('trtype', trtype),
+                      'traddr': target['traddr'],
+                      'trsvcid': str(target['trsvcid']),
+                      'subnqn': target['subnqn']
+                      }
+            try:
+                params.update(transportOptions(target, transport_defaults))
+                self._spdk.call('bdev_nvme_attach_controller', params)
+            except (TransportOptionException, JsonRpcException, OSError) as e:
+                logger.error('Pre-connecting %s failed: %s', target['subnqn'], e)
+                continue
+            self.put((params['trtype'], params['traddr'], params['trsvcid'], params['subnqn']), params['name'])
+
+    def reap(self):
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key, (name, idle_since) in list(self._idle.items()):
+                if now - idle_since > self._ttl:
+                    del self._idle[key]
+                    expired.append(name)
+        for name in expired:
+            logger.debug('Warm pool reclaiming idle controller %s', name)
+            self._detach(name)
+
+    def start(self):
+        if not self.enabled or self._reaper is not None:
+            return
+
+        def run():
+            # Not more often than every second however short the ttl, reaping is not worth a spinning thread
+            while not self._stop.wait(max(min(self._ttl, 30), 1)):
+                self.reap()
+
+        self._reaper = threading.Thread(target=run, name='warm-pool-reaper', daemon=True)
+        self._reaper.start()
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,289 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import asyncio
+import contextvars
+import os
+import signal
+import subprocess  # nosec
+import threading
+import time
+from collections import deque
+
+import grpc
+
+from .error import SofaStorageException
+from .metrics import BACKEND_ERRORS, timed
+
+POLL_INTERVAL = 0.1
+DEFAULT = object()  # the timeout of the executor, None is no timeout
+
+_rpc = contextvars.ContextVar('sofa_storage_rpc', default=None)
+
+
+class CommandException(SofaStorageException):
+
+    def __init__(self, argv):
+        super().__init__()
+        self.argv = argv
+
+
+class CommandTimeoutException(CommandException):
+
+    def __str__(self):
+        return f'{self.argv[0]} did not finish before its timeout or the deadline of its request'
+
+
+class CommandCancelledException(CommandException):
+
+    def __str__(self):
+        return f'{self.argv[0]} was killed, its request was cancelled'
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class _Slots():
+    """Counting semaphore that threads and coroutines can wait on together, in arrival order."""
+
+    def __init__(self, count):
+        self._free = count
+        self._lock = threading.Lock()
+        self._waiters = deque()
+
+    def _take(self):
+        # Called with the lock held
+        if self._free > 0 and not self._waiters:
+            self._free -= 1
+            return True
+        return False
+
+    def acquire(self, timeout):
+        granted = threading.Event()
+        with self._lock:
+            if self._take():
+                return True
+            self._waiters.append(granted.set)
+        if granted.wait(timeout):
+            return True
+        with self._lock:
+            if granted.is_set():
+                return True
+            self._waiters.remove(granted.set)
+            return False
+
+    async def acquireAsync(self):
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def grant():
+            loop.call_soon_threadsafe(_resolve, granted)
+        with self._lock:
+            if self._take():
+                return
+            self._waiters.append(grant)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                waiting = grant in self._waiters
+                if waiting:
+                    self._waiters.remove(grant)
+            if not waiting:
+                # The slot was handed over while we were being cancelled
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft()()
+            else:
+                self._free += 1
+
+
+def _cancelled(context):
+    return context is not None and not context.is_active()
+
+
+def _deadline(timeout, context):
+    limits = [timeout]
+    if context is not None:
+        limits.append(context.time_remaining())
+    limits = [limit for limit in limits if limit is not None]
+    return time.monotonic() + min(limits) if limits else None
+
+
+def _remaining(deadline):
+    return None if deadline is None else max(0, deadline - time.monotonic())
+
+
+def _kill(pid):
+    # The command runs in its own session, so whatever it started goes too
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class CommandExecutor():
+    """Runs external commands, at most max_processes at once.
+
+    A command is killed once its timeout or the deadline of the RPC it runs for passes, or when that RPC is
+    cancelled. The RPC is the one whose servicer context CommandContextInterceptor made current, waiting for a free
+    process slot counts against the same limits. Every command is recorded as a backend command with timed().
+    """
+
+    def __init__(self, max_processes, timeout):
+        self._slots = _Slots(max_processes)
+        self._timeout = timeout
+
+    def _limits(self, timeout, context):
+        context = context if context is not None else _rpc.get()
+        return _deadline(self._timeout if timeout is DEFAULT else timeout, context), context
+
+    @staticmethod
+    def _result(argv, returncode, stdout, stderr, backend, command):
+        if returncode != 0:
+            BACKEND_ERRORS.labels(backend, command).inc()
+        return subprocess.CompletedProcess(argv, returncode, stdout, stderr)
+
+    def run(self, argv, backend, command, timeout=DEFAULT, context=None):
+        """Runs argv like subprocess.run(argv, capture_output=True), raises a CommandException if it was killed."""
+        deadline, context = self._limits(timeout, context)
+        if not self._slots.acquire(_remaining(deadline)):
+            raise CommandTimeoutException(argv)
+        try:
+            with timed(backend, command):
+                returncode, stdout, stderr = self._run(argv, deadline, context)
+        finally:
+            self._slots.release()
+        return self._result(argv, returncode, stdout, stderr, backend, command)
+
+    @staticmethod
+    def _run(argv, deadline, context):
+        with subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True) as proc:  # nosec
+            try:
+                while True:
+                    remaining = _remaining(deadline)
+                    try:
+                        stdout, stderr = proc.communicate(timeout=POLL_INTERVAL if remaining is None else min(POLL_INTERVAL, remaining))
+                        break
+                    except subprocess.TimeoutExpired:
+                        pass
+                    if _cancelled(context):
+                        raise CommandCancelledException(argv)
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise CommandTimeoutException(argv)
+            except BaseException:
+                _kill(proc.pid)
+                proc.communicate()
+                raise
+        return proc.returncode, stdout, stderr
+
+    async def runAsync(self, argv, backend, command, timeout=DEFAULT, context=None):
+        """Awaitable run(), cancelling the awaiting task kills the command."""
+        deadline, _ = self._limits(timeout, context)
+        try:
+            await asyncio.wait_for(self._slots.acquireAsync(), _remaining(deadline))
+        except asyncio.TimeoutError as e:
+            raise CommandTimeoutException(argv) from e
+        try:
+            with timed(backend, command):
+                returncode, stdout, stderr = await self._runAsync(argv, deadline)
+        finally:
+            self._slots.release()
+        return self._result(argv, returncode, stdout, stderr, backend, command)
+
+    @staticmethod
+    async def _runAsync(argv, deadline):
+        proc = await asyncio.create_subprocess_exec(*argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                                    start_new_session=True)
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), _remaining(deadline))
+        except BaseException as e:
+            _kill(proc.pid)
+            await proc.wait()
+            if isinstance(e, asyncio.TimeoutError):
+                raise CommandTimeoutException(argv) from e
+            raise
+        return proc.returncode, stdout, stderr
+
+
+_executor = CommandExecutor(4, 120)
+
+
+def configure(max_processes, timeout):
+    """Replaces the executor behind runCommand() and runCommandAsync(), timeout None means none."""
+    global _executor  # pylint: disable=W0603
+    _executor = CommandExecutor(max_processes, timeout)
+
+
+def runCommand(argv, backend, command, timeout=DEFAULT, context=None):
+    return _executor.run(argv, backend, command, timeout, context)
+
+
+async def runCommandAsync(argv, backend, command, timeout=DEFAULT, context=None):
+    return await _executor.runAsync(argv, backend, command, timeout, context)
+
+
+def _wrap(handler, behavior):
+    return grpc.unary_unary_rpc_method_handler(behavior, request_deserializer=handler.request_deserializer,
+                                               response_serializer=handler.response_serializer)
+
+
+class CommandContextInterceptor(grpc.ServerInterceptor):
+    """Makes the servicer context of each RPC current, so the commands it runs stop with it."""
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        def behavior(request, context):
+            token = _rpc.set(context)
+            try:
+                return handler.unary_unary(request, context)
+            finally:
+                _rpc.reset(token)
+        return _wrap(handler, behavior)
+
+
+class _AsyncRpc():
+    """The parts of a grpc.aio servicer context that commands run from other threads need."""
+
+    def __init__(self, context):
+        self._context = context
+        self._ended = threading.Event()
+
+    def time_remaining(self):
+        return self._context.time_remaining()
+
+    def is_active(self):
+        return not self._ended.is_set()
+
+    def end(self):
+        self._ended.set()
+
+
+class AsyncCommandContextInterceptor(grpc.aio.ServerInterceptor):
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+
+        async def behavior(request, context):
+            # Set in the RPC's own task, SyncDPUAdapter copies it into the plugin threads. A cancelled RPC
+            # cancels the task, which ends the RPC for those threads
+            rpc = _AsyncRpc(context)
+            _rpc.set(rpc)
+            try:
+                return await handler.unary_unary(request, context)
+            finally:
+                rpc.end()
+        return _wrap(handler, behavior)
@@ -23,3 +23,161 @@ if 'DPU_SERVER_URL' not in config:
 
 if 'DPU_SERVER_MAX_WORKERS' not in config:
     config['DPU_SERVER_MAX_WORKERS'] = 10
+
+if 'DPU_SERVER_MODE' not in config:
+    config['DPU_SERVER_MODE'] = 'sync'
+
+# Server processes sharing DPU_SERVER_URL through SO_REUSEPORT, each running DPU_SERVER_MAX_WORKERS threads
+if 'DPU_SERVER_WORKERS' not in config:
+    config['DPU_SERVER_WORKERS'] = 1
+
+# Lock files through which the server processes coordinate
+if 'DPU_SERVER_LOCK_DIR' not in config:
+    config['DPU_SERVER_LOCK_DIR'] = '/run/sofa_storage'
+
+# host:port of the Prometheus endpoint, e.g. '[::]:9100', none if unset
+if 'DPU_METRICS_URL' not in config:
+    config['DPU_METRICS_URL'] = None
+
+# JSON lines file receiving trace spans, tracing is off if unset
+if 'DPU_TRACE_FILE' not in config:
+    config['DPU_TRACE_FILE'] = None
+
+# External commands, e.g. the SNAP reload, are killed after this many seconds or at the deadline of their request
+if 'DPU_COMMAND_TIMEOUT' not in config:
+    config['DPU_COMMAND_TIMEOUT'] = 120
+
+if 'DPU_COMMAND_MAX_PROCESSES' not in config:
+    config['DPU_COMMAND_MAX_PROCESSES'] = 4
+
+# Teardown may use every worker, the other lanes together leave at least one to it
+if 'DPU_ADMISSION_LANES' not in config:
+    config['DPU_ADMISSION_LANES'] = {'teardown': {'limit': 10, 'queue': 128},
+                                     'publish': {'limit': 6, 'queue': 64},
+                                     'controller': {'limit': 2, 'queue': 32},
+                                     'info': {'limit': 1, 'queue': 16}}
+
+if 'DPU_BATCH_MAX_WORKERS' not in config:
+    config['DPU_BATCH_MAX_WORKERS'] = 8
+
+if 'DPU_REQUEST_CACHE_TTL' not in config:
+    config['DPU_REQUEST_CACHE_TTL'] = 60
+
+if 'DPU_REQUEST_CACHE_SIZE' not in config:
+    config['DPU_REQUEST_CACHE_SIZE'] = 4096
+
+if 'SPDK_RPC_SOCKET' not in config:
+    config['SPDK_RPC_SOCKET'] = '/var/tmp/spdk.sock'
+
+if 'SNAP_RPC_SOCKET' not in config:
+    config['SNAP_RPC_SOCKET'] = '/var/tmp/spdk.sock'
+
+if 'RPC_TIMEOUT' not in config:
+    config['RPC_TIMEOUT'] = 60.0
+
+if 'RPC_MAX_CONNECTIONS' not in config:
+    config['RPC_MAX_CONNECTIONS'] = config['DPU_SERVER_MAX_WORKERS']
+
+if 'BF_INVENTORY_REFRESH_INTERVAL' not in config:
+    config['BF_INVENTORY_REFRESH_INTERVAL'] = 300
+
+if 'BF_RESERVATION_TTL' not in config:
+    config['BF_RESERVATION_TTL'] = 30
+
+if 'BF_WARM_POOL_SIZE' not in config:
+    config['BF_WARM_POOL_SIZE'] = 0
+
+if 'BF_WARM_POOL_TTL' not in config:
+    config['BF_WARM_POOL_TTL'] = 300
+
+if 'BF_WARM_POOL_TARGETS' not in config:
+    config['BF_WARM_POOL_TARGETS'] = []
+
+if 'BF_RECONCILE_TIMEOUT' not in config:
+    config['BF_RECONCILE_TIMEOUT'] = 60
+
+if 'CRYPTO_ENGINE' not in config:
+    config['CRYPTO_ENGINE'] = 'crypto_armv8'
+
+if 'CRYPTO_ENGINE_CANDIDATES' not in config:
+    config['CRYPTO_ENGINE_CANDIDATES'] = ['crypto_armv8', 'mlx5_pci', 'accel']
+
+if 'CRYPTO_BENCH_SECONDS' not in config:
+    config['CRYPTO_BENCH_SECONDS'] = 5
+
+if 'CRYPTO_BENCH_CACHE' not in config:
+    config['CRYPTO_BENCH_CACHE'] = '/var/tmp/sofa_crypto_bench.json'
+
+if 'BDEVPERF_PATH' not in config:
+    config['BDEVPERF_PATH'] = 'bdevperf'
+
+if 'MLNX_SNAP_STATIC_BACKENDS' not in config:
+    config['MLNX_SNAP_STATIC_BACKENDS'] = False
+
+if 'MLNX_SNAP_CONFIG_DEBOUNCE' not in config:
+    config['MLNX_SNAP_CONFIG_DEBOUNCE'] = 0.5
+
+if 'MLNX_SNAP_RELOAD_CMD' not in config:
+    config['MLNX_SNAP_RELOAD_CMD'] = ['systemctl', 'restart', 'mlnx_snap']
+
+if 'BF_VOLUME_JOURNAL' not in config:
+    config['BF_VOLUME_JOURNAL'] = '/var/lib/sofa_storage/bf_volumes.jsonl'
+
+if 'BF_VOLUME_JOURNAL_COMPACT' not in config:
+    config['BF_VOLUME_JOURNAL_COMPACT'] = 1024
+
+if 'NVME_TRANSPORT_DEFAULTS' not in config:
+    config['NVME_TRANSPORT_DEFAULTS'] = {}
+
+if 'BF_PLACEMENT_POLICY' not in config:
+    config['BF_PLACEMENT_POLICY'] = 'first_fit'
+
+if 'BF_EMULATION_MANAGERS' not in config:
+    config['BF_EMULATION_MANAGERS'] = ['mlx5_0']
+
+if 'BF_PLACEMENT_IOSTAT_INTERVAL' not in config:
+    config['BF_PLACEMENT_IOSTAT_INTERVAL'] = 10
+
+if 'BF_PLACEMENT_IOPS_PER_CONTROLLER' not in config:
+    config['BF_PLACEMENT_IOPS_PER_CONTROLLER'] = 10000
+
+if 'LINUX_SYSFS_ROOT' not in config:
+    config['LINUX_SYSFS_ROOT'] = '/sys'
+
+if 'LINUX_DEV_ROOT' not in config:
+    config['LINUX_DEV_ROOT'] = '/dev'
+
+# Host NQN the Linux plugin connects with, None leaves it to the kernel's default
+if 'LINUX_HOSTNQN' not in config:
+    config['LINUX_HOSTNQN'] = None
+
+# Seconds the Linux plugin waits for the block device of a newly connected namespace
+if 'LINUX_DEVICE_TIMEOUT' not in config:
+    config['LINUX_DEVICE_TIMEOUT'] = 10
+
+if 'LINUX_VOLUME_JOURNAL' not in config:
+    config['LINUX_VOLUME_JOURNAL'] = '/var/lib/sofa_storage/linux_volumes.jsonl'
+
+if 'LINUX_VOLUME_JOURNAL_COMPACT' not in config:
+    config['LINUX_VOLUME_JOURNAL_COMPACT'] = 1024
+
+# Simulated DPU, see dpu_plugin_sim. None seeds it randomly, the seed is logged
+if 'SIM_SEED' not in config:
+    config['SIM_SEED'] = None
+
+if 'SIM_NUMBER_OF_PF' not in config:
+    config['SIM_NUMBER_OF_PF'] = 2
+
+if 'SIM_NUMBER_OF_VF_PER_PF' not in config:
+    config['SIM_NUMBER_OF_VF_PER_PF'] = 127
+
+if 'SIM_MAX_NAMESPACES' not in config:
+    config['SIM_MAX_NAMESPACES'] = 1024
+
+# Method name or default to a latency distribution, e.g. {'default': {'distribution': 'constant', 'value': 0.001}}
+if 'SIM_LATENCY' not in config:
+    config['SIM_LATENCY'] = {}
+
+# Method name or default to the probability that a call fails
+if 'SIM_FAILURE_RATES' not in config:
+    config['SIM_FAILURE_RATES'] = {}
@@ -0,0 +1,128 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import json
+import os
+import re
+import tempfile
+
+from .config import config
+from .log import logger
+from .error import SofaStorageException
+from .command import CommandException, runCommand
+
+ACCEL_ENGINE = 'accel'
+# DPDK crypto PMDs usable by bdev_crypto_create, plus the SPDK accel framework with whatever module it was assigned
+CRYPTO_ENGINES = ['crypto_armv8', 'crypto_aesni_mb', 'mlx5_pci', 'crypto_qat', ACCEL_ENGINE]
+
+BENCH_KEY = '0123456789abcdef'
+BENCH_BLOCK_SIZE = 4096
+BENCH_NUM_BLOCKS = 65536
+
+
+class CryptoEngineException(SofaStorageException):
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+
+    def __str__(self):
+        return f'Unknown crypto engine {self.engine}, expected one of {", ".join(CRYPTO_ENGINES)}'
+
+
+def cryptoCalls(engine, base_bdev_name, name, key):
+    """Returns the (method, params, undo method, undo params) SPDK calls creating a crypto bdev with the engine."""
+    if engine not in CRYPTO_ENGINES:
+        raise CryptoEngineException(engine)
+
+    if engine == ACCEL_ENGINE:
+        key_name = name + '_key'
+        return [
+            ('accel_crypto_key_create', {'name': key_name, 'cipher': 'AES_CBC', 'key': key.encode('utf-8').hex()},
+             'accel_crypto_key_destroy', {'key_name': key_name}),
+            ('bdev_crypto_create', {'base_bdev_name': base_bdev_name, 'name': name, 'key_name': key_name},
+             'bdev_crypto_delete', {'name': name}),
+        ]
+
+    return [
+        ('bdev_crypto_create', {'base_bdev_name': base_bdev_name, 'name': name, 'crypto_pmd': engine, 'key': key},
+         'bdev_crypto_delete', {'name': name}),
+    ]
+
+
+def benchConfig(engine):
+    # bdevperf runs a crypto bdev on top of a RAM backed malloc bdev, so only the crypto engine is measured
+    subsystems = []
+    bdevs = [{'method': 'bdev_malloc_create',
+              'params': {'name': 'Malloc0', 'num_blocks': BENCH_NUM_BLOCKS, 'block_size': BENCH_BLOCK_SIZE}}]
+    for method, params, _, _ in cryptoCalls(engine, 'Malloc0', 'Crypto0', BENCH_KEY):
+        if method.startswith('accel_'):
+            subsystems.append({'subsystem': 'accel', 'config': [{'method': method, 'params': params}]})
+        else:
+            bdevs.append({'method': method, 'params': params})
+    subsystems.append({'subsystem': 'bdev', 'config': bdevs})
+    return {'subsystems': subsystems}
+
+
+def benchEngine(engine, bdevperf, seconds):
+    """Runs bdevperf against the engine and returns its encrypt/decrypt throughput in MiB/s, or None."""
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump(benchConfig(engine), f)
+    try:
+        cmd = runCommand([bdevperf, '--json', f.name, '-q', '64', '-o', str(BENCH_BLOCK_SIZE), '-w', 'randrw', '-M', '50',
+                          '-t', str(seconds)], 'spdk', 'bdevperf', timeout=seconds + 60)
+    except (OSError, CommandException) as e:
+        logger.warning('Benchmarking crypto engine %s failed: %s', engine, e)
+        return None
+    finally:
+        os.unlink(f.name)
+
+    match = re.search(rb'^\s*Total\s*:\s*([\d.]+)\s+([\d.]+)', cmd.stdout, re.MULTILINE)
+    if cmd.returncode != 0 or match is None:
+        logger.warning('Benchmarking crypto engine %s failed\n%s\n%s', engine, cmd.stdout, cmd.stderr)
+        return None
+    return float(match.group(2))
+
+
+def benchEngines(engines, bdevperf, seconds):
+    results = {}
+    for engine in engines:
+        results[engine] = benchEngine(engine, bdevperf, seconds)
+        logger.info('Crypto engine %s: %s MiB/s', engine, results[engine])
+    return results
+
+
+def fastestEngine(results, fallback):
+    measured = {engine: mibs for engine, mibs in results.items() if mibs is not None}
+    if not measured:
+        logger.warning('No crypto engine could be benchmarked, using %s', fallback)
+        return fallback
+    return max(measured, key=measured.get)
+
+
+def selectEngine():
+    """Resolves CRYPTO_ENGINE, benchmarking CRYPTO_ENGINE_CANDIDATES once per node if it is set to auto."""
+    engine = config['CRYPTO_ENGINE']
+    if engine != 'auto':
+        if engine not in CRYPTO_ENGINES:
+            raise CryptoEngineException(engine)
+        return engine
+
+    cache = config['CRYPTO_BENCH_CACHE']
+    try:
+        with open(cache, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+    except (OSError, ValueError):
+        results = benchEngines(config['CRYPTO_ENGINE_CANDIDATES'], config['BDEVPERF_PATH'], config['CRYPTO_BENCH_SECONDS'])
+        if any(mibs is not None for mibs in results.values()):
+            try:
+                with open(cache, 'w', encoding='utf-8') as f:
+                    json.dump(results, f)
+            except OSError as e:
+                logger.warning('Could not cache crypto benchmark results in %s: %s', cache, e)
+
+    engine = fastestEngine(results, CRYPTO_ENGINES[0])
+    logger.info('Selected crypto engine %s', engine)
+    return engine
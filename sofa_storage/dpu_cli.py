@@ -5,8 +5,12 @@
 """
 import click
 import grpc
+from .config import config
 from .generated import storage_pb2
 from .generated import storage_pb2_grpc
+from .crypto_engine import CRYPTO_ENGINES, benchEngines, fastestEngine
+from .bdev_qos import qos_options, setQos
+from .tracing import readSpans, waterfall
 
 DPU_DEFAULT_URL = "192.168.100.2:50050"
 
@@ -61,12 +65,23 @@ def controller_delete(controller_id, dpu_url=DPU_DEFAULT_URL):
         stub.DPUDeleteController(request)
 
 
+@volume.command()
+@click.option('--dpu_url', type=str)
+def dpu_info(dpu_url=DPU_DEFAULT_URL):
+    """Show the DPU type, its free PF/VF functions and published volumes"""
+    with grpc.insecure_channel(dpu_url) as channel:
+        stub = storage_pb2_grpc.StorageStub(channel)
+        rsp = stub.DPUGetInfo(storage_pb2.DPUGetInfoRequest())
+        print(rsp)
+
+
 @volume.command()
 @click.argument('volume_id', type=str)
 @click.argument('controller_id', type=str)
 @click.argument('target_path', type=str)
 @click.option('--dpu_url', type=str)
-def volume_publish(volume_id, controller_id, target_path, dpu_url=DPU_DEFAULT_URL):
+@qos_options
+def volume_publish(volume_id, controller_id, target_path, dpu_url=DPU_DEFAULT_URL, **limits):
     """Publish a volume on the DPU host"""
     with grpc.insecure_channel(dpu_url) as channel:
         stub = storage_pb2_grpc.StorageStub(channel)
@@ -74,9 +89,24 @@ def volume_publish(volume_id, controller_id, target_path, dpu_url=DPU_DEFAULT_UR
         request.volume_id = volume_id
         request.controller_id = controller_id
         request.target_path = target_path
+        setQos(request.qos, limits)  # pylint: disable=E1101
         stub.DPUPublishVolume(request)
 
 
+@volume.command()
+@click.argument('volume_id', type=str)
+@click.option('--dpu_url', type=str)
+@qos_options
+def volume_qos(volume_id, dpu_url=DPU_DEFAULT_URL, **limits):
+    """Change the QoS limits of a published volume"""
+    with grpc.insecure_channel(dpu_url) as channel:
+        stub = storage_pb2_grpc.StorageStub(channel)
+        request = storage_pb2.DPUSetVolumeQosRequest()
+        request.volume_id = volume_id
+        setQos(request.qos, limits)  # pylint: disable=E1101
+        stub.DPUSetVolumeQos(request)
+
+
 @volume.command()
 @click.argument('volume_id', type=str)
 @click.argument('target_path', type=str)
@@ -91,5 +121,29 @@ def volume_unpublish(volume_id, target_path, dpu_url=DPU_DEFAULT_URL):
         stub.DPUUnpublishVolume(request)
 
 
+@volume.command()
+@click.option('--engine', 'engines', type=click.Choice(CRYPTO_ENGINES), multiple=True,
+              help='Engine to benchmark, may be repeated. Defaults to CRYPTO_ENGINE_CANDIDATES')
+@click.option('--bdevperf', type=str, help='Path of the SPDK bdevperf binary')
+@click.option('--seconds', type=int, help='Duration of each run')
+def crypto_bench(engines, bdevperf, seconds):
+    """Measure encrypt/decrypt throughput of the crypto engines on a malloc bdev"""
+    results = benchEngines(engines or config['CRYPTO_ENGINE_CANDIDATES'],
+                           bdevperf or config['BDEVPERF_PATH'],
+                           seconds or config['CRYPTO_BENCH_SECONDS'])
+    for engine, mibs in results.items():
+        print(f'{engine}: ' + ('failed' if mibs is None else f'{mibs:.1f} MiB/s'))
+    print(f'fastest: {fastestEngine(results, CRYPTO_ENGINES[0])}')
+
+
+@volume.command()
+@click.argument('trace_files', type=click.Path(exists=True), nargs=-1, required=True)
+@click.option('--trace_id', type=str, help='Only show this trace')
+def trace_show(trace_files, trace_id=None):
+    """Show the spans of DPU_TRACE_FILE/CTRL_TRACE_FILE files as per request waterfalls"""
+    for line in waterfall(readSpans(trace_files), trace_id):
+        print(line)
+
+
 if __name__ == '__main__':
     cli()
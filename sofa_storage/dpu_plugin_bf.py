@@ -3,14 +3,28 @@
   All rights reserved.
   SPDX-License-Identifier: Apache-2.0
 """
-import json
-import subprocess  # nosec
-import re
-from itertools import product
-from math import copysign
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from functools import partial
 from .config import config
 from .log import logger
+from .error import SofaStorageException, VolumeNotFoundException
 from .dpu_plugin_interface import DPUInterface
+from .jsonrpc import JsonRpcClient, JsonRpcException
+from .bf_inventory import ControllerInventory, controllerName, parseControllerId, parseNamespaceId
+from .bf_allocator import FunctionAllocator
+from .transaction import Transaction
+from .keyed_lock import KeyedLock
+from .bf_warm_pool import WarmPool
+from .bf_state import DPUState
+from .bf_volume_journal import VolumeJournal
+from .bf_snap_config import SnapConfig
+from .bf_placement import Placement
+from .nvme_transport import hasTransportOptions, transportOptions
+from .bdev_qos import qosParams, qosReset, validateQos
+from .crypto_engine import CRYPTO_ENGINES, CryptoEngineException, cryptoCalls, selectEngine
+from .process_lock import ProcessLock, StripedProcessLock
 
 CTRL_SERVER_URL = config['CTRL_SERVER_URL']
 
@@ -23,186 +37,336 @@ MLNX_SNAP_CONFIG_FILE = '/etc/mlnx_snap/mlnx_snap.json'
 MLNX_SNAP_RPC_INIT_FILE = '/etc/mlnx_snap/snap_rpc_init.conf'
 
 
-class DPU(DPUInterface):
+class SharedWorkersException(SofaStorageException):
 
-    def __init__(self):
+    def __init__(self, setting):
         super().__init__()
-        self.dpu_type = 'bf'
-        self._config = None
+        self.setting = setting
+
+    def __str__(self):
+        return f'{self.setting} keeps per-process state and cannot be used with more than one DPU server worker'
 
-    def _readConfig(self):
-        with open(MLNX_SNAP_CONFIG_FILE, 'r', encoding='utf-8') as json_file:
-            self._config = json.load(json_file)
 
-    def _writeConfig(self):
-        if self._config is not None:
-            with open(MLNX_SNAP_CONFIG_FILE, 'w', encoding='utf-8') as outfile:
-                json.dump(self._config, outfile, indent=4)
+class DPU(DPUInterface):
 
-    def publishVolume(self, volume_id, volume_context, controller_id, target_path, secrets):  # pylint: disable=R0201
+    def __init__(self):
+        super().__init__()
+        self.dpu_type = 'bf'
+        # With several server worker processes, each has its own plugin and they coordinate through lock files
+        shared = config['DPU_SERVER_WORKERS'] > 1
+        if shared and config['BF_WARM_POOL_SIZE'] > 0 and config['BF_WARM_POOL_TTL'] > 0:
+            raise SharedWorkersException('BF_WARM_POOL_SIZE')
+        if shared and config['MLNX_SNAP_STATIC_BACKENDS']:
+            raise SharedWorkersException('MLNX_SNAP_STATIC_BACKENDS')
+        self._spdk = JsonRpcClient(config['SPDK_RPC_SOCKET'], config['RPC_TIMEOUT'], config['RPC_MAX_CONNECTIONS'], 'spdk')
+        self._snap = JsonRpcClient(config['SNAP_RPC_SOCKET'], config['RPC_TIMEOUT'], config['RPC_MAX_CONNECTIONS'], 'snap')
+        allocator = FunctionAllocator(NUMBER_OF_PF, NUMBER_OF_VF_PER_PF, config['BF_RESERVATION_TTL'])
+        self._inventory = ControllerInventory(self._snap, config['BF_INVENTORY_REFRESH_INTERVAL'], allocator)
+        # Serializes operations touching the same emulated controller or bdev, everything else runs in parallel
+        self._locks = KeyedLock(StripedProcessLock(config['DPU_SERVER_LOCK_DIR']) if shared else None)
+        # Function allocation is serialized across processes, and refreshed from SNAP after another one changed it
+        self._controller_lock = ProcessLock(os.path.join(config['DPU_SERVER_LOCK_DIR'], 'bf_controllers.lock')) if shared else None
+        self._warm_pool = WarmPool(self._spdk, config['BF_WARM_POOL_SIZE'], config['BF_WARM_POOL_TTL'])
+        self._state = DPUState(VolumeJournal(config['BF_VOLUME_JOURNAL'], config['BF_VOLUME_JOURNAL_COMPACT'], shared),
+                               self._bdevName)
+        self._crypto_engine = selectEngine()
+        self._placement = Placement(config['BF_PLACEMENT_POLICY'], config['BF_EMULATION_MANAGERS'], self._state, self._spdk,
+                                    config['BF_PLACEMENT_IOSTAT_INTERVAL'], config['BF_PLACEMENT_IOPS_PER_CONTROLLER'])
+        self._snap_config = None
+        if config['MLNX_SNAP_STATIC_BACKENDS']:
+            self._snap_config = SnapConfig(MLNX_SNAP_CONFIG_FILE, config['MLNX_SNAP_CONFIG_DEBOUNCE'],
+                                           config['MLNX_SNAP_RELOAD_CMD'], self._snapReloaded)
+        with self._controllers():
+            self._reconcile()
+        # Fail at startup rather than on every publish if the node defaults are invalid
+        transportOptions({}, config['NVME_TRANSPORT_DEFAULTS'])
+        if self._warm_pool.enabled:
+            self._warm_pool.prewarm(config['BF_WARM_POOL_TARGETS'], config['TRANSPORT_TYPE'],
+                                    config['NVME_TRANSPORT_DEFAULTS'])
+            self._warm_pool.start()
+
+    def _controllers(self, update=True):
+        """Holds the cross-process controller lock, if any, with the inventory brought up to date."""
+        if self._controller_lock is None:
+            return nullcontext()
+        return self._controllerLock(update)
+
+    @contextmanager
+    def _controllerLock(self, update):
+        with self._controller_lock.hold(update) as stale:
+            if stale:
+                try:
+                    controllers = self._snap.call('controller_list')
+                except (JsonRpcException, OSError) as e:
+                    logger.error('controller_list failed: %s', e)
+                    self._inventory.invalidate()
+                else:
+                    self._inventory.load(controllers)
+                    self._state.syncControllers(controllers)
+            yield
+
+    def _reconcile(self):
+        # Build the model with one scan before the server starts listening, later requests only update it
+        deadline = time.monotonic() + config['BF_RECONCILE_TIMEOUT']
+        while True:
+            start = time.monotonic()
+            try:
+                controllers = self._state.scan(self._spdk, self._snap)
+                break
+            except (JsonRpcException, OSError) as e:
+                if time.monotonic() >= deadline:
+                    logger.error('Reconciling DPU state failed, starting without it: %s', e)
+                    self._inventory.invalidate()
+                    return
+                logger.warning('Reconciling DPU state failed, retrying: %s', e)
+                time.sleep(1)
+
+        self._inventory.load(controllers)
+        if self._snap_config is not None:
+            for volume_id, volume in self._state.volumes().items():
+                self._snap_config.addBackend(volume_id, volume['target'][1], int(volume['target'][2]))
+        self._adoptIdleControllers(self._state.idleControllers())
+        logger.info('Reconciled DPU state in %.1f ms: %s', (time.monotonic() - start) * 1000, self._state.counts())
+
+    def _adoptIdleControllers(self, idle):
+        if self._warm_pool.enabled:
+            for target, nvme_name in idle:
+                self._warm_pool.put(target, nvme_name)
+        elif self._controller_lock is None:
+            # Left over from a pool or a crash, with other workers one of them could be in the middle of a publish
+            for _, nvme_name in idle:
+                self._detachController(nvme_name)
+
+    def _snapReloaded(self):
+        # A restarted SNAP has lost the namespaces attached over RPC and may list other controllers
+        deadline = time.monotonic() + config['BF_RECONCILE_TIMEOUT']
+        while True:
+            try:
+                controllers = self._snap.call('controller_list')
+                lost = self._state.lostNamespaces(self._snap, controllers)
+                break
+            except (JsonRpcException, OSError) as e:
+                if time.monotonic() >= deadline:
+                    logger.error('Resyncing with SNAP after reloading it failed: %s', e)
+                    self._inventory.invalidate()
+                    return
+                time.sleep(1)
+
+        self._inventory.load(controllers)
+        self._state.syncControllers(controllers)
+        reattached = 0
+        for volume_id, volume in lost.items():
+            with self._locks.hold(('controller', volume['controller']), ('bdev', volume_id)):
+                if self._state.volume(volume_id) != volume:
+                    continue
+                ns_params = {'ctrl': volume['controller'], 'bdev_type': 'spdk', 'bdev': self._bdevName(volume),
+                             'nsid': volume['nsid']}
+                try:
+                    self._snap.call('controller_nvme_namespace_attach', ns_params)
+                except (JsonRpcException, OSError) as e:
+                    logger.error('Reattaching volume %s after reloading SNAP failed: %s', volume_id, e)
+                    continue
+                self._state.attachNamespace(volume['controller'], volume['nsid'], self._bdevName(volume))
+                reattached += 1
+        logger.info('Resynced with SNAP after reloading it, reattached %d of %d lost namespaces: %s', reattached, len(lost),
+                    self._state.counts())
+
+    def publishVolume(self, volume_id, volume_context, controller_id, target_path, secrets, qos=None):  # pylint: disable=R0201
         # sudo snap_rpc.py controller_nvme_create nqn.2020-12.mlnx.snap mlx5_0 --pf_id 0 -c /etc/mlnx_snap/mlnx_snap.json -r mlx5_2
-        """
-        target_addr = volume_context['addr_traddr']
-        target_port = int(volume_context['addr_trsvcid'])
-        self._readConfig()
-        add_backend = True
-        for backend in self._config['backends']:
-            for path in backend['paths']:
-                if (path['addr'] == target_addr) and (path['port'] == target_port):
-                    add_backend = False
-        # All checks passed
-        if add_backend:
-            self._config['backends'].append(
-                {
-                    'type': 'nvmf_rdma',
-                    'name': volume_id,
-                    'paths': [{
-                        'addr': target_addr,
-                        'port': target_port,
-                        'hostnqn': 'host1'  # TODO: NQN on host or on target (host)
-                    }]
-                }
-            )
-
-        # self._writeConfig()
-        # TODO: Restart mlnx_snap daemon
-        """
 
         # HERE THE RPC CALLS TO SNAP ARE HAPPENING
-        cmd_parts = ['spdk_rpc.py', 'bdev_nvme_attach_controller',
-                     '-b', volume_id,
-                     '-t', config['TRANSPORT_TYPE'],
-                     '-a', volume_context['addr_traddr'],
-                     '-f', 'ipv4',
-                     '-s', volume_context['addr_trsvcid'],
-                     '-n', volume_id
-                     ]
-        cmd = subprocess.run(cmd_parts, capture_output=True, check=False)  # nosec
-        if cmd.returncode != 0:
-            logger.error('spdk_rpc.py bdev_nvme_attach_controller failed\n%s\n%s', cmd.stdout, cmd.stderr)
-
-        bdev_name = volume_id + 'n' + config['NAMESPACE']  # FIXME: Needs to be a parameter
-
-        if secrets:
-            cmd_parts = ['spdk_rpc.py', 'bdev_crypto_create',
-                         bdev_name, bdev_name + '_encrypted',
-                         'crypto_armv8', secrets['encryption_key']
-                         ]
-            cmd = subprocess.run(cmd_parts, capture_output=True, check=False)  # nosec
-            if cmd.returncode != 0:
-                logger.error('spdk_rpc.py bdev_crypto_create failed\n%s\n%s', cmd.stdout, cmd.stderr)
-
-            bdev_name += '_encrypted'
-
-        pf_index = int(controller_id[0])
-        vf_index = int(controller_id[1:])
-
-        controller = 'NvmeEmu0pf' + str(pf_index)
-
-        if vf_index >= 0:
-            controller = controller + 'vf' + str(vf_index)
-
-        match = re.search(r'\d+$', target_path)  # i.e. /dev/nvme0n2  --> 2
-        nsid = target_path[match.start():match.end()]
-        # was NvmeEmu0pf0
-        cmd_parts = ['snap_rpc.py', 'controller_nvme_namespace_attach',
-                     '-c', controller,
-                     'spdk', bdev_name, nsid
-                     ]
-
-        cmd = subprocess.run(cmd_parts, capture_output=True, check=False)  # nosec
-        if cmd.returncode != 0:
-            logger.error('snap_rpc.py controller_nvme_namespace_attach failed\n%s\n%s', cmd.stdout, cmd.stderr)
+        target = (config['TRANSPORT_TYPE'], volume_context['addr_traddr'], volume_context['addr_trsvcid'], volume_id)
+
+        pf_index, vf_index = parseControllerId(controller_id)
+        controller = controllerName(pf_index, vf_index)
+
+        nsid = parseNamespaceId(target_path)
+
+        crypto_engine = volume_context.get('crypto_engine', self._crypto_engine)
+        if secrets and crypto_engine not in CRYPTO_ENGINES:
+            raise CryptoEngineException(crypto_engine)
+        transport_options = transportOptions(volume_context, config['NVME_TRANSPORT_DEFAULTS'])
+        qos = qos or {}
+        validateQos(qos)
+
+        with self._locks.hold(('controller', controller), ('bdev', volume_id)), Transaction(f'Publish volume {volume_id}') as txn:
+            if self._published(volume_id, controller, nsid):
+                # A retry that reached another server worker than the first attempt
+                logger.info('Volume %s is already published', volume_id)
+                return
+            nvme_name = None
+            if not hasTransportOptions(volume_context):
+                # Pooled connections were made with the node defaults, tuned volumes need their own
+                nvme_name = self._warm_pool.take(target)
+            else:
+                # Its own is named after the volume like a pooled one to the same target would be, which SPDK refuses
+                self._warm_pool.evict(target)
+            if nvme_name is None:
+                params = {'name': volume_id,
+                          'trtype': config['TRANSPORT_TYPE'],
+                          'traddr': volume_context['addr_traddr'],
+                          'trsvcid': volume_context['addr_trsvcid'],
+                          'subnqn': volume_id
+                          }
+                params.update(transport_options)
+                txn.step('bdev_nvme_attach_controller',
+                         lambda: self._spdk.call('bdev_nvme_attach_controller', params),
+                         lambda: self._spdk.call('bdev_nvme_detach_controller', {'name': volume_id}))
+                nvme_name = volume_id
+            else:
+                txn.step('warm_pool', lambda: None, lambda: self._warm_pool.put(target, nvme_name))
+
+            bdev_name = nvme_name + 'n' + config['NAMESPACE']  # FIXME: Needs to be a parameter
+            crypto_bdev_name = None
+            crypto_key = None
+
+            if secrets:
+                crypto_bdev_name = bdev_name + '_encrypted'
+                for method, params, undo_method, undo_params in cryptoCalls(crypto_engine, bdev_name, crypto_bdev_name,
+                                                                            secrets['encryption_key']):
+                    txn.step(method, partial(self._spdk.call, method, params), partial(self._spdk.call, undo_method, undo_params))
+                    if method == 'accel_crypto_key_create':
+                        crypto_key = params['name']
+                bdev_name = crypto_bdev_name
+
+            if qos:
+                txn.step('bdev_set_qos_limit',
+                         partial(self._spdk.call, 'bdev_set_qos_limit', qosParams(bdev_name, qos)),
+                         partial(self._spdk.call, 'bdev_set_qos_limit', qosParams(bdev_name, qosReset(qos))))
+
+            ns_params = {'ctrl': controller,
+                         'bdev_type': 'spdk',
+                         'bdev': bdev_name,
+                         'nsid': nsid
+                         }
+            txn.step('controller_nvme_namespace_attach',
+                     lambda: self._snap.call('controller_nvme_namespace_attach', ns_params),
+                     lambda: self._snap.call('controller_nvme_namespace_detach', {'ctrl': controller, 'nsid': nsid}))
+
+            if self._snap_config is not None:
+                # Coalesced with the other backend changes of the burst into one write and SNAP reload
+                txn.step('snap_config_backend',
+                         lambda: self._snap_config.addBackend(volume_id, target[1], int(target[2])),
+                         lambda: self._snap_config.removeBackend(volume_id, target[1], int(target[2])))
+
+            # Journaling can fail too, e.g. on fsync, and SNAP must not be left with a namespace on a deleted bdev
+            txn.step('journal',
+                     lambda: self._state.addVolume(volume_id, target, nvme_name, crypto_bdev_name, controller, nsid,
+                                                   bdev_name, crypto_key, qos),
+                     lambda: self._forgetVolume(volume_id, controller, nsid))
+
+    def _forgetVolume(self, volume_id, controller, nsid):
+        self._state.removeVolume(volume_id)
+        self._state.detachNamespace(controller, nsid)
+
+    def _published(self, volume_id, controller, nsid):
+        self._state.sync()
+        volume = self._state.volume(volume_id)
+        return volume is not None and (volume['controller'], volume['nsid']) == (controller, nsid)
 
     def unpublishVolume(self, volume_id, target_path):  # pylint: disable=R0201
         # sudo snap_rpc.py controller_nvme_delete -c NvmeEmu0pf0
-        """
-        target_addr = '10.100.0.24'
-        target_port = 4420
-        self._readConfig()
-        new_backends = []
-        for backend in self._config['backends']:
-            keep_backend = True
-            for path in backend['paths']:
-                if (path['addr'] == target_addr) and (path['port'] == target_port):
-                    keep_backend = False
-            if keep_backend:
-                new_backends.append(backend)
-        self._config['backends'] = new_backends
-
-        # self._writeConfig()
-        # TODO: Restart mlnx_snap daemon
-        """
         # HERE THE RPC CALLS TO SNAP ARE HAPPENING
-        match = re.search(r'\d+$', target_path)  # i.e. /dev/nvme0n2  --> 2
-        nsid = target_path[match.start():match.end()]
-        cmd_parts = ['snap_rpc.py', 'controller_nvme_namespace_detach',
-                     '-c', 'NvmeEmu0pf0',
-                     nsid
-                     ]
-
-        cmd = subprocess.run(cmd_parts, capture_output=True, check=False)  # nosec
-        if cmd.returncode != 0:
-            logger.error('snap_rpc.py controller_nvme_namespace_detach failed\n%s\n%s', cmd.stdout, cmd.stderr)
-
-        bdev_name = volume_id  # FIXME: Needs to be a parameter
-        cmd_parts = ['spdk_rpc.py', 'bdev_nvme_detach_controller',
-                     bdev_name
-                     ]
-        cmd = subprocess.run(cmd_parts, capture_output=True, check=False)  # nosec
-        if cmd.returncode != 0:
-            logger.error('spdk_rpc.py bdev_nvme_detach_controller failed\n%s\n%s', cmd.stdout, cmd.stderr)
+        self._state.sync()
+        volume = self._state.volume(volume_id)
+        if volume is None:
+            with self._locks.hold(('bdev', volume_id)):
+                self._state.sync()
+                if self._state.volume(volume_id) is None:
+                    # Not published through this plugin or already unpublished, at most a stale NVMe-oF controller is left
+                    logger.warning('Volume %s is not published', volume_id)
+                    self._detachController(volume_id)
+                    return
+            # Published while waiting for the lock
+            self.unpublishVolume(volume_id, target_path)
+            return
+
+        controller, nsid = volume['controller'], volume['nsid']
+        with self._locks.hold(('controller', controller), ('bdev', volume_id)):
+            self._state.sync()
+            volume = self._state.removeVolume(volume_id)
+            if volume is None:
+                return
+
+            try:
+                self._snap.call('controller_nvme_namespace_detach', {'ctrl': controller, 'nsid': nsid})
+                self._state.detachNamespace(controller, nsid)
+            except (JsonRpcException, OSError) as e:
+                logger.error('controller_nvme_namespace_detach failed: %s', e)
+
+            self._releaseVolume(volume_id, volume)
+
+    def _releaseVolume(self, volume_id, volume):
+        # Tear down the bdev chain above the NVMe-oF controller and hand the connection to the warm pool
+        target, nvme_name = volume['target'], volume['nvme']
+        if self._snap_config is not None:
+            self._snap_config.removeBackend(volume_id, target[1], int(target[2]))
+        if not self._clearBdevs(volume):
+            # Don't hand out a connection that still has the old crypto bdev or limits on it
+            self._detachController(nvme_name)
+            return
+        if not self._warm_pool.enabled:
+            self._detachController(nvme_name)
+            return
+        self._warm_pool.put(target, nvme_name)
+
+    def _clearBdevs(self, volume):
+        try:
+            if volume['crypto'] is not None:
+                self._spdk.call('bdev_crypto_delete', {'name': volume['crypto']})
+            elif volume.get('qos'):
+                # The limits were set on the NVMe bdev itself
+                self._spdk.call('bdev_set_qos_limit', qosParams(self._bdevName(volume), qosReset(volume['qos'])))
+        except (JsonRpcException, OSError) as e:
+            logger.error('Clearing bdevs of %s failed: %s', volume['nvme'], e)
+            return False
+
+        if volume['crypto_key'] is not None:
+            try:
+                self._spdk.call('accel_crypto_key_destroy', {'key_name': volume['crypto_key']})
+            except (JsonRpcException, OSError) as e:
+                logger.error('accel_crypto_key_destroy failed: %s', e)
+        return True
+
+    @staticmethod
+    def _bdevName(volume):
+        # Top of the bdev chain attached to the namespace
+        return volume['crypto'] or volume['nvme'] + 'n' + config['NAMESPACE']
+
+    def volumeTarget(self, volume_id):
+        volume = self._state.volume(volume_id)
+        return tuple(volume['target']) if volume is not None else None
+
+    def setVolumeQos(self, volume_id, qos):
+        validateQos(qos)
+        with self._locks.hold(('bdev', volume_id)):
+            self._state.sync()
+            volume = self._state.volume(volume_id)
+            if volume is None:
+                raise VolumeNotFoundException(volume_id)
+            self._spdk.call('bdev_set_qos_limit', qosParams(self._bdevName(volume), qos))
+            self._state.updateQos(volume_id, qos)
+
+    def _detachController(self, name):
+        try:
+            self._spdk.call('bdev_nvme_detach_controller', {'name': name})
+        except (JsonRpcException, OSError) as e:
+            logger.error('bdev_nvme_detach_controller failed: %s', e)
 
     def getInfo(self):
+        self._state.sync()
+        with self._controllers(update=False):
+            free_functions = self._inventory.freeCount()
         info = {
-            'dpu_type': self.dpu_type
+            'dpu_type': self.dpu_type,
+            'free_functions': free_functions
         }
+        info.update(self._state.counts())
         return info
 
-    @staticmethod
-    def getAvailableFunctions(pf_index, vf_index):
-        cmd_parts = ['snap_rpc.py', 'controller_list']
-
-        cmd = subprocess.run(cmd_parts, capture_output=True, check=False)  # nosec
-        if cmd.returncode != 0:
-            logger.error('snap_rpc.py controller_list failed\n%s\n%s', cmd.stdout, cmd.stderr)
-
-        controllers = json.loads(cmd.stdout)
-
-        controller_fs = set()
-        all_fs = set()
-
-        pf = vf_index is None  # If there is no VF index provided, then we want PFs
-        vf = vf_index is not None or pf_index is None  # If there is a vf_index provided, or nothing is provided, we want VFs
-
-        # If a PF index was not provided, we would accept any PF
-        if pf_index is None:
-            pf_index = -1
-
-        if vf_index is None:
-            vf_index = -1
-
-        pf_indexes = range(max(pf_index, 0), abs(int(min(copysign(NUMBER_OF_PF, pf_index), pf_index + 1))))
-
-        if vf:
-            vf_indexes = range(max(vf_index, 0), abs(int(min(copysign(NUMBER_OF_VF_PER_PF, vf_index), vf_index + 1))))
-            all_fs.update(product(pf_indexes, vf_indexes))
-
-        if pf:
-            all_fs.update(product(pf_indexes, [-1]))
-
-        for controller in controllers:
-            digits = list(map(int, re.findall(r'\d+', controller['name'])))
-
-            if len(digits) == 2:
-                controller_fs.add((digits[1], -1))  # This is a PF
-            elif len(digits) == 3:
-                controller_fs.add((digits[1], digits[2]))  # This is a VF
-
-        available_fs = all_fs - controller_fs
-
-        to_return = min(available_fs, default=(-1, -1))
-        return to_return[0], to_return[1]
+    def getAvailableFunctions(self, pf_index, vf_index):
+        # The returned function stays reserved until createController commits or releases it
+        return self._inventory.reserve(pf_index, vf_index, self._placement.order() if pf_index is None else None)
 
     def createController(self, subsystem_nqn, pf_index, vf_index, serial_number, model_number):
         if not serial_number:
@@ -211,40 +375,48 @@ class DPU(DPUInterface):
         if not model_number:
             model_number = DEFAULT_MODEL_NUMBER
 
-        pf_index, vf_index = self.getAvailableFunctions(pf_index, vf_index)
+        # Placement weighs the namespaces of other processes too
+        self._state.sync()
+        with self._controllers():
+            pf_index, vf_index = self.getAvailableFunctions(pf_index, vf_index)
+
+            if pf_index == -1:
+                return str(-1)
+
+            with self._locks.hold(('controller', controllerName(pf_index, vf_index))):
+                controller_id = self._createController(subsystem_nqn, pf_index, vf_index, serial_number, model_number)
+            if controller_id == str(-1):
+                self._inventory.release(pf_index, vf_index)
+            else:
+                self._inventory.commit(pf_index, vf_index)
+                self._state.addController(controllerName(pf_index, vf_index))
+            return controller_id
+
+    def _createController(self, subsystem_nqn, pf_index, vf_index, serial_number, model_number):
+        params = {'nqn': subsystem_nqn,
+                  'serial_number': serial_number,
+                  'model_number': model_number
+                  }
+        try:
+            self._snap.call('subsystem_nvme_create', params)
+        except (JsonRpcException, OSError) as e:
+            logger.error('subsystem_nvme_create failed: %s', e)
 
-        if pf_index == -1:
             return str(-1)
 
-        cmd_parts = ['snap_rpc.py', 'subsystem_nvme_create',
-                     subsystem_nqn,
-                     serial_number,
-                     model_number
-                     ]
+        params = {'subnqn': subsystem_nqn,
+                  'emulation_manager': self._placement.emulationManager(pf_index),
+                  'pf_id': pf_index,
+                  'conf': MLNX_SNAP_CONFIG_FILE
+                  }
+        if vf_index != -1:
+            params['vf_id'] = vf_index
 
-        cmd = subprocess.run(cmd_parts, capture_output=True, check=False)  # nosec
-        if cmd.returncode != 0:
-            logger.error('snap_rpc.py subsystem_nvme_create failed\n%s\n%s', cmd.stdout, cmd.stderr)
-
-            return str(-1)
-
-        if vf_index == -1:
-            cmd_parts = ['snap_rpc.py', 'controller_nvme_create',
-                         subsystem_nqn, 'mlx5_0',
-                         '--pf_id', str(pf_index),
-                         '-c', '/etc/mlnx_snap/mlnx_snap.json'
-                         ]
-        else:
-            cmd_parts = ['snap_rpc.py', 'controller_nvme_create',
-                         subsystem_nqn, 'mlx5_0',
-                         '--pf_id', str(pf_index),
-                         '--vf_id', str(vf_index),
-                         '-c', '/etc/mlnx_snap/mlnx_snap.json'
-                         ]
-
-        cmd = subprocess.run(cmd_parts, capture_output=True, check=False)  # nosec
-        if cmd.returncode != 0:
-            logger.error('snap_rpc.py controller_nvme_create failed\n%s\n%s', cmd.stdout, cmd.stderr)
+        try:
+            self._snap.call('controller_nvme_create', params)
+        except (JsonRpcException, OSError) as e:
+            logger.error('controller_nvme_create failed: %s', e)
+            self._inventory.invalidate()
 
             return str(-1)
 
@@ -253,19 +425,17 @@ class DPU(DPUInterface):
 
         return str(pf_index) + str(vf_index)
 
-    @staticmethod
-    def deleteController(controller_id):
-        pf_index = int(controller_id[0])
-        controller = 'NvmeEmu0pf' + str(pf_index)
-
-        if len(str(controller_id)) > 1:
-            vf_index = int(controller_id[1:])
-            controller = controller + 'vf' + str(vf_index)
+    def deleteController(self, controller_id):
+        pf_index, vf_index = parseControllerId(controller_id)
+        controller = controllerName(pf_index, vf_index)
 
-        cmd_parts = ['snap_rpc.py', 'controller_nvme_delete',
-                     '-c', controller
-                     ]
+        with self._controllers(), self._locks.hold(('controller', controller)):
+            try:
+                self._snap.call('controller_nvme_delete', {'name': controller})
+            except (JsonRpcException, OSError) as e:
+                logger.error('controller_nvme_delete failed: %s', e)
+                self._inventory.invalidate()
+                return
 
-        cmd = subprocess.run(cmd_parts, capture_output=True, check=False)  # nosec
-        if cmd.returncode != 0:
-            logger.error('snap_rpc.py controller_nvme_delete failed\n%s\n%s', cmd.stdout, cmd.stderr)
+            self._inventory.remove(pf_index, vf_index)
+            self._state.removeController(controller)
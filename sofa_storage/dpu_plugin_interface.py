@@ -3,6 +3,35 @@
   All rights reserved.
   SPDX-License-Identifier: Apache-2.0
 """
+import asyncio
+import contextvars
+from concurrent import futures
+
+from .log import logger
+from .error import SofaStorageException
+
+
+def _attempt(method, *args):
+    try:
+        method(*args)
+    except (SofaStorageException, OSError) as e:
+        return e
+    except Exception as e:  # pylint: disable=W0703
+        # A malformed item, e.g. a target path without a namespace id, fails on its own and not the whole batch
+        logger.exception('%s of volume %s failed', method.__name__, args[0])
+        return e
+    return None
+
+
+async def _attemptAsync(method, *args):
+    try:
+        await method(*args)
+    except (SofaStorageException, OSError) as e:
+        return e
+    except Exception as e:  # pylint: disable=W0703
+        logger.exception('%s of volume %s failed', method.__name__, args[0])
+        return e
+    return None
 
 
 class DPUInterface():
@@ -10,11 +39,113 @@ class DPUInterface():
     def __init__(self):
         self.dpu_type = None
 
-    def publishVolume(self, volume_id, volume_context, controller_id, target_path, secrets):  # pylint: disable=R0201
+    def publishVolume(self, volume_id, volume_context, controller_id, target_path, secrets, qos=None):  # pylint: disable=R0201
         pass
 
     def unpublishVolume(self, volume_id, target_path):  # pylint: disable=R0201
         pass
 
+    def setVolumeQos(self, volume_id, qos):  # pylint: disable=R0201
+        pass
+
+    def volumeTarget(self, volume_id):  # pylint: disable=R0201
+        """Hashable target the volume was published from, or None if unknown. Unpublishes of a batch sharing one run in order."""
+
+    def publishVolumes(self, volumes):
+        """Publishes (volume_id, volume_context, controller_id, target_path, secrets, qos) tuples in order.
+
+        Returns None or the raised error for each volume, plugins can override it to optimize a batch.
+        """
+        return [_attempt(self.publishVolume, *volume) for volume in volumes]
+
+    def unpublishVolumes(self, volumes):
+        """Unpublishes (volume_id, target_path) tuples in order, returns None or the raised error for each."""
+        return [_attempt(self.unpublishVolume, *volume) for volume in volumes]
+
     def getInfo(self):
         pass
+
+    def createController(self, subsystem_nqn, pf_index, vf_index, serial_number, model_number):  # pylint: disable=R0201
+        pass
+
+    def deleteController(self, controller_id):  # pylint: disable=R0201
+        pass
+
+
+class AsyncDPUInterface():
+    """DPUInterface for plugins whose backend calls are awaitable, served by the asyncio DPU server."""
+
+    def __init__(self):
+        self.dpu_type = None
+
+    async def publishVolume(self, volume_id, volume_context, controller_id, target_path, secrets, qos=None):
+        pass
+
+    async def unpublishVolume(self, volume_id, target_path):
+        pass
+
+    async def setVolumeQos(self, volume_id, qos):
+        pass
+
+    def volumeTarget(self, volume_id):  # pylint: disable=R0201
+        # Not awaitable, the servers call it while grouping a batch
+        pass
+
+    async def publishVolumes(self, volumes):
+        return [await _attemptAsync(self.publishVolume, *volume) for volume in volumes]
+
+    async def unpublishVolumes(self, volumes):
+        return [await _attemptAsync(self.unpublishVolume, *volume) for volume in volumes]
+
+    async def getInfo(self):
+        pass
+
+    async def createController(self, subsystem_nqn, pf_index, vf_index, serial_number, model_number):
+        pass
+
+    async def deleteController(self, controller_id):
+        pass
+
+
+class SyncDPUAdapter(AsyncDPUInterface):
+    """Runs a synchronous DPUInterface plugin on a bounded thread pool so it can be awaited.
+
+    At most max_workers plugin calls run at a time, only plugins implementing AsyncDPUInterface go beyond that.
+    """
+
+    def __init__(self, dpu, max_workers):
+        super().__init__()
+        self.dpu_type = dpu.dpu_type
+        self._dpu = dpu
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dpu-plugin')
+
+    def _run(self, method, *args):
+        # Executor threads don't inherit the caller's context, which carries the current trace span
+        return asyncio.get_running_loop().run_in_executor(self._executor, contextvars.copy_context().run, method, *args)
+
+    async def publishVolume(self, volume_id, volume_context, controller_id, target_path, secrets, qos=None):
+        await self._run(self._dpu.publishVolume, volume_id, volume_context, controller_id, target_path, secrets, qos)
+
+    async def unpublishVolume(self, volume_id, target_path):
+        await self._run(self._dpu.unpublishVolume, volume_id, target_path)
+
+    async def setVolumeQos(self, volume_id, qos):
+        await self._run(self._dpu.setVolumeQos, volume_id, qos)
+
+    def volumeTarget(self, volume_id):
+        return self._dpu.volumeTarget(volume_id)
+
+    async def publishVolumes(self, volumes):
+        return await self._run(self._dpu.publishVolumes, volumes)
+
+    async def unpublishVolumes(self, volumes):
+        return await self._run(self._dpu.unpublishVolumes, volumes)
+
+    async def getInfo(self):
+        return await self._run(self._dpu.getInfo)
+
+    async def createController(self, subsystem_nqn, pf_index, vf_index, serial_number, model_number):
+        return await self._run(self._dpu.createController, subsystem_nqn, pf_index, vf_index, serial_number, model_number)
+
+    async def deleteController(self, controller_id):
+        await self._run(self._dpu.deleteController, controller_id)
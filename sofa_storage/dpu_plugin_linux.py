@@ -3,27 +3,112 @@
   All rights reserved.
   SPDX-License-Identifier: Apache-2.0
 """
+from .config import config
+from .log import logger
+from .error import SofaStorageException
 from .dpu_plugin_interface import DPUInterface
+from .keyed_lock import KeyedLock
+from .bf_volume_journal import VolumeJournal
+from .linux_connections import ConnectionTable
+from .nvme_fabrics import NvmeFabrics, NvmeFabricsException
+from .nvme_transport import transportOptions
+from .bdev_qos import validateQos
+
+
+class EncryptionUnsupportedException(SofaStorageException):
+
+    def __init__(self, volume_id):
+        super().__init__()
+        self.volume_id = volume_id
+
+    def __str__(self):
+        return f'Cannot publish volume {self.volume_id} encrypted, the Linux plugin has no crypto support'
 
 
 class DPU(DPUInterface):
+    """Publishes volumes on the host itself through the kernel NVMe-oF host.
+
+    A volume is namespace nsid of subsystem subnqn, both taken from its volume_context and defaulting to NAMESPACE
+    and the volume id. Volumes of the same subsystem share one controller, see ConnectionTable.
+    """
 
-    def __init__(self):
+    def __init__(self, fabrics=None, journal=None):
         super().__init__()
         self.dpu_type = 'linux'
+        self._fabrics = fabrics or NvmeFabrics(config['LINUX_SYSFS_ROOT'], config['LINUX_DEV_ROOT'])
+        self._journal = journal or VolumeJournal(config['LINUX_VOLUME_JOURNAL'], config['LINUX_VOLUME_JOURNAL_COMPACT'])
+        self._connections = ConnectionTable(self._fabrics, config['LINUX_HOSTNQN'])
+        self._locks = KeyedLock()
+        self._volumes = {}
+        self._reconcile()
+
+    def _reconcile(self):
+        # The connections are whatever sysfs has, volumes journaled on a controller that is gone by now are dropped
+        def build(volumes):
+            lost = self._connections.load({volume_id: volume['target'] for volume_id, volume in volumes.items()})
+            for volume_id in lost:
+                logger.warning('Controller of volume %s is gone, dropping it', volume_id)
+            return {volume_id: volume for volume_id, volume in volumes.items() if volume_id not in lost}
+        self._journal.rebuild(build)
+        self._volumes = self._journal.volumes()
+        logger.info('Found %d published volumes: %s', len(self._volumes), self._connections.counts())
+
+    def _detach(self, volume_id):
+        volume = self._volumes[volume_id]
+        self._connections.detach(volume['target'], volume_id)
+        del self._volumes[volume_id]
+        self._journal.remove(volume_id)
+
+    def publishVolume(self, volume_id, volume_context, controller_id, target_path, secrets, qos=None):
+        if secrets:
+            raise EncryptionUnsupportedException(volume_id)
+        target = (config['TRANSPORT_TYPE'], volume_context['addr_traddr'], volume_context['addr_trsvcid'],
+                  volume_context.get('subnqn', volume_id))
+        nsid = int(volume_context.get('nsid', config['NAMESPACE']))
+        transport_options = transportOptions(volume_context, config['NVME_TRANSPORT_DEFAULTS'])
+        if qos:
+            validateQos(qos)
+
+        with self._locks.hold(volume_id):
+            volume = self._volumes.get(volume_id)
+            if volume is not None and volume['target'] == target and volume['nsid'] == nsid:
+                logger.info('Volume %s is already published', volume_id)
+                return
+            if volume is not None:
+                # Published from another target before, which would otherwise stay attached
+                self._detach(volume_id)
+            controller = self._connections.attach(target, volume_id, nsid, transport_options)
+            try:
+                device = self._fabrics.waitForNamespace(controller, nsid, config['LINUX_DEVICE_TIMEOUT'])
+            except NvmeFabricsException:
+                self._connections.detach(target, volume_id)
+                raise
+            self._volumes[volume_id] = {'target': target, 'nsid': nsid}
+            self._journal.add(volume_id, self._volumes[volume_id])
+        logger.info('Published volume %s as %s on %s, target path %s', volume_id, device, controller, target_path)
+        if qos:
+            logger.warning('Volume QoS is not supported by the Linux plugin, ignoring it for %s', volume_id)
+
+    def unpublishVolume(self, volume_id, target_path):
+        with self._locks.hold(volume_id):
+            if volume_id not in self._volumes:
+                logger.info('Volume %s is not published', volume_id)
+                return
+            self._detach(volume_id)
+        logger.info('Unpublished volume %s, target path %s', volume_id, target_path)
 
-    def publishVolume(self, volume_id, volume_context, controller_id, target_path, secrets):  # pylint: disable=R0201
-        # nvme connect -t rdma -n testnqn -a 172.31.0.202 -s 4420
-        print(f'Publish Volume: {volume_id}')
-        print(f'Target path: {target_path}')
+    def volumeTarget(self, volume_id):
+        volume = self._volumes.get(volume_id)
+        return tuple(volume['target']) if volume is not None else None
 
-    def unpublishVolume(self, volume_id, target_path):  # pylint: disable=R0201
-        # nvme disconnect -n testnqn
-        print(f'Unpublish Volume: {volume_id}')
-        print(f'Target path: {target_path}')
+    def setVolumeQos(self, volume_id, qos):
+        validateQos(qos)
+        logger.warning('Volume QoS is not supported by the Linux plugin, ignoring it for %s', volume_id)
 
     def getInfo(self):
         info = {
-            'dpu_type': self.dpu_type
+            'dpu_type': self.dpu_type,
+            'volumes': len(self._volumes),
+            **self._connections.counts()
         }
         return info
@@ -0,0 +1,178 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import threading
+import time
+
+from .config import config
+from .log import logger
+from .error import SofaStorageException, VolumeNotFoundException
+from .dpu_plugin_interface import DPUInterface
+from .bf_allocator import FunctionAllocator
+from .bf_inventory import controllerName, parseControllerId, parseNamespaceId
+from .nvme_transport import transportOptions
+from .bdev_qos import validateQos
+from .crypto_engine import CRYPTO_ENGINES, CryptoEngineException
+from .metrics import timed
+from .sim_models import Draws, failureRate, latencyModel
+
+METHODS = ('publishVolume', 'unpublishVolume', 'setVolumeQos', 'getInfo', 'createController', 'deleteController')
+
+
+class SimulatorException(SofaStorageException):
+
+    def __init__(self, reason):
+        super().__init__()
+        self.reason = reason
+
+    def __str__(self):
+        return self.reason
+
+
+class SimulatedFailureException(SimulatorException):
+
+    def __init__(self, method):
+        super().__init__(f'Simulated failure of {method}')
+        self.method = method
+
+
+def _models(setting):
+    for method, model in config[setting].items():
+        if method not in METHODS and method != 'default':
+            raise SimulatorException(f'Unknown method {method} in {setting}, expected default or one of {", ".join(METHODS)}')
+        yield method, model
+
+
+class DPU(DPUInterface):
+    """DPU simulated in memory, for load testing the servers and the control plane without a BlueField.
+
+    Controllers take PF/VF functions like the BF plugin and hold up to SIM_MAX_NAMESPACES namespaces. Every call
+    sleeps for a latency drawn from its SIM_LATENCY distribution and fails with its SIM_FAILURE_RATES probability,
+    both reproducible per call with SIM_SEED. Latency is spent outside the state lock, so calls overlap like they
+    would on a DPU.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.dpu_type = 'sim'
+        if config['DPU_SERVER_WORKERS'] > 1:
+            raise SimulatorException('The simulated DPU keeps its state in memory and cannot be shared by more than one '
+                                     'DPU server worker')
+        self._draws = Draws(config['SIM_SEED'])
+        self._latencies = {method: latencyModel(method, spec) for method, spec in _models('SIM_LATENCY')}
+        self._failure_rates = {method: failureRate(method, rate) for method, rate in _models('SIM_FAILURE_RATES')}
+        self._allocator = FunctionAllocator(config['SIM_NUMBER_OF_PF'], config['SIM_NUMBER_OF_VF_PER_PF'],
+                                            config['BF_RESERVATION_TTL'])
+        self._max_namespaces = config['SIM_MAX_NAMESPACES']
+        self._lock = threading.Lock()
+        self._controllers = {}
+        self._volumes = {}
+        logger.info('Simulating a DPU with seed %d', self._draws.seed)
+
+    def _simulate(self, method, key):
+        rng = self._draws.stream(method, key)
+        latency = self._latencies.get(method, self._latencies.get('default'))
+        with timed('sim', method):
+            if latency is not None:
+                time.sleep(latency(rng))
+            if rng.random() < self._failure_rates.get(method, self._failure_rates.get('default', 0)):
+                raise SimulatedFailureException(method)
+
+    def publishVolume(self, volume_id, volume_context, controller_id, target_path, secrets, qos=None):
+        controller = controllerName(*parseControllerId(controller_id))
+        nsid = parseNamespaceId(target_path)
+        crypto_engine = volume_context.get('crypto_engine', config['CRYPTO_ENGINE'])
+        if secrets and crypto_engine not in CRYPTO_ENGINES:
+            raise CryptoEngineException(crypto_engine)
+        transportOptions(volume_context, config['NVME_TRANSPORT_DEFAULTS'])
+        validateQos(qos or {})
+
+        self._simulate('publishVolume', volume_id)
+        with self._lock:
+            volume = self._volumes.get(volume_id)
+            if volume is not None:
+                if (volume['controller'], volume['nsid']) == (controller, nsid):
+                    return
+                raise SimulatorException(f'Volume {volume_id} is published as namespace {volume["nsid"]} of '
+                                         f'{volume["controller"]} already')
+            namespaces = self._controllers.get(controller)
+            if namespaces is None:
+                raise SimulatorException(f'Controller {controller} does not exist')
+            if nsid in namespaces:
+                raise SimulatorException(f'Namespace {nsid} of {controller} is in use by volume {namespaces[nsid]}')
+            if len(namespaces) >= self._max_namespaces:
+                raise SimulatorException(f'Controller {controller} has {self._max_namespaces} namespaces already')
+            namespaces[nsid] = volume_id
+            self._volumes[volume_id] = {'controller': controller, 'nsid': nsid, 'qos': dict(qos or {}),
+                                        'encrypted': bool(secrets)}
+
+    def unpublishVolume(self, volume_id, target_path):
+        self._simulate('unpublishVolume', volume_id)
+        # Only volumes and controllers that exist keep their call counts, or they would grow with every volume ever seen
+        self._draws.forget(volume_id)
+        with self._lock:
+            volume = self._volumes.pop(volume_id, None)
+            if volume is None:
+                logger.info('Volume %s is not published', volume_id)
+                return
+            del self._controllers[volume['controller']][volume['nsid']]
+
+    def setVolumeQos(self, volume_id, qos):
+        validateQos(qos)
+        self._simulate('setVolumeQos', volume_id)
+        with self._lock:
+            if volume_id not in self._volumes:
+                raise VolumeNotFoundException(volume_id)
+            for limit, value in qos.items():
+                if value:
+                    self._volumes[volume_id]['qos'][limit] = value
+                else:
+                    self._volumes[volume_id]['qos'].pop(limit, None)
+
+    def getInfo(self):
+        self._simulate('getInfo', None)
+        with self._lock:
+            info = {
+                'dpu_type': self.dpu_type,
+                'free_functions': self._allocator.freeCount(),
+                'controllers': len(self._controllers),
+                'volumes': len(self._volumes)
+            }
+        return info
+
+    def createController(self, subsystem_nqn, pf_index, vf_index, serial_number, model_number):
+        pf_index, vf_index = self._allocator.reserve(pf_index, vf_index)
+        if pf_index == -1:
+            return str(-1)
+        try:
+            self._simulate('createController', subsystem_nqn)
+        except SimulatedFailureException as e:
+            # Like the BF plugin, which returns -1 when SNAP fails the creation
+            logger.error('%s', e)
+            self._allocator.release(pf_index, vf_index)
+            return str(-1)
+        self._draws.forget(subsystem_nqn)
+        with self._lock:
+            self._allocator.commit(pf_index, vf_index)
+            self._controllers[controllerName(pf_index, vf_index)] = {}
+        if vf_index == -1:
+            return str(pf_index)
+        return str(pf_index) + str(vf_index)
+
+    def deleteController(self, controller_id):
+        pf_index, vf_index = parseControllerId(controller_id)
+        controller = controllerName(pf_index, vf_index)
+        try:
+            self._simulate('deleteController', controller)
+        except SimulatedFailureException as e:
+            logger.error('%s', e)
+            return
+        self._draws.forget(controller)
+        with self._lock:
+            for nsid, volume_id in self._controllers.pop(controller, {}).items():
+                logger.warning('Deleting %s drops namespace %d of volume %s', controller, nsid, volume_id)
+                del self._volumes[volume_id]
+                self._draws.forget(volume_id)
+            self._allocator.free(pf_index, vf_index)
@@ -3,28 +3,146 @@
   All rights reserved.
   SPDX-License-Identifier: Apache-2.0
 """
+import asyncio
+import os
+import time
 from concurrent import futures
-from signal import signal, SIGTERM, SIGINT
+from functools import partial
+from signal import signal, SIG_DFL, SIG_IGN, SIGTERM, SIGINT
 
 import grpc
 
 from .config import config
 from .log import logger
 from .generated import storage_pb2_grpc
-from .dpu_storage_service import DPUStorageService
+from .dpu_storage_service import AsyncDPUStorageService, DPUStorageService
+from .admission import Admission, AdmissionInterceptor, AsyncAdmissionInterceptor, LANES
+from . import command
+from . import metrics
+from . import tracing
+
+ADMISSION_METRICS = [('gauge', 'sofa_admission_queue_depth', 'Requests waiting for admission', 'queued'),
+                     ('gauge', 'sofa_admission_running', 'Admitted requests being handled', 'running'),
+                     ('counter', 'sofa_admission_admitted_total', 'Requests admitted', 'admitted'),
+                     ('counter', 'sofa_admission_rejected_total', 'Requests rejected with RESOURCE_EXHAUSTED', 'rejected'),
+                     ('counter', 'sofa_admission_waited_total', 'Requests admitted after queueing', 'waited'),
+                     ('counter', 'sofa_admission_wait_seconds_total', 'Time spent queued for admission', 'wait_seconds'),
+                     ('gauge', 'sofa_admission_max_wait_seconds', 'Longest time a request was queued', 'max_wait_seconds')]
+
+
+def admissionMetrics(admission):
+    stats = admission.stats()
+    return [(kind, name, documentation, [({'lane': lane}, lane_stats[key]) for lane, lane_stats in stats.items()])
+            for kind, name, documentation, key in ADMISSION_METRICS]
 
 
 class DPUServer:
 
     @staticmethod
     def run():
-        with futures.ThreadPoolExecutor(max_workers=config['DPU_SERVER_MAX_WORKERS']) as thread_pool:
-            server = grpc.server(thread_pool)
-            storage_pb2_grpc.add_StorageServicer_to_server(DPUStorageService(dpu=config['DPU_PLUGIN']), server)
+        if config['DPU_SERVER_WORKERS'] > 1:
+            DPUServer.supervise(config['DPU_SERVER_WORKERS'])
+            return
+        DPUServer.serve()
+
+    @staticmethod
+    def supervise(workers):
+        # Every worker has its own interpreter and GIL, the kernel spreads new connections over their listeners.
+        # Nothing gRPC is created before forking, the workers start their servers themselves
+        children = {}
+        stopping = False
+
+        def spawn(worker):
+            pid = DPUServer.fork(worker)
+            children[pid] = worker
+            if stopping:
+                os.kill(pid, SIGTERM)
+
+        def handle_sigterm(*_):
+            nonlocal stopping
+            logger.info("Received shutdown signal")
+            stopping = True
+            for pid in children:
+                os.kill(pid, SIGTERM)
+        signal(SIGTERM, handle_sigterm)
+        signal(SIGINT, handle_sigterm)
+
+        for worker in range(workers):
+            spawn(worker)
+        logger.info('DPU Server supervising %d workers on %s', workers, config['DPU_SERVER_URL'])
+        while children:
+            pid, status = os.wait()
+            worker = children.pop(pid)
+            if not stopping:
+                logger.error('DPU Server worker %d exited with wait status %d, restarting it', worker, status)
+                time.sleep(1)
+                spawn(worker)
+        logger.info("Shut down gracefully")
+
+    @staticmethod
+    def fork(worker):
+        pid = os.fork()
+        if pid == 0:
+            DPUServer.worker(worker)
+        return pid
+
+    @staticmethod
+    def worker(worker):
+        # Runs in the forked child and never returns
+        signal(SIGTERM, SIG_DFL)
+        signal(SIGINT, SIG_DFL)
+        status = 0
+        try:
+            DPUServer.serve(worker)
+        except BaseException:  # pylint: disable=W0703
+            logger.exception('DPU Server worker %d failed', worker)
+            status = 1
+        os._exit(status)  # pylint: disable=W0212
+
+    @staticmethod
+    def options():
+        if config['DPU_SERVER_WORKERS'] > 1:
+            return [('grpc.so_reuseport', 1)]
+        return []
+
+    @staticmethod
+    def cacheTtl():
+        if config['DPU_SERVER_WORKERS'] > 1 and config['DPU_REQUEST_CACHE_TTL'] > 0:
+            # Each worker would cache on its own, so a publish cached by one worker could be answered OK after
+            # another worker unpublished the volume
+            logger.warning('DPU_REQUEST_CACHE_TTL is ignored with more than one DPU server worker')
+            return 0
+        return config['DPU_REQUEST_CACHE_TTL']
+
+    @staticmethod
+    def serve(worker=None):
+        command.configure(config['DPU_COMMAND_MAX_PROCESSES'], config['DPU_COMMAND_TIMEOUT'])
+        if config['DPU_SERVER_MODE'] == 'async':
+            asyncio.run(DPUServer.runAsync(worker))
+            return
+
+        DPUServer.observe(worker)
+        admission = DPUServer.admission()
+        max_workers = config['DPU_SERVER_MAX_WORKERS']
+        interceptors = [tracing.TracingInterceptor(), metrics.MetricsInterceptor(), command.CommandContextInterceptor()]
+        if admission is not None:
+            # Queued requests hold a thread, so every queue slot needs one. Beyond that gRPC rejects by itself
+            max_workers += admission.queue_bound + len(LANES)
+            interceptors.append(AdmissionInterceptor(admission))
+
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as thread_pool:
+            server = grpc.server(thread_pool, interceptors=interceptors, options=DPUServer.options(),
+                                 maximum_concurrent_rpcs=max_workers if admission is not None else None)
+            service = DPUStorageService(dpu=config['DPU_PLUGIN'], batch_workers=config['DPU_BATCH_MAX_WORKERS'],
+                                        cache_ttl=DPUServer.cacheTtl(), cache_size=config['DPU_REQUEST_CACHE_SIZE'])
+            storage_pb2_grpc.add_StorageServicer_to_server(service, server)
             server.add_insecure_port(config['DPU_SERVER_URL'])
             server.start()
 
             def handle_sigterm(*_):
+                # A worker is signalled by its supervisor and often by the service manager too, stop only once
+                signal(SIGTERM, SIG_IGN)
+                signal(SIGINT, SIG_IGN)
                 logger.info("Received shutdown signal")
                 all_rpcs_done_event = server.stop(30)
                 all_rpcs_done_event.wait(30)
@@ -34,6 +152,49 @@ class DPUServer:
             logger.info('DPU Server listening on %s', config['DPU_SERVER_URL'])
             server.wait_for_termination()
 
+    @staticmethod
+    def observe(worker=None):
+        if config['DPU_METRICS_URL']:
+            host, port = config['DPU_METRICS_URL'].rsplit(':', 1)
+            # Scrapes can't be spread over workers like RPCs, so each worker has its own port
+            metrics.serve(f'{host}:{int(port) + (worker or 0)}')
+        if config['DPU_TRACE_FILE']:
+            tracing.configure('dpu' if worker is None else f'dpu-{worker}', tracing.JsonlExporter(config['DPU_TRACE_FILE']))
+
+    @staticmethod
+    def admission():
+        if not config['DPU_ADMISSION_LANES']:
+            return None
+        admission = Admission(config['DPU_SERVER_MAX_WORKERS'], config['DPU_ADMISSION_LANES'])
+        metrics.REGISTRY.registerCollector(partial(admissionMetrics, admission))
+        return admission
+
+    @staticmethod
+    async def runAsync(worker=None):
+        # One event loop carries all in-flight RPCs, only synchronous plugin calls take a thread
+        DPUServer.observe(worker)
+        admission = DPUServer.admission()
+        interceptors = [tracing.AsyncTracingInterceptor(), metrics.AsyncMetricsInterceptor(), command.AsyncCommandContextInterceptor()]
+        if admission is not None:
+            interceptors.append(AsyncAdmissionInterceptor(admission))
+        server = grpc.aio.server(interceptors=interceptors, options=DPUServer.options())
+        service = AsyncDPUStorageService(dpu=config['DPU_PLUGIN'], max_workers=config['DPU_SERVER_MAX_WORKERS'],
+                                         cache_ttl=DPUServer.cacheTtl(), cache_size=config['DPU_REQUEST_CACHE_SIZE'])
+        storage_pb2_grpc.add_StorageServicer_to_server(service, server)
+        server.add_insecure_port(config['DPU_SERVER_URL'])
+        await server.start()
+
+        shutdown = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (SIGTERM, SIGINT):
+            loop.add_signal_handler(signum, shutdown.set)
+        logger.info('DPU Server listening on %s (async)', config['DPU_SERVER_URL'])
+        await shutdown.wait()
+
+        logger.info("Received shutdown signal")
+        await server.stop(30)
+        logger.info("Shut down gracefully")
+
 
 if __name__ == '__main__':
     DPUServer.run()
@@ -3,59 +3,171 @@
   All rights reserved.
   SPDX-License-Identifier: Apache-2.0
 """
+import asyncio
+import contextvars
+import hashlib
 import importlib
+from concurrent import futures
+
+import grpc
+
 from .log import logger
+from .error import SofaStorageException, VolumeNotFoundException
+from .crypto_engine import CryptoEngineException
+from .nvme_transport import TransportOptionException
+from .bf_inventory import TargetPathException
+from .bdev_qos import QosException, qosFromMessage
+from .command import CommandCancelledException, CommandTimeoutException
+from .dpu_plugin_interface import AsyncDPUInterface, SyncDPUAdapter
+from .request_cache import RequestCache, PUBLISH, UNPUBLISH
 from .generated import storage_pb2_grpc, storage_pb2
 
+INVALID_ARGUMENT_ERRORS = (CryptoEngineException, TransportOptionException, QosException, TargetPathException)
+
+
+def errorStatus(e, action):
+    if isinstance(e, INVALID_ARGUMENT_ERRORS):
+        return grpc.StatusCode.INVALID_ARGUMENT, str(e)
+    if isinstance(e, VolumeNotFoundException):
+        return grpc.StatusCode.NOT_FOUND, str(e)
+    if isinstance(e, CommandTimeoutException):
+        return grpc.StatusCode.DEADLINE_EXCEEDED, f'{action} failed: {e}'
+    if isinstance(e, CommandCancelledException):
+        return grpc.StatusCode.CANCELLED, f'{action} failed: {e}'
+    return grpc.StatusCode.INTERNAL, f'{action} failed: {e}'
+
+
+def setError(context, e, action):
+    code, details = errorStatus(e, action)
+    context.set_code(code)
+    context.set_details(details)
+
+
+def batchGroups(items, key):
+    """Indices of items grouped by key, each group keeps request order."""
+    groups = {}
+    for index, item in enumerate(items):
+        groups.setdefault(key(item), []).append(index)
+    return list(groups.values())
+
+
+def batchStatuses(response, volume_ids, errors, action):
+    for volume_id, error in zip(volume_ids, errors):
+        status = response.statuses.add(volume_id=volume_id)
+        if error is not None:
+            code, status.message = errorStatus(error, action)
+            status.code = code.value[0]
+    return response
+
+
+def unpublishGroup(dpu):
+    # Volumes on one target share its connection, so their unpublishes run in order, the others in parallel
+    return lambda volume: dpu.volumeTarget(volume[0]) or ('volume', volume[0])
+
+
+def publishArgs(request):
+    # network = request.network
+    return (request.volume_id, request.volume_context, request.controller_id, request.target_path, request.secrets,
+            qosFromMessage(request.qos))
+
+
+def publishKey(request):
+    # The whole request, so a publish retried with other parameters is not answered with the result of the earlier one
+    digest = hashlib.sha256(request.SerializeToString(deterministic=True)).hexdigest()
+    return PUBLISH, request.volume_id, request.target_path, digest
+
+
+def infoResponse(info):
+    # Plugins report what they keep track of, e.g. the Linux plugin has no functions
+    return storage_pb2.DPUGetInfoResponse(**{field: info[field] for field in ('dpu_type', 'free_functions', 'volumes')
+                                             if field in info})
+
+
+def createControllerArgs(request):
+    pf_index = None
+    vf_index = None
+    serial_number = None
+    model_number = None
+
+    if request.HasField('pf_index'):
+        pf_index = request.pf_index
+
+    if request.HasField('vf_index'):
+        vf_index = request.vf_index
+
+    if request.HasField('serial_number'):
+        serial_number = request.serial_number
+
+    if request.HasField('model_number'):
+        model_number = request.model_number
+
+    return request.subsystem_nqn, pf_index, vf_index, serial_number, model_number
+
 
 class DPUStorageService(storage_pb2_grpc.StorageServicer):
 
-    def __init__(self, dpu: str = 'sofa_storage.dpu_plugin_linux'):
+    def __init__(self, dpu: str = 'sofa_storage.dpu_plugin_linux', batch_workers: int = 8, cache_ttl: float = 0,
+                 cache_size: int = 4096):
         logger.info('Using DPU plugin: %s', dpu)
-        self._dpu = importlib.import_module(dpu, ".").DPU()
+        # A plugin module, or a plugin already set up, e.g. on a fake backend
+        self._dpu = importlib.import_module(dpu, ".").DPU() if isinstance(dpu, str) else dpu
+        self._requests = RequestCache(cache_ttl, cache_size)
+        self._batch_executor = futures.ThreadPoolExecutor(max_workers=batch_workers, thread_name_prefix='dpu-batch')
 
-    def DPUPublishVolume(self, request, context):
-        volume_id = request.volume_id
-        volume_context = request.volume_context
-        controller_id = request.controller_id
-        # network = request.network
-        target_path = request.target_path
-        secrets = request.secrets
+    def _batch(self, method, items, key):
+        self._requests.invalidate(item[0] for item in items)
+        errors = [None] * len(items)
+
+        def run(indices):
+            for index, error in zip(indices, method([items[index] for index in indices])):
+                errors[index] = error
 
-        self._dpu.publishVolume(volume_id, volume_context, controller_id, target_path, secrets)
+        groups = batchGroups(items, key)
+        contexts = [contextvars.copy_context() for _ in groups]
+        list(self._batch_executor.map(lambda context, indices: context.run(run, indices), contexts, groups))
+        self._requests.invalidate(item[0] for item in items)
+        return errors
+
+    def DPUPublishVolume(self, request, context):
+        try:
+            self._requests.call(publishKey(request), self._dpu.publishVolume, *publishArgs(request))
+        except (SofaStorageException, OSError) as e:
+            setError(context, e, 'Publishing volume')
         return storage_pb2.DPUPublishVolumeResponse()
 
     def DPUUnpublishVolume(self, request, context):
         volume_id = request.volume_id
         target_path = request.target_path
-        self._dpu.unpublishVolume(volume_id, target_path)
+        try:
+            self._requests.call((UNPUBLISH, volume_id, target_path), self._dpu.unpublishVolume, volume_id, target_path)
+        except (SofaStorageException, OSError) as e:
+            setError(context, e, 'Unpublishing volume')
         return storage_pb2.DPUUnpublishVolumeResponse()
 
+    def DPUSetVolumeQos(self, request, context):
+        try:
+            self._dpu.setVolumeQos(request.volume_id, qosFromMessage(request.qos))
+        except (SofaStorageException, OSError) as e:
+            setError(context, e, 'Setting volume QoS')
+        return storage_pb2.DPUSetVolumeQosResponse()
+
+    def DPUPublishVolumes(self, request, context):
+        volumes = [publishArgs(volume) for volume in request.volumes]
+        errors = self._batch(self._dpu.publishVolumes, volumes, lambda volume: volume[2])
+        return batchStatuses(storage_pb2.DPUPublishVolumesResponse(), [volume[0] for volume in volumes], errors,
+                             'Publishing volume')
+
+    def DPUUnpublishVolumes(self, request, context):
+        volumes = [(volume.volume_id, volume.target_path) for volume in request.volumes]
+        errors = self._batch(self._dpu.unpublishVolumes, volumes, unpublishGroup(self._dpu))
+        return batchStatuses(storage_pb2.DPUUnpublishVolumesResponse(), [volume[0] for volume in volumes], errors,
+                             'Unpublishing volume')
+
     def DPUGetInfo(self, request, context):
-        info = self._dpu.getInfo()
-        return storage_pb2.DPUGetInfoResponse(dpu_type=info['dpu_type'])
+        return infoResponse(self._dpu.getInfo())
 
     def DPUCreateController(self, request, context):
-        subsystem_nqn = request.subsystem_nqn
-
-        pf_index = None
-        vf_index = None
-        serial_number = None
-        model_number = None
-
-        if request.HasField('pf_index'):
-            pf_index = request.pf_index
-
-        if request.HasField('vf_index'):
-            vf_index = request.vf_index
-
-        if request.HasField('serial_number'):
-            serial_number = request.serial_number
-
-        if request.HasField('model_number'):
-            model_number = request.model_number
-
-        controller_id = self._dpu.createController(subsystem_nqn, pf_index, vf_index, serial_number, model_number)
+        controller_id = self._dpu.createController(*createControllerArgs(request))
 
         rsp = storage_pb2.DPUCreateControllerResponse()
         rsp.controller_id = controller_id
@@ -67,3 +179,74 @@ class DPUStorageService(storage_pb2_grpc.StorageServicer):
         self._dpu.deleteController(controller_id)
 
         return storage_pb2.DPUDeleteControllerResponse()
+
+
+class AsyncDPUStorageService(storage_pb2_grpc.StorageServicer):
+    """grpc.aio servicer, synchronous plugins run on a thread pool through SyncDPUAdapter."""
+    # pylint: disable=W0236
+
+    def __init__(self, dpu: str = 'sofa_storage.dpu_plugin_linux', max_workers: int = 10, cache_ttl: float = 0,
+                 cache_size: int = 4096):
+        logger.info('Using DPU plugin: %s', dpu)
+        # A plugin module, or a plugin already set up, e.g. on a fake backend
+        self._dpu = importlib.import_module(dpu, ".").DPU() if isinstance(dpu, str) else dpu
+        self._requests = RequestCache(cache_ttl, cache_size)
+        if not isinstance(self._dpu, AsyncDPUInterface):
+            self._dpu = SyncDPUAdapter(self._dpu, max_workers)
+
+    async def _batch(self, method, items, key):
+        self._requests.invalidate(item[0] for item in items)
+        errors = [None] * len(items)
+
+        async def run(indices):
+            for index, error in zip(indices, await method([items[index] for index in indices])):
+                errors[index] = error
+
+        await asyncio.gather(*[run(indices) for indices in batchGroups(items, key)])
+        self._requests.invalidate(item[0] for item in items)
+        return errors
+
+    async def DPUPublishVolume(self, request, context):
+        try:
+            await self._requests.callAsync(publishKey(request), self._dpu.publishVolume, *publishArgs(request))
+        except (SofaStorageException, OSError) as e:
+            setError(context, e, 'Publishing volume')
+        return storage_pb2.DPUPublishVolumeResponse()
+
+    async def DPUUnpublishVolume(self, request, context):
+        try:
+            await self._requests.callAsync((UNPUBLISH, request.volume_id, request.target_path), self._dpu.unpublishVolume,
+                                           request.volume_id, request.target_path)
+        except (SofaStorageException, OSError) as e:
+            setError(context, e, 'Unpublishing volume')
+        return storage_pb2.DPUUnpublishVolumeResponse()
+
+    async def DPUSetVolumeQos(self, request, context):
+        try:
+            await self._dpu.setVolumeQos(request.volume_id, qosFromMessage(request.qos))
+        except (SofaStorageException, OSError) as e:
+            setError(context, e, 'Setting volume QoS')
+        return storage_pb2.DPUSetVolumeQosResponse()
+
+    async def DPUPublishVolumes(self, request, context):
+        volumes = [publishArgs(volume) for volume in request.volumes]
+        errors = await self._batch(self._dpu.publishVolumes, volumes, lambda volume: volume[2])
+        return batchStatuses(storage_pb2.DPUPublishVolumesResponse(), [volume[0] for volume in volumes], errors,
+                             'Publishing volume')
+
+    async def DPUUnpublishVolumes(self, request, context):
+        volumes = [(volume.volume_id, volume.target_path) for volume in request.volumes]
+        errors = await self._batch(self._dpu.unpublishVolumes, volumes, unpublishGroup(self._dpu))
+        return batchStatuses(storage_pb2.DPUUnpublishVolumesResponse(), [volume[0] for volume in volumes], errors,
+                             'Unpublishing volume')
+
+    async def DPUGetInfo(self, request, context):
+        return infoResponse(await self._dpu.getInfo())
+
+    async def DPUCreateController(self, request, context):
+        controller_id = await self._dpu.createController(*createControllerArgs(request))
+        return storage_pb2.DPUCreateControllerResponse(controller_id=controller_id)
+
+    async def DPUDeleteController(self, request, context):
+        await self._dpu.deleteController(request.controller_id)
+        return storage_pb2.DPUDeleteControllerResponse()
@@ -0,0 +1,189 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import os
+import tempfile
+import time
+from concurrent import futures
+
+import click
+import grpc
+
+from .config import config
+from .generated import storage_pb2
+from .dpu_storage_service import DPUStorageService
+from .jsonrpc_fake import FakeJsonRpcServer, FakeSnap
+from .nvme_fabrics_fake import FakeNvmeFabrics
+from .bf_volume_journal import VolumeJournal
+from . import dpu_plugin_linux
+
+
+class StressContext():
+
+    def __init__(self):
+        self.code = grpc.StatusCode.OK
+        self.details = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def runConcurrently(call, requests, workers):
+    latencies = []
+    failures = []
+
+    def run(request):
+        context = StressContext()
+        start = time.monotonic()
+        call(request, context)
+        latencies.append(time.monotonic() - start)
+        if context.code != grpc.StatusCode.OK:
+            failures.append(context.details)
+
+    start = time.monotonic()
+    with futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(run, requests))
+    return time.monotonic() - start, latencies, failures
+
+
+def report(operation, controllers, workers, elapsed, latencies, failures, delay):
+    count = len(latencies)
+    print(f'{count} {operation} on {controllers} controllers with {workers} callers in {elapsed:.2f} s '
+          f'({count / elapsed:.0f} {operation}/s), {len(failures)} failed')
+    print(f'latency p50 {percentile(latencies, 0.5) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms, '
+          f'fully serialized backend would take {count * 2 * delay:.2f} s')
+
+
+class BfBackend():
+    """BF plugin on a fake SPDK/SNAP, every volume gets its own namespace and NVMe-oF controller."""
+
+    def __init__(self, tmp_dir, workers, delay):
+        socket_path = os.path.join(tmp_dir, 'spdk.sock')
+        self._fake = FakeSnap(delay=delay)
+        self._server = FakeJsonRpcServer(socket_path, self._fake.handlers).start()
+        config.update({'SPDK_RPC_SOCKET': socket_path, 'SNAP_RPC_SOCKET': socket_path, 'RPC_MAX_CONNECTIONS': workers,
+                       'BF_VOLUME_JOURNAL': os.path.join(tmp_dir, 'bf_volumes.jsonl'), 'BF_WARM_POOL_SIZE': 0})
+        self.service = DPUStorageService(dpu='sofa_storage.dpu_plugin_bf')
+
+    def createControllers(self, controllers):
+        controller_ids = []
+        for i in range(controllers):
+            request = storage_pb2.DPUCreateControllerRequest(subsystem_nqn=f'nqn.2021-06.sofa.stress:{i}')
+            controller_ids.append(self.service.DPUCreateController(request, StressContext()).controller_id)  # pylint: disable=E1101
+        return controller_ids
+
+    @staticmethod
+    def volumeContext(i, controllers):  # pylint: disable=W0613
+        return {'addr_traddr': '127.0.0.1', 'addr_trsvcid': str(4420 + i)}
+
+    @staticmethod
+    def connections(publishes, controllers):  # pylint: disable=W0613
+        return publishes
+
+    def state(self):
+        """Attached namespaces and connected NVMe-oF controllers."""
+        return sum(len(ctrl['namespaces']) for ctrl in self._fake.controllers.values()), len(self._fake.nvme_controllers)
+
+    def stop(self):
+        self._server.stop()
+
+
+class LinuxBackend():
+    """Linux plugin on a fake sysfs/devfs tree, the volumes of a subsystem share one connection."""
+
+    def __init__(self, tmp_dir, workers, delay):  # pylint: disable=W0613
+        self._fabrics = FakeNvmeFabrics(os.path.join(tmp_dir, 'linux'), delay=delay)
+        self.service = DPUStorageService(dpu=dpu_plugin_linux.DPU(
+            self._fabrics, VolumeJournal(os.path.join(tmp_dir, 'linux_volumes.jsonl'), config['LINUX_VOLUME_JOURNAL_COMPACT'])))
+
+    def createControllers(self, controllers):
+        # Subsystems on the target, each exposing the namespaces its volumes are published from
+        self._fabrics.subsystems.update({self._subsystem(i): [] for i in range(controllers)})
+        return [''] * controllers
+
+    @staticmethod
+    def _subsystem(i):
+        return f'nqn.2021-06.sofa.stress:{i}'
+
+    def volumeContext(self, i, controllers):
+        nsid = i // controllers + 1
+        self._fabrics.subsystems[self._subsystem(i % controllers)].append(nsid)
+        return {'addr_traddr': '127.0.0.1', 'addr_trsvcid': '4420', 'subnqn': self._subsystem(i % controllers),
+                'nsid': str(nsid)}
+
+    @staticmethod
+    def connections(publishes, controllers):
+        return min(publishes, controllers)
+
+    def state(self):
+        """Namespace block devices and connected NVMe-oF controllers."""
+        return len(os.listdir(self._fabrics.dev_root)), len(self._fabrics.controllers())
+
+    def stop(self):
+        pass
+
+
+BACKENDS = {'bf': BfBackend, 'linux': LinuxBackend}
+
+
+@click.command()
+@click.option('--plugin', type=click.Choice(list(BACKENDS)), default='bf', help='DPU plugin to drive, on its fake backend')
+@click.option('--controllers', type=int, default=32, help='Number of emulated controllers, or subsystems for the Linux plugin, '
+              'to spread the volumes over')
+@click.option('--publishes', type=int, default=512, help='Number of volumes to publish concurrently')
+@click.option('--workers', type=int, default=64, help='Number of concurrent callers')
+@click.option('--delay', type=float, default=0.002, help='Simulated latency of every backend call in seconds')
+def stress(plugin, controllers, publishes, workers, delay):
+    """Drive DPUStorageService with concurrent publishes and unpublishes against a fake backend"""
+    config.setdefault('CTRL_SERVER_URL', '')
+    config.setdefault('TRANSPORT_TYPE', 'rdma')
+    config.setdefault('NAMESPACE', '1')
+
+    # Removed with the sockets and journals in it once the run is over
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        backend = BACKENDS[plugin](tmp_dir, workers, delay)
+        try:
+            controller_ids = backend.createControllers(controllers)
+
+            requests = []
+            for i in range(publishes):
+                nsid = i // controllers + 1
+                request = storage_pb2.DPUPublishVolumeRequest(volume_id=f'stress_volume_{i}',
+                                                              controller_id=controller_ids[i % controllers],
+                                                              target_path=f'/dev/nvme{i % controllers}n{nsid}')
+                request.volume_context.update(backend.volumeContext(i, controllers))  # pylint: disable=E1101
+                requests.append(request)
+
+            elapsed, latencies, failures = runConcurrently(backend.service.DPUPublishVolume, requests, workers)
+            attached, connected = backend.state()
+            report('publishes', controllers, workers, elapsed, latencies, failures, delay)
+            print(f'{attached} namespaces attached, {connected} NVMe-oF controllers')
+
+            # The target path is not needed anymore, the plugins look the volume up by its id
+            unpublish_requests = [storage_pb2.DPUUnpublishVolumeRequest(volume_id=request.volume_id, target_path='')
+                                  for request in requests]
+            elapsed, latencies, unpublish_failures = runConcurrently(backend.service.DPUUnpublishVolume, unpublish_requests, workers)
+            left_attached, left_connected = backend.state()
+            report('unpublishes', controllers, workers, elapsed, latencies, unpublish_failures, delay)
+            print(f'{left_attached} namespaces attached, {left_connected} NVMe-oF controllers left')
+        finally:
+            backend.stop()
+
+    if failures or attached != publishes or connected != backend.connections(publishes, controllers):
+        raise click.ClickException('Backend state does not match the published volumes')
+    if unpublish_failures or left_attached or left_connected:
+        raise click.ClickException('Backend state is not clean after unpublishing all volumes')
+
+
+if __name__ == '__main__':
+    stress()  # pylint: disable=E1120
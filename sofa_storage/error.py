@@ -9,3 +9,13 @@ from builtins import Exception
 class SofaStorageException(Exception):
     def __str__(self):
         return 'SOFA Storage Exception'
+
+
+class VolumeNotFoundException(SofaStorageException):
+
+    def __init__(self, volume_id):
+        super().__init__()
+        self.volume_id = volume_id
+
+    def __str__(self):
+        return f'Volume {self.volume_id} is not published'
@@ -19,7 +19,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   syntax='proto3',
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n\rstorage.proto\x12\x07storage\"\xdc\x02\n\x17\x44PUPublishVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12K\n\x0evolume_context\x18\x02 \x03(\x0b\x32\x33.storage.DPUPublishVolumeRequest.VolumeContextEntry\x12\x15\n\rcontroller_id\x18\x03 \x01(\t\x12\x0f\n\x07network\x18\x04 \x01(\t\x12\x13\n\x0btarget_path\x18\x05 \x01(\t\x12>\n\x07secrets\x18\x06 \x03(\x0b\x32-.storage.DPUPublishVolumeRequest.SecretsEntry\x1a\x34\n\x12VolumeContextEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a.\n\x0cSecretsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x1a\n\x18\x44PUPublishVolumeResponse\"C\n\x19\x44PUUnpublishVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x13\n\x0btarget_path\x18\x02 \x01(\t\"\x1c\n\x1a\x44PUUnpublishVolumeResponse\"\x13\n\x11\x44PUGetInfoRequest\"&\n\x12\x44PUGetInfoResponse\x12\x10\n\x08\x64pu_type\x18\x01 \x01(\t\"\xd5\x01\n\x1a\x44PUCreateControllerRequest\x12\x15\n\rsubsystem_nqn\x18\x01 \x01(\t\x12\x15\n\x08pf_index\x18\x02 \x01(\x03H\x00\x88\x01\x01\x12\x15\n\x08vf_index\x18\x03 \x01(\x03H\x01\x88\x01\x01\x12\x1a\n\rserial_number\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x19\n\x0cmodel_number\x18\x05 \x01(\tH\x03\x88\x01\x01\x42\x0b\n\t_pf_indexB\x0b\n\t_vf_indexB\x10\n\x0e_serial_numberB\x0f\n\r_model_number\"4\n\x1b\x44PUCreateControllerResponse\x12\x15\n\rcontroller_id\x18\x01 \x01(\t\"3\n\x1a\x44PUDeleteControllerRequest\x12\x15\n\rcontroller_id\x18\x01 \x01(\t\"\x1d\n\x1b\x44PUDeleteControllerResponse2\xd6\x03\n\x07Storage\x12Y\n\x10\x44PUPublishVolume\x12 .storage.DPUPublishVolumeRequest\x1a!.storage.DPUPublishVolumeResponse\"\x00\x12_\n\x12\x44PUUnpublishVolume\x12\".storage.DPUUnpublishVolumeRequest\x1a#.storage.DPUUnpublishVolumeResponse\"\x00\x12G\n\nDPUGetInfo\x12\x1a.storage.DPUGetInfoRequest\x1a\x1b.storage.DPUGetInfoResponse\"\x00\x12\x62\n\x13\x44PUCreateController\x12#.storage.DPUCreateControllerRequest\x1a$.storage.DPUCreateControllerResponse\"\x00\x12\x62\n\x13\x44PUDeleteController\x12#.storage.DPUDeleteControllerRequest\x1a$.storage.DPUDeleteControllerResponse\"\x00\x62\x06proto3'
+  serialized_pb=b'\n\rstorage.proto\x12\x07storage\"\xfd\x02\n\x17\x44PUPublishVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12K\n\x0evolume_context\x18\x02 \x03(\x0b\x32\x33.storage.DPUPublishVolumeRequest.VolumeContextEntry\x12\x15\n\rcontroller_id\x18\x03 \x01(\t\x12\x0f\n\x07network\x18\x04 \x01(\t\x12\x13\n\x0btarget_path\x18\x05 \x01(\t\x12>\n\x07secrets\x18\x06 \x03(\x0b\x32-.storage.DPUPublishVolumeRequest.SecretsEntry\x12\x1f\n\x03qos\x18\x07 \x01(\x0b\x32\x12.storage.VolumeQos\x1a\x34\n\x12VolumeContextEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a.\n\x0cSecretsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd9\x01\n\tVolumeQos\x12\x1b\n\x0erw_ios_per_sec\x18\x01 \x01(\x04H\x00\x88\x01\x01\x12\x1e\n\x11rw_mbytes_per_sec\x18\x02 \x01(\x04H\x01\x88\x01\x01\x12\x1d\n\x10r_mbytes_per_sec\x18\x03 \x01(\x04H\x02\x88\x01\x01\x12\x1d\n\x10w_mbytes_per_sec\x18\x04 \x01(\x04H\x03\x88\x01\x01\x42\x11\n\x0f_rw_ios_per_secB\x14\n\x12_rw_mbytes_per_secB\x13\n\x11_r_mbytes_per_secB\x13\n\x11_w_mbytes_per_sec\"\x1a\n\x18\x44PUPublishVolumeResponse\"C\n\x19\x44PUUnpublishVolumeRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x13\n\x0btarget_path\x18\x02 \x01(\t\"\x1c\n\x1a\x44PUUnpublishVolumeResponse\"\x13\n\x11\x44PUGetInfoRequest\"x\n\x12\x44PUGetInfoResponse\x12\x10\n\x08\x64pu_type\x18\x01 \x01(\t\x12\x1b\n\x0e\x66ree_functions\x18\x02 \x01(\rH\x00\x88\x01\x01\x12\x14\n\x07volumes\x18\x03 \x01(\rH\x01\x88\x01\x01\x42\x11\n\x0f_free_functionsB\n\n\x08_volumes\"\xd5\x01\n\x1a\x44PUCreateControllerRequest\x12\x15\n\rsubsystem_nqn\x18\x01 \x01(\t\x12\x15\n\x08pf_index\x18\x02 \x01(\x03H\x00\x88\x01\x01\x12\x15\n\x08vf_index\x18\x03 \x01(\x03H\x01\x88\x01\x01\x12\x1a\n\rserial_number\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x19\n\x0cmodel_number\x18\x05 \x01(\tH\x03\x88\x01\x01\x42\x0b\n\t_pf_indexB\x0b\n\t_vf_indexB\x10\n\x0e_serial_numberB\x0f\n\r_model_number\"4\n\x1b\x44PUCreateControllerResponse\x12\x15\n\rcontroller_id\x18\x01 \x01(\t\"3\n\x1a\x44PUDeleteControllerRequest\x12\x15\n\rcontroller_id\x18\x01 \x01(\t\"\x1d\n\x1b\x44PUDeleteControllerResponse\"L\n\x16\x44PUSetVolumeQosRequest\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x1f\n\x03qos\x18\x02 \x01(\x0b\x32\x12.storage.VolumeQos\"\x19\n\x17\x44PUSetVolumeQosResponse\"M\n\x18\x44PUPublishVolumesRequest\x12\x31\n\x07volumes\x18\x01 \x03(\x0b\x32 .storage.DPUPublishVolumeRequest\"C\n\x0f\x44PUVolumeStatus\x12\x11\n\tvolume_id\x18\x01 \x01(\t\x12\x0c\n\x04\x63ode\x18\x02 \x01(\x05\x12\x0f\n\x07message\x18\x03 \x01(\t\"G\n\x19\x44PUPublishVolumesResponse\x12*\n\x08statuses\x18\x01 \x03(\x0b\x32\x18.storage.DPUVolumeStatus\"Q\n\x1a\x44PUUnpublishVolumesRequest\x12\x33\n\x07volumes\x18\x01 \x03(\x0b\x32\".storage.DPUUnpublishVolumeRequest\"I\n\x1b\x44PUUnpublishVolumesResponse\x12*\n\x08statuses\x18\x01 \x03(\x0b\x32\x18.storage.DPUVolumeStatus2\xf0\x05\n\x07Storage\x12Y\n\x10\x44PUPublishVolume\x12 .storage.DPUPublishVolumeRequest\x1a!.storage.DPUPublishVolumeResponse\"\x00\x12_\n\x12\x44PUUnpublishVolume\x12\".storage.DPUUnpublishVolumeRequest\x1a#.storage.DPUUnpublishVolumeResponse\"\x00\x12G\n\nDPUGetInfo\x12\x1a.storage.DPUGetInfoRequest\x1a\x1b.storage.DPUGetInfoResponse\"\x00\x12\x62\n\x13\x44PUCreateController\x12#.storage.DPUCreateControllerRequest\x1a$.storage.DPUCreateControllerResponse\"\x00\x12\x62\n\x13\x44PUDeleteController\x12#.storage.DPUDeleteControllerRequest\x1a$.storage.DPUDeleteControllerResponse\"\x00\x12V\n\x0f\x44PUSetVolumeQos\x12\x1f.storage.DPUSetVolumeQosRequest\x1a .storage.DPUSetVolumeQosResponse\"\x00\x12\\\n\x11\x44PUPublishVolumes\x12!.storage.DPUPublishVolumesRequest\x1a\".storage.DPUPublishVolumesResponse\"\x00\x12\x62\n\x13\x44PUUnpublishVolumes\x12#.storage.DPUUnpublishVolumesRequest\x1a$.storage.DPUUnpublishVolumesResponse\"\x00\x62\x06proto3'
 )
 
 
@@ -59,8 +59,8 @@ _DPUPUBLISHVOLUMEREQUEST_VOLUMECONTEXTENTRY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=275,
-  serialized_end=327,
+  serialized_start=308,
+  serialized_end=360,
 )
 
 _DPUPUBLISHVOLUMEREQUEST_SECRETSENTRY = _descriptor.Descriptor(
@@ -97,8 +97,8 @@ _DPUPUBLISHVOLUMEREQUEST_SECRETSENTRY = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=329,
-  serialized_end=375,
+  serialized_start=362,
+  serialized_end=408,
 )
 
 _DPUPUBLISHVOLUMEREQUEST = _descriptor.Descriptor(
@@ -151,6 +151,13 @@ _DPUPUBLISHVOLUMEREQUEST = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='qos', full_name='storage.DPUPublishVolumeRequest.qos', index=6,
+      number=7, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -164,7 +171,80 @@ _DPUPUBLISHVOLUMEREQUEST = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=27,
-  serialized_end=375,
+  serialized_end=408,
+)
+
+
+_VOLUMEQOS = _descriptor.Descriptor(
+  name='VolumeQos',
+  full_name='storage.VolumeQos',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='rw_ios_per_sec', full_name='storage.VolumeQos.rw_ios_per_sec', index=0,
+      number=1, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='rw_mbytes_per_sec', full_name='storage.VolumeQos.rw_mbytes_per_sec', index=1,
+      number=2, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='r_mbytes_per_sec', full_name='storage.VolumeQos.r_mbytes_per_sec', index=2,
+      number=3, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='w_mbytes_per_sec', full_name='storage.VolumeQos.w_mbytes_per_sec', index=3,
+      number=4, type=4, cpp_type=4, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+    _descriptor.OneofDescriptor(
+      name='_rw_ios_per_sec', full_name='storage.VolumeQos._rw_ios_per_sec',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_rw_mbytes_per_sec', full_name='storage.VolumeQos._rw_mbytes_per_sec',
+      index=1, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_r_mbytes_per_sec', full_name='storage.VolumeQos._r_mbytes_per_sec',
+      index=2, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_w_mbytes_per_sec', full_name='storage.VolumeQos._w_mbytes_per_sec',
+      index=3, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+  ],
+  serialized_start=411,
+  serialized_end=628,
 )
 
 
@@ -188,8 +268,8 @@ _DPUPUBLISHVOLUMERESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=377,
-  serialized_end=403,
+  serialized_start=630,
+  serialized_end=656,
 )
 
 
@@ -227,8 +307,8 @@ _DPUUNPUBLISHVOLUMEREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=405,
-  serialized_end=472,
+  serialized_start=658,
+  serialized_end=725,
 )
 
 
@@ -252,8 +332,8 @@ _DPUUNPUBLISHVOLUMERESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=474,
-  serialized_end=502,
+  serialized_start=727,
+  serialized_end=755,
 )
 
 
@@ -277,8 +357,8 @@ _DPUGETINFOREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=504,
-  serialized_end=523,
+  serialized_start=757,
+  serialized_end=776,
 )
 
 
@@ -297,6 +377,20 @@ _DPUGETINFORESPONSE = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='free_functions', full_name='storage.DPUGetInfoResponse.free_functions', index=1,
+      number=2, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='volumes', full_name='storage.DPUGetInfoResponse.volumes', index=2,
+      number=3, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
   ],
   extensions=[
   ],
@@ -308,9 +402,19 @@ _DPUGETINFORESPONSE = _descriptor.Descriptor(
   syntax='proto3',
   extension_ranges=[],
   oneofs=[
+    _descriptor.OneofDescriptor(
+      name='_free_functions', full_name='storage.DPUGetInfoResponse._free_functions',
+      index=0, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
+    _descriptor.OneofDescriptor(
+      name='_volumes', full_name='storage.DPUGetInfoResponse._volumes',
+      index=1, containing_type=None,
+      create_key=_descriptor._internal_create_key,
+    fields=[]),
   ],
-  serialized_start=525,
-  serialized_end=563,
+  serialized_start=778,
+  serialized_end=898,
 )
 
 
@@ -389,8 +493,8 @@ _DPUCREATECONTROLLERREQUEST = _descriptor.Descriptor(
       create_key=_descriptor._internal_create_key,
     fields=[]),
   ],
-  serialized_start=566,
-  serialized_end=779,
+  serialized_start=901,
+  serialized_end=1114,
 )
 
 
@@ -421,8 +525,8 @@ _DPUCREATECONTROLLERRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=781,
-  serialized_end=833,
+  serialized_start=1116,
+  serialized_end=1168,
 )
 
 
@@ -453,8 +557,8 @@ _DPUDELETECONTROLLERREQUEST = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=835,
-  serialized_end=886,
+  serialized_start=1170,
+  serialized_end=1221,
 )
 
 
@@ -478,14 +582,271 @@ _DPUDELETECONTROLLERRESPONSE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=888,
-  serialized_end=917,
+  serialized_start=1223,
+  serialized_end=1252,
+)
+
+
+_DPUSETVOLUMEQOSREQUEST = _descriptor.Descriptor(
+  name='DPUSetVolumeQosRequest',
+  full_name='storage.DPUSetVolumeQosRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='volume_id', full_name='storage.DPUSetVolumeQosRequest.volume_id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='qos', full_name='storage.DPUSetVolumeQosRequest.qos', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1254,
+  serialized_end=1330,
+)
+
+
+_DPUSETVOLUMEQOSRESPONSE = _descriptor.Descriptor(
+  name='DPUSetVolumeQosResponse',
+  full_name='storage.DPUSetVolumeQosResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1332,
+  serialized_end=1357,
+)
+
+
+_DPUPUBLISHVOLUMESREQUEST = _descriptor.Descriptor(
+  name='DPUPublishVolumesRequest',
+  full_name='storage.DPUPublishVolumesRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='volumes', full_name='storage.DPUPublishVolumesRequest.volumes', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1359,
+  serialized_end=1436,
+)
+
+
+_DPUVOLUMESTATUS = _descriptor.Descriptor(
+  name='DPUVolumeStatus',
+  full_name='storage.DPUVolumeStatus',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='volume_id', full_name='storage.DPUVolumeStatus.volume_id', index=0,
+      number=1, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='code', full_name='storage.DPUVolumeStatus.code', index=1,
+      number=2, type=5, cpp_type=1, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+    _descriptor.FieldDescriptor(
+      name='message', full_name='storage.DPUVolumeStatus.message', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1438,
+  serialized_end=1505,
+)
+
+
+_DPUPUBLISHVOLUMESRESPONSE = _descriptor.Descriptor(
+  name='DPUPublishVolumesResponse',
+  full_name='storage.DPUPublishVolumesResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='statuses', full_name='storage.DPUPublishVolumesResponse.statuses', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1507,
+  serialized_end=1578,
+)
+
+
+_DPUUNPUBLISHVOLUMESREQUEST = _descriptor.Descriptor(
+  name='DPUUnpublishVolumesRequest',
+  full_name='storage.DPUUnpublishVolumesRequest',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='volumes', full_name='storage.DPUUnpublishVolumesRequest.volumes', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1580,
+  serialized_end=1661,
+)
+
+
+_DPUUNPUBLISHVOLUMESRESPONSE = _descriptor.Descriptor(
+  name='DPUUnpublishVolumesResponse',
+  full_name='storage.DPUUnpublishVolumesResponse',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  create_key=_descriptor._internal_create_key,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='statuses', full_name='storage.DPUUnpublishVolumesResponse.statuses', index=0,
+      number=1, type=11, cpp_type=10, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=1663,
+  serialized_end=1736,
 )
 
 _DPUPUBLISHVOLUMEREQUEST_VOLUMECONTEXTENTRY.containing_type = _DPUPUBLISHVOLUMEREQUEST
 _DPUPUBLISHVOLUMEREQUEST_SECRETSENTRY.containing_type = _DPUPUBLISHVOLUMEREQUEST
 _DPUPUBLISHVOLUMEREQUEST.fields_by_name['volume_context'].message_type = _DPUPUBLISHVOLUMEREQUEST_VOLUMECONTEXTENTRY
 _DPUPUBLISHVOLUMEREQUEST.fields_by_name['secrets'].message_type = _DPUPUBLISHVOLUMEREQUEST_SECRETSENTRY
+_DPUPUBLISHVOLUMEREQUEST.fields_by_name['qos'].message_type = _VOLUMEQOS
+_VOLUMEQOS.oneofs_by_name['_rw_ios_per_sec'].fields.append(
+  _VOLUMEQOS.fields_by_name['rw_ios_per_sec'])
+_VOLUMEQOS.fields_by_name['rw_ios_per_sec'].containing_oneof = _VOLUMEQOS.oneofs_by_name['_rw_ios_per_sec']
+_VOLUMEQOS.oneofs_by_name['_rw_mbytes_per_sec'].fields.append(
+  _VOLUMEQOS.fields_by_name['rw_mbytes_per_sec'])
+_VOLUMEQOS.fields_by_name['rw_mbytes_per_sec'].containing_oneof = _VOLUMEQOS.oneofs_by_name['_rw_mbytes_per_sec']
+_VOLUMEQOS.oneofs_by_name['_r_mbytes_per_sec'].fields.append(
+  _VOLUMEQOS.fields_by_name['r_mbytes_per_sec'])
+_VOLUMEQOS.fields_by_name['r_mbytes_per_sec'].containing_oneof = _VOLUMEQOS.oneofs_by_name['_r_mbytes_per_sec']
+_VOLUMEQOS.oneofs_by_name['_w_mbytes_per_sec'].fields.append(
+  _VOLUMEQOS.fields_by_name['w_mbytes_per_sec'])
+_VOLUMEQOS.fields_by_name['w_mbytes_per_sec'].containing_oneof = _VOLUMEQOS.oneofs_by_name['_w_mbytes_per_sec']
+_DPUGETINFORESPONSE.oneofs_by_name['_free_functions'].fields.append(
+  _DPUGETINFORESPONSE.fields_by_name['free_functions'])
+_DPUGETINFORESPONSE.fields_by_name['free_functions'].containing_oneof = _DPUGETINFORESPONSE.oneofs_by_name['_free_functions']
+_DPUGETINFORESPONSE.oneofs_by_name['_volumes'].fields.append(
+  _DPUGETINFORESPONSE.fields_by_name['volumes'])
+_DPUGETINFORESPONSE.fields_by_name['volumes'].containing_oneof = _DPUGETINFORESPONSE.oneofs_by_name['_volumes']
 _DPUCREATECONTROLLERREQUEST.oneofs_by_name['_pf_index'].fields.append(
   _DPUCREATECONTROLLERREQUEST.fields_by_name['pf_index'])
 _DPUCREATECONTROLLERREQUEST.fields_by_name['pf_index'].containing_oneof = _DPUCREATECONTROLLERREQUEST.oneofs_by_name['_pf_index']
@@ -498,7 +859,13 @@ _DPUCREATECONTROLLERREQUEST.fields_by_name['serial_number'].containing_oneof = _
 _DPUCREATECONTROLLERREQUEST.oneofs_by_name['_model_number'].fields.append(
   _DPUCREATECONTROLLERREQUEST.fields_by_name['model_number'])
 _DPUCREATECONTROLLERREQUEST.fields_by_name['model_number'].containing_oneof = _DPUCREATECONTROLLERREQUEST.oneofs_by_name['_model_number']
+_DPUSETVOLUMEQOSREQUEST.fields_by_name['qos'].message_type = _VOLUMEQOS
+_DPUPUBLISHVOLUMESREQUEST.fields_by_name['volumes'].message_type = _DPUPUBLISHVOLUMEREQUEST
+_DPUPUBLISHVOLUMESRESPONSE.fields_by_name['statuses'].message_type = _DPUVOLUMESTATUS
+_DPUUNPUBLISHVOLUMESREQUEST.fields_by_name['volumes'].message_type = _DPUUNPUBLISHVOLUMEREQUEST
+_DPUUNPUBLISHVOLUMESRESPONSE.fields_by_name['statuses'].message_type = _DPUVOLUMESTATUS
 DESCRIPTOR.message_types_by_name['DPUPublishVolumeRequest'] = _DPUPUBLISHVOLUMEREQUEST
+DESCRIPTOR.message_types_by_name['VolumeQos'] = _VOLUMEQOS
 DESCRIPTOR.message_types_by_name['DPUPublishVolumeResponse'] = _DPUPUBLISHVOLUMERESPONSE
 DESCRIPTOR.message_types_by_name['DPUUnpublishVolumeRequest'] = _DPUUNPUBLISHVOLUMEREQUEST
 DESCRIPTOR.message_types_by_name['DPUUnpublishVolumeResponse'] = _DPUUNPUBLISHVOLUMERESPONSE
@@ -508,6 +875,13 @@ DESCRIPTOR.message_types_by_name['DPUCreateControllerRequest'] = _DPUCREATECONTR
 DESCRIPTOR.message_types_by_name['DPUCreateControllerResponse'] = _DPUCREATECONTROLLERRESPONSE
 DESCRIPTOR.message_types_by_name['DPUDeleteControllerRequest'] = _DPUDELETECONTROLLERREQUEST
 DESCRIPTOR.message_types_by_name['DPUDeleteControllerResponse'] = _DPUDELETECONTROLLERRESPONSE
+DESCRIPTOR.message_types_by_name['DPUSetVolumeQosRequest'] = _DPUSETVOLUMEQOSREQUEST
+DESCRIPTOR.message_types_by_name['DPUSetVolumeQosResponse'] = _DPUSETVOLUMEQOSRESPONSE
+DESCRIPTOR.message_types_by_name['DPUPublishVolumesRequest'] = _DPUPUBLISHVOLUMESREQUEST
+DESCRIPTOR.message_types_by_name['DPUVolumeStatus'] = _DPUVOLUMESTATUS
+DESCRIPTOR.message_types_by_name['DPUPublishVolumesResponse'] = _DPUPUBLISHVOLUMESRESPONSE
+DESCRIPTOR.message_types_by_name['DPUUnpublishVolumesRequest'] = _DPUUNPUBLISHVOLUMESREQUEST
+DESCRIPTOR.message_types_by_name['DPUUnpublishVolumesResponse'] = _DPUUNPUBLISHVOLUMESRESPONSE
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 DPUPublishVolumeRequest = _reflection.GeneratedProtocolMessageType('DPUPublishVolumeRequest', (_message.Message,), {
@@ -533,6 +907,13 @@ _sym_db.RegisterMessage(DPUPublishVolumeRequest)
 _sym_db.RegisterMessage(DPUPublishVolumeRequest.VolumeContextEntry)
 _sym_db.RegisterMessage(DPUPublishVolumeRequest.SecretsEntry)
 
+VolumeQos = _reflection.GeneratedProtocolMessageType('VolumeQos', (_message.Message,), {
+  'DESCRIPTOR' : _VOLUMEQOS,
+  '__module__' : 'storage_pb2'
+  # @@protoc_insertion_point(class_scope:storage.VolumeQos)
+  })
+_sym_db.RegisterMessage(VolumeQos)
+
 DPUPublishVolumeResponse = _reflection.GeneratedProtocolMessageType('DPUPublishVolumeResponse', (_message.Message,), {
   'DESCRIPTOR' : _DPUPUBLISHVOLUMERESPONSE,
   '__module__' : 'storage_pb2'
@@ -596,6 +977,55 @@ DPUDeleteControllerResponse = _reflection.GeneratedProtocolMessageType('DPUDelet
   })
 _sym_db.RegisterMessage(DPUDeleteControllerResponse)
 
+DPUSetVolumeQosRequest = _reflection.GeneratedProtocolMessageType('DPUSetVolumeQosRequest', (_message.Message,), {
+  'DESCRIPTOR' : _DPUSETVOLUMEQOSREQUEST,
+  '__module__' : 'storage_pb2'
+  # @@protoc_insertion_point(class_scope:storage.DPUSetVolumeQosRequest)
+  })
+_sym_db.RegisterMessage(DPUSetVolumeQosRequest)
+
+DPUSetVolumeQosResponse = _reflection.GeneratedProtocolMessageType('DPUSetVolumeQosResponse', (_message.Message,), {
+  'DESCRIPTOR' : _DPUSETVOLUMEQOSRESPONSE,
+  '__module__' : 'storage_pb2'
+  # @@protoc_insertion_point(class_scope:storage.DPUSetVolumeQosResponse)
+  })
+_sym_db.RegisterMessage(DPUSetVolumeQosResponse)
+
+DPUPublishVolumesRequest = _reflection.GeneratedProtocolMessageType('DPUPublishVolumesRequest', (_message.Message,), {
+  'DESCRIPTOR' : _DPUPUBLISHVOLUMESREQUEST,
+  '__module__' : 'storage_pb2'
+  # @@protoc_insertion_point(class_scope:storage.DPUPublishVolumesRequest)
+  })
+_sym_db.RegisterMessage(DPUPublishVolumesRequest)
+
+DPUVolumeStatus = _reflection.GeneratedProtocolMessageType('DPUVolumeStatus', (_message.Message,), {
+  'DESCRIPTOR' : _DPUVOLUMESTATUS,
+  '__module__' : 'storage_pb2'
+  # @@protoc_insertion_point(class_scope:storage.DPUVolumeStatus)
+  })
+_sym_db.RegisterMessage(DPUVolumeStatus)
+
+DPUPublishVolumesResponse = _reflection.GeneratedProtocolMessageType('DPUPublishVolumesResponse', (_message.Message,), {
+  'DESCRIPTOR' : _DPUPUBLISHVOLUMESRESPONSE,
+  '__module__' : 'storage_pb2'
+  # @@protoc_insertion_point(class_scope:storage.DPUPublishVolumesResponse)
+  })
+_sym_db.RegisterMessage(DPUPublishVolumesResponse)
+
+DPUUnpublishVolumesRequest = _reflection.GeneratedProtocolMessageType('DPUUnpublishVolumesRequest', (_message.Message,), {
+  'DESCRIPTOR' : _DPUUNPUBLISHVOLUMESREQUEST,
+  '__module__' : 'storage_pb2'
+  # @@protoc_insertion_point(class_scope:storage.DPUUnpublishVolumesRequest)
+  })
+_sym_db.RegisterMessage(DPUUnpublishVolumesRequest)
+
+DPUUnpublishVolumesResponse = _reflection.GeneratedProtocolMessageType('DPUUnpublishVolumesResponse', (_message.Message,), {
+  'DESCRIPTOR' : _DPUUNPUBLISHVOLUMESRESPONSE,
+  '__module__' : 'storage_pb2'
+  # @@protoc_insertion_point(class_scope:storage.DPUUnpublishVolumesResponse)
+  })
+_sym_db.RegisterMessage(DPUUnpublishVolumesResponse)
+
 
 _DPUPUBLISHVOLUMEREQUEST_VOLUMECONTEXTENTRY._options = None
 _DPUPUBLISHVOLUMEREQUEST_SECRETSENTRY._options = None
@@ -607,8 +1037,8 @@ _STORAGE = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   create_key=_descriptor._internal_create_key,
-  serialized_start=920,
-  serialized_end=1390,
+  serialized_start=1739,
+  serialized_end=2491,
   methods=[
   _descriptor.MethodDescriptor(
     name='DPUPublishVolume',
@@ -660,6 +1090,36 @@ _STORAGE = _descriptor.ServiceDescriptor(
     serialized_options=None,
     create_key=_descriptor._internal_create_key,
   ),
+  _descriptor.MethodDescriptor(
+    name='DPUSetVolumeQos',
+    full_name='storage.Storage.DPUSetVolumeQos',
+    index=5,
+    containing_service=None,
+    input_type=_DPUSETVOLUMEQOSREQUEST,
+    output_type=_DPUSETVOLUMEQOSRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='DPUPublishVolumes',
+    full_name='storage.Storage.DPUPublishVolumes',
+    index=6,
+    containing_service=None,
+    input_type=_DPUPUBLISHVOLUMESREQUEST,
+    output_type=_DPUPUBLISHVOLUMESRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
+  _descriptor.MethodDescriptor(
+    name='DPUUnpublishVolumes',
+    full_name='storage.Storage.DPUUnpublishVolumes',
+    index=7,
+    containing_service=None,
+    input_type=_DPUUNPUBLISHVOLUMESREQUEST,
+    output_type=_DPUUNPUBLISHVOLUMESRESPONSE,
+    serialized_options=None,
+    create_key=_descriptor._internal_create_key,
+  ),
 ])
 _sym_db.RegisterServiceDescriptor(_STORAGE)
 
@@ -41,6 +41,21 @@ class StorageStub(object):
                 request_serializer=storage__pb2.DPUDeleteControllerRequest.SerializeToString,
                 response_deserializer=storage__pb2.DPUDeleteControllerResponse.FromString,
                 )
+        self.DPUSetVolumeQos = channel.unary_unary(
+                '/storage.Storage/DPUSetVolumeQos',
+                request_serializer=storage__pb2.DPUSetVolumeQosRequest.SerializeToString,
+                response_deserializer=storage__pb2.DPUSetVolumeQosResponse.FromString,
+                )
+        self.DPUPublishVolumes = channel.unary_unary(
+                '/storage.Storage/DPUPublishVolumes',
+                request_serializer=storage__pb2.DPUPublishVolumesRequest.SerializeToString,
+                response_deserializer=storage__pb2.DPUPublishVolumesResponse.FromString,
+                )
+        self.DPUUnpublishVolumes = channel.unary_unary(
+                '/storage.Storage/DPUUnpublishVolumes',
+                request_serializer=storage__pb2.DPUUnpublishVolumesRequest.SerializeToString,
+                response_deserializer=storage__pb2.DPUUnpublishVolumesResponse.FromString,
+                )
 
 
 class StorageServicer(object):
@@ -78,6 +93,24 @@ class StorageServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def DPUSetVolumeQos(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DPUPublishVolumes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DPUUnpublishVolumes(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_StorageServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -106,6 +139,21 @@ def add_StorageServicer_to_server(servicer, server):
                     request_deserializer=storage__pb2.DPUDeleteControllerRequest.FromString,
                     response_serializer=storage__pb2.DPUDeleteControllerResponse.SerializeToString,
             ),
+            'DPUSetVolumeQos': grpc.unary_unary_rpc_method_handler(
+                    servicer.DPUSetVolumeQos,
+                    request_deserializer=storage__pb2.DPUSetVolumeQosRequest.FromString,
+                    response_serializer=storage__pb2.DPUSetVolumeQosResponse.SerializeToString,
+            ),
+            'DPUPublishVolumes': grpc.unary_unary_rpc_method_handler(
+                    servicer.DPUPublishVolumes,
+                    request_deserializer=storage__pb2.DPUPublishVolumesRequest.FromString,
+                    response_serializer=storage__pb2.DPUPublishVolumesResponse.SerializeToString,
+            ),
+            'DPUUnpublishVolumes': grpc.unary_unary_rpc_method_handler(
+                    servicer.DPUUnpublishVolumes,
+                    request_deserializer=storage__pb2.DPUUnpublishVolumesRequest.FromString,
+                    response_serializer=storage__pb2.DPUUnpublishVolumesResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'storage.Storage', rpc_method_handlers)
@@ -202,3 +250,54 @@ class Storage(object):
             storage__pb2.DPUDeleteControllerResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DPUSetVolumeQos(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/storage.Storage/DPUSetVolumeQos',
+            storage__pb2.DPUSetVolumeQosRequest.SerializeToString,
+            storage__pb2.DPUSetVolumeQosResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DPUPublishVolumes(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/storage.Storage/DPUPublishVolumes',
+            storage__pb2.DPUPublishVolumesRequest.SerializeToString,
+            storage__pb2.DPUPublishVolumesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DPUUnpublishVolumes(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/storage.Storage/DPUUnpublishVolumes',
+            storage__pb2.DPUUnpublishVolumesRequest.SerializeToString,
+            storage__pb2.DPUUnpublishVolumesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,153 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import json
+import socket
+import threading
+import time
+from queue import LifoQueue, Empty
+
+from .error import SofaStorageException
+from .metrics import timed
+
+RECV_CHUNK_SIZE = 4096
+CONNECT_RETRY_INTERVAL = 0.005
+
+
+class JsonRpcException(SofaStorageException):
+
+    def __init__(self, method, code, message):
+        super().__init__()
+        self.method = method
+        self.code = code
+        self.message = message
+
+    def __str__(self):
+        return f'JSON-RPC {self.method} failed ({self.code}): {self.message}'
+
+
+class _JsonRpcConnection():
+
+    def __init__(self, socket_path, timeout):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        try:
+            self._connect(socket_path, timeout)
+        except OSError:
+            self._sock.close()
+            raise
+        self._buffer = ''
+        self._decoder = json.JSONDecoder()
+        self.used = False
+
+    def _connect(self, socket_path, timeout):
+        # With a timeout the socket is non-blocking underneath, so a full accept backlog fails the connect with EAGAIN
+        # instead of waiting. Wait for room in it up to the timeout, like a stuck server fails after it.
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self._sock.connect(socket_path)
+                return
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise socket.timeout(f'Connecting to {socket_path} timed out') from None
+                time.sleep(CONNECT_RETRY_INTERVAL)
+
+    def send(self, request):
+        self.used = True
+        self._sock.sendall(json.dumps(request).encode('utf-8'))
+
+    def exchange(self, request):
+        self.send(request)
+        return self.receive()
+
+    def answered(self):
+        # Whether any of the response to the last request arrived
+        return bool(self._buffer.strip())
+
+    def receive(self):
+        # SPDK does not frame its responses, so keep reading until a complete JSON object can be decoded
+        while True:
+            data = self._buffer.lstrip()
+            if data:
+                try:
+                    response, end = self._decoder.raw_decode(data)
+                    self._buffer = data[end:]
+                    return response
+                except ValueError:
+                    pass
+            chunk = self._sock.recv(RECV_CHUNK_SIZE)
+            if not chunk:
+                raise ConnectionResetError('JSON-RPC server closed the connection')
+            self._buffer += chunk.decode('utf-8')
+
+    def close(self):
+        self._sock.close()
+
+
+class JsonRpcClient():
+    """JSON-RPC 2.0 client keeping a pool of long-lived connections to a SPDK/SNAP Unix socket."""
+
+    def __init__(self, socket_path, timeout=60.0, max_connections=4, backend='jsonrpc'):
+        self._socket_path = socket_path
+        self._backend = backend
+        self._timeout = timeout
+        self._idle = LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._id_lock = threading.Lock()
+        self._next_id = 0
+
+    def _requestId(self):
+        with self._id_lock:
+            self._next_id += 1
+            return self._next_id
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            return _JsonRpcConnection(self._socket_path, self._timeout)
+
+    def call(self, method, params=None):
+        with timed(self._backend, method):
+            return self._call(method, params)
+
+    def _call(self, method, params):
+        request = {'jsonrpc': '2.0', 'method': method, 'id': self._requestId()}
+        if params:
+            request['params'] = params
+
+        with self._slots:
+            conn = self._acquire()
+            pooled = conn.used
+            try:
+                try:
+                    response = conn.exchange(request)
+                except ConnectionError:
+                    # A pooled connection closed by the server, e.g. SNAP or SPDK restarted, fails on send or with a reset
+                    # or EOF on receive. The server that could have run the request is gone, so resend it once on a new one.
+                    if not pooled or conn.answered():
+                        raise
+                    conn.close()
+                    conn = _JsonRpcConnection(self._socket_path, self._timeout)
+                    response = conn.exchange(request)
+                if response.get('id') != request['id']:
+                    raise JsonRpcException(method, None, f'response id {response.get("id")} does not match request id {request["id"]}')
+            except Exception:
+                conn.close()
+                raise
+            self._idle.put(conn)
+
+        if 'error' in response:
+            error = response['error']
+            raise JsonRpcException(method, error.get('code'), error.get('message'))
+        return response.get('result')
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except Empty:
+                return
@@ -0,0 +1,250 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+
+from .jsonrpc import JsonRpcException, RECV_CHUNK_SIZE
+from .log import logger
+
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INTERNAL_ERROR = -32603
+ENODEV = -19
+EEXIST = -17
+EINVAL = -22
+
+
+class _FakeJsonRpcHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        decoder = json.JSONDecoder()
+        buffer = ''
+        while True:
+            chunk = self.request.recv(RECV_CHUNK_SIZE)
+            if not chunk:
+                return
+            buffer += chunk.decode('utf-8')
+            while True:
+                buffer = buffer.lstrip()
+                try:
+                    request, end = decoder.raw_decode(buffer)
+                except ValueError:
+                    break
+                buffer = buffer[end:]
+                self.request.sendall(json.dumps(self.server.dispatch(request)).encode('utf-8'))
+
+
+class FakeJsonRpcServer(socketserver.ThreadingUnixStreamServer):
+    """Local JSON-RPC 2.0 server on a Unix socket, dispatching each method to a python callable."""
+
+    daemon_threads = True
+    request_queue_size = 512
+
+    def __init__(self, socket_path, handlers):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _FakeJsonRpcHandler)
+        self.socket_path = socket_path
+        self.handlers = handlers
+        self._thread = None
+
+    def dispatch(self, request):
+        response = {'jsonrpc': '2.0', 'id': request.get('id')}
+        handler = self.handlers.get(request.get('method'))
+        if handler is None:
+            response['error'] = {'code': JSONRPC_METHOD_NOT_FOUND, 'message': 'Method not found'}
+            return response
+        try:
+            response['result'] = handler(request.get('params') or {})
+        except JsonRpcException as e:
+            response['error'] = {'code': e.code, 'message': e.message}
+        except Exception as e:  # pylint: disable=W0703
+            response['error'] = {'code': JSONRPC_INTERNAL_ERROR, 'message': str(e)}
+        return response
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+class FakeSnap():
+    """In-memory stand-in for the SPDK and SNAP RPC methods used by the BF plugin."""
+
+    def __init__(self, namespace=1, delay=0.0):
+        self.namespace = namespace
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.bdevs = {}
+        self.nvme_controllers = {}
+        self.subsystems = {}
+        self.controllers = {}
+        self.crypto_keys = {}
+
+    @property
+    def handlers(self):
+        methods = ['bdev_nvme_attach_controller', 'bdev_nvme_detach_controller',
+                   'bdev_crypto_create', 'bdev_crypto_delete', 'bdev_get_bdevs', 'bdev_get_iostat', 'bdev_set_qos_limit',
+                   'accel_crypto_key_create', 'accel_crypto_key_destroy',
+                   'subsystem_nvme_create', 'controller_nvme_create', 'controller_nvme_delete', 'controller_list',
+                   'controller_nvme_namespace_attach', 'controller_nvme_namespace_detach',
+                   'controller_nvme_namespace_list']
+        return {method: self._delayed(getattr(self, method)) for method in methods}
+
+    def _delayed(self, handler):
+        def call(params):
+            if self.delay:
+                time.sleep(self.delay)
+            with self.lock:
+                return handler(params)
+        return call
+
+    @staticmethod
+    def _error(method, code, message):
+        return JsonRpcException(method, code, message)
+
+    def bdev_nvme_attach_controller(self, params):
+        name = params['name']
+        if name in self.nvme_controllers:
+            raise self._error('bdev_nvme_attach_controller', EEXIST, 'File exists')
+        bdev_name = name + 'n' + str(self.namespace)
+        self.nvme_controllers[name] = dict(params, bdevs=[bdev_name])
+        trid = {key: params[key] for key in ['trtype', 'adrfam', 'traddr', 'trsvcid', 'subnqn'] if key in params}
+        self.bdevs[bdev_name] = {'name': bdev_name, 'product_name': 'NVMe disk', 'driver_specific': {'nvme': [{'trid': trid}]}}
+        return [bdev_name]
+
+    def bdev_nvme_detach_controller(self, params):
+        ctrlr = self.nvme_controllers.pop(params['name'], None)
+        if ctrlr is None:
+            raise self._error('bdev_nvme_detach_controller', ENODEV, 'No such device')
+        for bdev_name in ctrlr['bdevs']:
+            self.bdevs.pop(bdev_name, None)
+            # Like SPDK, virtual bdevs stacked on a removed base bdev go away with it
+            for name, bdev in list(self.bdevs.items()):
+                if bdev['driver_specific'].get('crypto', {}).get('base_bdev_name') == bdev_name:
+                    del self.bdevs[name]
+        return True
+
+    def bdev_crypto_create(self, params):
+        if params['base_bdev_name'] not in self.bdevs:
+            raise self._error('bdev_crypto_create', ENODEV, 'No such device')
+        if params['name'] in self.bdevs:
+            raise self._error('bdev_crypto_create', EEXIST, 'File exists')
+        if 'key_name' in params and params['key_name'] not in self.crypto_keys:
+            raise self._error('bdev_crypto_create', ENODEV, 'No such device')
+        crypto = {key: params[key] for key in ['base_bdev_name', 'crypto_pmd', 'key_name'] if key in params}
+        self.bdevs[params['name']] = {'name': params['name'], 'product_name': 'crypto', 'driver_specific': {'crypto': crypto}}
+        return params['name']
+
+    def bdev_crypto_delete(self, params):
+        if self.bdevs.pop(params['name'], None) is None:
+            raise self._error('bdev_crypto_delete', ENODEV, 'No such device')
+        return True
+
+    def accel_crypto_key_create(self, params):
+        if params['name'] in self.crypto_keys:
+            raise self._error('accel_crypto_key_create', EEXIST, 'File exists')
+        self.crypto_keys[params['name']] = params
+        return True
+
+    def accel_crypto_key_destroy(self, params):
+        if self.crypto_keys.pop(params['key_name'], None) is None:
+            raise self._error('accel_crypto_key_destroy', ENODEV, 'No such device')
+        return True
+
+    def bdev_get_bdevs(self, params):
+        if 'name' in params:
+            if params['name'] not in self.bdevs:
+                raise self._error('bdev_get_bdevs', ENODEV, 'No such device')
+            return [self.bdevs[params['name']]]
+        return list(self.bdevs.values())
+
+    def bdev_get_iostat(self, params):  # pylint: disable=W0613
+        # Counters are only moved by whoever drives the fake, e.g. by setting num_read_ops on a bdev
+        return {'tick_rate': 1000000000,
+                'bdevs': [{'name': name, 'num_read_ops': bdev.get('num_read_ops', 0), 'num_write_ops': bdev.get('num_write_ops', 0)}
+                          for name, bdev in self.bdevs.items()]}
+
+    def bdev_set_qos_limit(self, params):
+        bdev = self.bdevs.get(params['name'])
+        if bdev is None:
+            raise self._error('bdev_set_qos_limit', ENODEV, 'No such device')
+        if params.get('rw_ios_per_sec', 0) % 1000 != 0:
+            raise self._error('bdev_set_qos_limit', EINVAL, 'Invalid argument')
+        limits = bdev.setdefault('assigned_rate_limits', {'rw_ios_per_sec': 0, 'rw_mbytes_per_sec': 0,
+                                                          'r_mbytes_per_sec': 0, 'w_mbytes_per_sec': 0})
+        limits.update({limit: value for limit, value in params.items() if limit in limits})
+        return True
+
+    def subsystem_nvme_create(self, params):
+        self.subsystems.setdefault(params['nqn'], params)
+        return True
+
+    def controller_nvme_create(self, params):
+        name = 'NvmeEmu0pf' + str(params['pf_id'])
+        if 'vf_id' in params:
+            name += 'vf' + str(params['vf_id'])
+        if name in self.controllers:
+            raise self._error('controller_nvme_create', EEXIST, 'File exists')
+        self.controllers[name] = {'name': name, 'subnqn': params['subnqn'],
+                                  'emulation_manager': params['emulation_manager'],
+                                  'pf_index': params['pf_id'], 'vf_index': params.get('vf_id', -1),
+                                  'namespaces': {}}
+        return name
+
+    def controller_nvme_delete(self, params):
+        if self.controllers.pop(params['name'], None) is None:
+            raise self._error('controller_nvme_delete', ENODEV, 'No such device')
+        return True
+
+    def controller_list(self, params):  # pylint: disable=W0613
+        return [{k: v for k, v in ctrl.items() if k != 'namespaces'} for ctrl in self.controllers.values()]
+
+    def _controller(self, method, params):
+        ctrl = self.controllers.get(params['ctrl'])
+        if ctrl is None:
+            raise self._error(method, ENODEV, 'No such device')
+        return ctrl
+
+    def controller_nvme_namespace_attach(self, params):
+        ctrl = self._controller('controller_nvme_namespace_attach', params)
+        nsid = int(params['nsid'])
+        if nsid in ctrl['namespaces']:
+            raise self._error('controller_nvme_namespace_attach', EEXIST, 'File exists')
+        if params['bdev'] not in self.bdevs:
+            raise self._error('controller_nvme_namespace_attach', ENODEV, 'No such device')
+        ctrl['namespaces'][nsid] = params['bdev']
+        return True
+
+    def controller_nvme_namespace_detach(self, params):
+        ctrl = self._controller('controller_nvme_namespace_detach', params)
+        if ctrl['namespaces'].pop(int(params['nsid']), None) is None:
+            raise self._error('controller_nvme_namespace_detach', EINVAL, 'Invalid argument')
+        return True
+
+    def controller_nvme_namespace_list(self, params):
+        ctrl = self._controller('controller_nvme_namespace_list', params)
+        return {'name': ctrl['name'],
+                'Namespaces': [{'nsid': nsid, 'bdev': bdev} for nsid, bdev in sorted(ctrl['namespaces'].items())]}
+
+
+def serve(socket_path):
+    server = FakeJsonRpcServer(socket_path, FakeSnap().handlers)
+    logger.info('Fake SPDK/SNAP JSON-RPC server listening on %s', socket_path)
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    serve(sys.argv[1] if len(sys.argv) > 1 else '/var/tmp/spdk.sock')
@@ -0,0 +1,47 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import threading
+from contextlib import contextmanager, nullcontext
+
+
+class KeyedLock():
+    """One lock per key, created on first use and dropped once nobody holds or waits for it.
+
+    With a process_lock, e.g. a StripedProcessLock, the keys are also locked against other processes.
+    """
+
+    def __init__(self, process_lock=None):
+        self._lock = threading.Lock()
+        self._locks = {}
+        self._process_lock = process_lock
+
+    @contextmanager
+    def hold(self, *keys):
+        # Always acquire in sorted order so two callers holding overlapping keys cannot deadlock
+        keys = sorted(set(keys))
+        entries = []
+        with self._lock:
+            for key in keys:
+                entry = self._locks.setdefault(key, [threading.Lock(), 0])
+                entry[1] += 1
+                entries.append(entry)
+
+        acquired = []
+        try:
+            for entry in entries:
+                entry[0].acquire()  # pylint: disable=R1732
+                acquired.append(entry)
+            # Only taken with all thread locks held, so a process lock holder never waits for a thread lock
+            with self._process_lock.hold(keys) if self._process_lock is not None else nullcontext():
+                yield
+        finally:
+            for entry in reversed(acquired):
+                entry[0].release()
+            with self._lock:
+                for key, entry in zip(keys, entries):
+                    entry[1] -= 1
+                    if entry[1] == 0:
+                        del self._locks[key]
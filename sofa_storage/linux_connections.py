@@ -0,0 +1,86 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import threading
+
+from .log import logger
+from .keyed_lock import KeyedLock
+from .nvme_fabrics import GONE_STATES
+
+
+class ConnectionTable():
+    """Fabric controllers of the Linux plugin by (trtype, traddr, trsvcid, subnqn) target, shared by its volumes.
+
+    The first volume attached to a target connects a controller, the following ones only make the kernel rescan it
+    for their namespace, and the last one detached disconnects it. The transport options of the first attach are
+    the ones the connection keeps.
+    """
+
+    def __init__(self, fabrics, hostnqn=None):
+        self._fabrics = fabrics
+        self._hostnqn = hostnqn
+        self._lock = threading.Lock()
+        self._locks = KeyedLock()
+        self._entries = {}
+
+    def load(self, volumes):
+        """Rebuilds the table from the controllers in sysfs, with volumes mapping volume ids to their target.
+
+        Returns the ids of the volumes whose controller is gone. Controllers no volume uses are kept until a volume
+        attached to their target detaches, they may still be in use by a publish that was interrupted.
+        """
+        entries = {}
+        for controller, info in sorted(self._fabrics.controllers().items()):
+            if info['state'] in GONE_STATES:
+                continue
+            if info['target'] in entries:
+                logger.warning('Ignoring %s, %s is connected to %s already', controller, entries[info['target']]['controller'],
+                               info['target'][3])
+                continue
+            entries[info['target']] = {'controller': controller, 'users': set()}
+        lost = []
+        for volume_id, target in volumes.items():
+            if target in entries:
+                entries[target]['users'].add(volume_id)
+            else:
+                lost.append(volume_id)
+        with self._lock:
+            self._entries = entries
+        return lost
+
+    def attach(self, target, volume_id, nsid, transport_options):
+        """Returns the controller volume_id can use on target, connecting one if there is none yet."""
+        with self._locks.hold(target):
+            entry = self._entries.get(target)
+            if entry is not None and self._fabrics.state(entry['controller']) in GONE_STATES:
+                # Deleted behind our back, e.g. after ctrl_loss_tmo ran out
+                logger.warning('Controller %s of %s is gone, reconnecting', entry['controller'], target[3])
+                entry = None
+            if entry is None:
+                entry = {'controller': self._fabrics.connect(target, transport_options, self._hostnqn), 'users': set()}
+                with self._lock:
+                    self._entries[target] = entry
+            elif nsid not in self._fabrics.namespaces(entry['controller']):
+                # Added by the target after the controller last scanned its namespaces
+                self._fabrics.rescan(entry['controller'])
+            entry['users'].add(volume_id)
+            return entry['controller']
+
+    def detach(self, target, volume_id):
+        """Drops volume_id from the users of the controller on target, disconnecting it if it was the last one."""
+        with self._locks.hold(target):
+            entry = self._entries.get(target)
+            if entry is None:
+                return
+            entry['users'].discard(volume_id)
+            if not entry['users']:
+                self._fabrics.disconnect(entry['controller'])
+                with self._lock:
+                    del self._entries[target]
+
+    def counts(self):
+        with self._lock:
+            return {'connections': len(self._entries),
+                    'attached': sum(len(entry['users']) for entry in self._entries.values())}
@@ -0,0 +1,304 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import bisect
+import socket
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import grpc
+
+from .log import logger
+from . import tracing
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Shard():
+    """A thread's values, referenced only by its thread local so they are folded into the base when the thread exits."""
+
+    def __init__(self, size):
+        self.values = [0.0] * size
+
+
+class _Shards():
+    """Per-thread value arrays, summed when scraped so recording never takes a lock after a thread's first use."""
+
+    def __init__(self, size):
+        self._size = size
+        self._local = threading.local()
+        # Reentrant as a shard may be finalized by a thread holding it
+        self._lock = threading.RLock()
+        self._base = [0.0] * size
+        self._shards = {}
+
+    def local(self):
+        try:
+            return self._local.shard.values
+        except AttributeError:
+            shard = _Shard(self._size)
+            with self._lock:
+                self._shards[id(shard)] = shard.values
+            weakref.finalize(shard, self._fold, id(shard), shard.values)
+            self._local.shard = shard
+            return shard.values
+
+    def _fold(self, key, values):
+        # The values of exited threads, so short lived threads do not leave a shard each behind
+        with self._lock:
+            del self._shards[key]
+            self._base = [base + value for base, value in zip(self._base, values)]
+
+    def total(self):
+        with self._lock:
+            shards = [self._base, *self._shards.values()]
+        return [sum(column) for column in zip(*shards)]
+
+
+class _Value():
+
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount=1):
+        self._shards.local()[0] += amount
+
+    def dec(self, amount=1):
+        self._shards.local()[0] -= amount
+
+    def samples(self, name, labels):
+        return [(name, labels, self._shards.total()[0])]
+
+
+class _Histogram():
+
+    def __init__(self, buckets):
+        self._buckets = buckets
+        # Per bucket counts, then the sum and the count of observations
+        self._shards = _Shards(len(buckets) + 3)
+
+    def observe(self, value):
+        values = self._shards.local()
+        values[bisect.bisect_left(self._buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def samples(self, name, labels):
+        values = self._shards.total()
+        samples = []
+        cumulative = 0
+        for bound, count in zip(list(self._buckets) + ['+Inf'], values):
+            cumulative += count
+            samples.append((name + '_bucket', labels + (('le', str(bound)),), cumulative))
+        samples.append((name + '_sum', labels, values[-2]))
+        samples.append((name + '_count', labels, values[-1]))
+        return samples
+
+
+class Metric():
+
+    def __init__(self, kind, name, documentation, labelnames, create):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self._labelnames = labelnames
+        self._create = create
+        self._lock = threading.Lock()
+        self._children = {}
+        REGISTRY.register(self)
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._create())
+        return child
+
+    def samples(self):
+        with self._lock:
+            children = list(self._children.items())
+        samples = []
+        for values, child in children:
+            samples.extend(child.samples(self.name, tuple(zip(self._labelnames, values))))
+        return samples
+
+
+def counter(name, documentation, labelnames=()):
+    return Metric('counter', name, documentation, labelnames, _Value)
+
+
+def gauge(name, documentation, labelnames=()):
+    return Metric('gauge', name, documentation, labelnames, _Value)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+    return Metric('histogram', name, documentation, labelnames, lambda: _Histogram(buckets))
+
+
+class Registry():
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def registerCollector(self, collect):
+        """collect() returns (kind, name, documentation, [(labels, value), ..]) tuples, read at every scrape."""
+        with self._lock:
+            self._collectors.append(collect)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+        families = [(metric.kind, metric.name, metric.documentation, metric.samples()) for metric in metrics]
+        for collect in collectors:
+            families.extend((kind, name, documentation, [(name, tuple(labels.items()), value) for labels, value in values])
+                            for kind, name, documentation, values in collect())
+        lines = []
+        for kind, name, documentation, samples in families:
+            lines.append(f'# HELP {name} {documentation}')
+            lines.append(f'# TYPE {name} {kind}')
+            for sample, labels, value in samples:
+                text = ','.join(f'{label}="{_escape(value)}"' for label, value in labels)
+                lines.append(f'{sample}{{{text}}} {value}' if text else f'{sample} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+REGISTRY = Registry()
+
+RPC_DURATION = histogram('sofa_rpc_duration_seconds', 'gRPC request latency', ('method',))
+RPC_IN_FLIGHT = gauge('sofa_rpc_in_flight', 'gRPC requests being handled', ('method',))
+RPC_ERRORS = counter('sofa_rpc_errors_total', 'gRPC requests that ended with a status other than OK', ('method', 'code'))
+BACKEND_DURATION = histogram('sofa_backend_command_duration_seconds', 'Backend command latency', ('backend', 'command'))
+BACKEND_ERRORS = counter('sofa_backend_command_errors_total', 'Backend commands that raised or exited non-zero', ('backend', 'command'))
+
+
+class _Timed():
+
+    def __init__(self, backend, command):
+        self._labels = (backend, command)
+        self._span = tracing.span(f'{backend}.{command}')
+        self._started = None
+
+    def __enter__(self):
+        self._span.__enter__()
+        self._started = time.monotonic()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._span.__exit__(exc_type, exc_value, traceback)
+        BACKEND_DURATION.labels(*self._labels).observe(time.monotonic() - self._started)
+        if exc_type is not None:
+            BACKEND_ERRORS.labels(*self._labels).inc()
+
+
+def timed(backend, command):
+    """Context manager recording the count, duration and failures of a backend command, e.g. an SPDK RPC, and its span."""
+    return _Timed(backend, command)
+
+
+def _method(handler_call_details):
+    return handler_call_details.method.rsplit('/', 1)[-1]
+
+
+def _finish(method, context, started, failed):
+    RPC_DURATION.labels(method).observe(time.monotonic() - started)
+    RPC_IN_FLIGHT.labels(method).dec()
+    code = context.code()
+    if failed or (code is not None and code != grpc.StatusCode.OK):
+        RPC_ERRORS.labels(method, (code or grpc.StatusCode.UNKNOWN).name).inc()
+
+
+def _wrap(handler, behavior):
+    return grpc.unary_unary_rpc_method_handler(behavior, request_deserializer=handler.request_deserializer,
+                                               response_serializer=handler.response_serializer)
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        method = _method(handler_call_details)
+
+        def behavior(request, context):
+            started = time.monotonic()
+            RPC_IN_FLIGHT.labels(method).inc()
+            failed = True
+            try:
+                response = handler.unary_unary(request, context)
+                failed = False
+                return response
+            finally:
+                _finish(method, context, started, failed)
+        return _wrap(handler, behavior)
+
+
+class AsyncMetricsInterceptor(grpc.aio.ServerInterceptor):
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if handler is None or handler.unary_unary is None:
+            return handler
+        method = _method(handler_call_details)
+
+        async def behavior(request, context):
+            started = time.monotonic()
+            RPC_IN_FLIGHT.labels(method).inc()
+            failed = True
+            try:
+                response = await handler.unary_unary(request, context)
+                failed = False
+                return response
+            finally:
+                _finish(method, context, started, failed)
+        return _wrap(handler, behavior)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):  # pylint: disable=C0103
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=W0622
+        logger.debug('Metrics: ' + format, *args)
+
+
+class _MetricsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _MetricsServer6(_MetricsServer):
+    address_family = socket.AF_INET6
+
+
+def serve(address):
+    """Serves REGISTRY at http://address/metrics from a daemon thread, address is host:port or [host6]:port."""
+    host, port = address.rsplit(':', 1)
+    server_class = _MetricsServer6 if host.startswith('[') else _MetricsServer
+    server = server_class((host.strip('[]'), int(port)), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info('Metrics listening on http://%s/metrics', address)
+    return server
@@ -0,0 +1,176 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import os
+import re
+import time
+
+from .error import SofaStorageException
+from .metrics import timed
+
+FABRICS_DEVICE = 'nvme-fabrics'
+CONTROLLER_CLASS = os.path.join('class', 'nvme')
+# nvme<instance>n<ns> without native multipath, the hidden path nvme<subsystem>c<instance>n<ns> with it. Either way
+# the block device is nvme<first number>n<ns>
+NAMESPACE_ENTRY = re.compile(r'^nvme(\d+)(?:c\d+)?n(\d+)$')
+POLL_INTERVAL = 0.01
+# Controller states of controllers that are going away and will not come back
+GONE_STATES = (None, 'deleting', 'deleting (no IO)', 'dead')
+
+# nvme_transport option names, as bdev_nvme_attach_controller names them, to the kernel's fabrics options
+KERNEL_OPTIONS = {
+    'num_io_queues': 'nr_io_queues',
+    'ctrlr_loss_timeout_sec': 'ctrl_loss_tmo',
+    'reconnect_delay_sec': 'reconnect_delay',
+    'fast_io_fail_timeout_sec': 'fast_io_fail_tmo',
+}
+KERNEL_FLAGS = {
+    'hdgst': 'hdr_digest',
+    'ddgst': 'data_digest',
+}
+
+
+class NvmeFabricsException(SofaStorageException):
+
+    def __init__(self, action, reason):
+        super().__init__()
+        self.action = action
+        self.reason = reason
+
+    def __str__(self):
+        return f'NVMe-oF {self.action} failed: {self.reason}'
+
+
+def connectOptions(target, transport_options, hostnqn=None):
+    """The option string /dev/nvme-fabrics takes for target, a (trtype, traddr, trsvcid, subnqn) tuple."""
+    trtype, traddr, trsvcid, subnqn = target
+    options = [f'nqn={subnqn}', f'transport={trtype}', f'traddr={traddr}', f'trsvcid={trsvcid}']
+    if hostnqn:
+        options.append(f'hostnqn={hostnqn}')
+    for option, value in transport_options.items():
+        if option in KERNEL_OPTIONS:
+            options.append(f'{KERNEL_OPTIONS[option]}={value}')
+        elif option in KERNEL_FLAGS and value:
+            options.append(KERNEL_FLAGS[option])
+    return ','.join(options)
+
+
+def _parseAddress(address):
+    # e.g. traddr=192.168.0.10,trsvcid=4420,src_addr=192.168.0.2
+    return dict(part.split('=', 1) for part in address.split(',') if '=' in part)
+
+
+class NvmeFabrics():
+    """The NVMe-oF host of the Linux kernel.
+
+    Controllers are connected by writing an option string to /dev/nvme-fabrics and deleted through their sysfs
+    delete_controller file, without nvme-cli. The roots can point to a fake tree, see nvme_fabrics_fake.
+    """
+
+    def __init__(self, sysfs_root='/sys', dev_root='/dev'):
+        self.sysfs_root = sysfs_root
+        self.dev_root = dev_root
+
+    def _controllerPath(self, controller, *names):
+        return os.path.join(self.sysfs_root, CONTROLLER_CLASS, controller, *names)
+
+    def _read(self, controller, attribute):
+        try:
+            with open(self._controllerPath(controller, attribute), 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _write(self, options):
+        # The kernel answers the write of the options with instance=<n>,cntlid=<id> on the same file descriptor
+        fd = os.open(os.path.join(self.dev_root, FABRICS_DEVICE), os.O_RDWR)
+        try:
+            os.write(fd, options.encode('utf-8'))
+            return os.read(fd, 4096).decode('utf-8')
+        finally:
+            os.close(fd)
+
+    def _deleteController(self, controller):
+        with open(self._controllerPath(controller, 'delete_controller'), 'w', encoding='utf-8') as f:
+            f.write('1')
+
+    def _rescanController(self, controller):
+        with open(self._controllerPath(controller, 'rescan_controller'), 'w', encoding='utf-8') as f:
+            f.write('1')
+
+    def connect(self, target, transport_options, hostnqn=None):
+        """Connects a controller to target and returns its name, e.g. nvme3."""
+        with timed('nvme', 'connect'):
+            try:
+                response = self._write(connectOptions(target, transport_options, hostnqn))
+            except OSError as e:
+                raise NvmeFabricsException(f'connect to {target[3]}', e.strerror or e) from e
+        match = re.search(r'instance=(\d+)', response)
+        if match is None:
+            raise NvmeFabricsException(f'connect to {target[3]}', f'unexpected answer {response!r}')
+        return f'nvme{match.group(1)}'
+
+    def disconnect(self, controller):
+        with timed('nvme', 'disconnect'):
+            try:
+                self._deleteController(controller)
+            except FileNotFoundError:
+                pass  # Already gone
+            except OSError as e:
+                raise NvmeFabricsException(f'disconnect of {controller}', e.strerror or e) from e
+
+    def rescan(self, controller):
+        """Makes the kernel scan a controller for namespaces the target added since it connected."""
+        with timed('nvme', 'rescan'):
+            try:
+                self._rescanController(controller)
+            except OSError as e:
+                raise NvmeFabricsException(f'rescan of {controller}', e.strerror or e) from e
+
+    def state(self, controller):
+        """The state of a controller, e.g. live or connecting, None once it is gone."""
+        return self._read(controller, 'state')
+
+    def controllers(self):
+        """Fabrics controllers by name, with their target as a (trtype, traddr, trsvcid, subnqn) tuple and state."""
+        try:
+            names = os.listdir(os.path.join(self.sysfs_root, CONTROLLER_CLASS))
+        except FileNotFoundError:
+            return {}
+        controllers = {}
+        for name in names:
+            transport = self._read(name, 'transport')
+            if transport not in ('rdma', 'tcp', 'fc'):
+                continue  # PCIe and loop controllers are not ours
+            address = _parseAddress(self._read(name, 'address') or '')
+            target = (transport, address.get('traddr'), address.get('trsvcid'), self._read(name, 'subsysnqn'))
+            controllers[name] = {'target': target, 'state': self._read(name, 'state')}
+        return controllers
+
+    def namespaces(self, controller):
+        """Block device names of the namespaces of a controller by nsid, e.g. {1: 'nvme3n1'}."""
+        try:
+            entries = os.listdir(self._controllerPath(controller))
+        except FileNotFoundError:
+            return {}
+        namespaces = {}
+        for entry in entries:
+            match = NAMESPACE_ENTRY.match(entry)
+            if match is None:
+                continue
+            nsid = self._read(controller, os.path.join(entry, 'nsid'))
+            namespaces[int(nsid) if nsid else int(match.group(2))] = f'nvme{match.group(1)}n{match.group(2)}'
+        return namespaces
+
+    def waitForNamespace(self, controller, nsid, timeout):
+        """Returns the /dev path of a namespace once the kernel has scanned it and udev created its node."""
+        deadline = time.monotonic() + timeout
+        while True:
+            device = self.namespaces(controller).get(nsid)
+            if device is not None and os.path.exists(os.path.join(self.dev_root, device)):
+                return os.path.join(self.dev_root, device)
+            if time.monotonic() >= deadline:
+                raise NvmeFabricsException(f'namespace {nsid} of {controller}', f'no block device after {timeout} s')
+            time.sleep(POLL_INTERVAL)
@@ -0,0 +1,85 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import errno
+import os
+import shutil
+import threading
+import time
+
+from .nvme_fabrics import CONTROLLER_CLASS, NvmeFabrics
+
+
+class FakeNvmeFabrics(NvmeFabrics):
+    """NvmeFabrics on a sysfs and devfs tree under root, which it fills in the way the kernel and udev would.
+
+    namespaces maps a subsystem NQN to the nsids its controllers expose, [1] if it's not listed. It can be changed
+    later to add namespaces that a rescan then finds. Connecting to a subsystem NQN listed in unreachable fails like
+    an unreachable target, and delay slows every connect down.
+    """
+
+    def __init__(self, root, namespaces=None, unreachable=(), delay=0):
+        super().__init__(os.path.join(root, 'sys'), os.path.join(root, 'dev'))
+        os.makedirs(os.path.join(self.sysfs_root, CONTROLLER_CLASS), exist_ok=True)
+        os.makedirs(self.dev_root, exist_ok=True)
+        self.subsystems = namespaces if namespaces is not None else {}
+        self.unreachable = set(unreachable)
+        self.delay = delay
+        self.connects = 0
+        self.rescans = 0
+        self._lock = threading.Lock()
+
+    def _attribute(self, controller, name, value):
+        with open(self._controllerPath(controller, name), 'w', encoding='utf-8') as f:
+            f.write(value + '\n')
+
+    def _addNamespaces(self, controller):
+        instance = controller[len('nvme'):]
+        for nsid in self.subsystems.get(self._read(controller, 'subsysnqn'), [1]):
+            entry = f'nvme{instance}n{nsid}'
+            if not os.path.isdir(self._controllerPath(controller, entry)):
+                os.makedirs(self._controllerPath(controller, entry))
+                self._attribute(controller, os.path.join(entry, 'nsid'), str(nsid))
+                with open(os.path.join(self.dev_root, entry), 'w', encoding='utf-8'):
+                    pass
+
+    def _write(self, options):
+        options = dict(option.split('=', 1) if '=' in option else (option, '1') for option in options.split(','))
+        if self.delay:
+            time.sleep(self.delay)
+        if options['nqn'] in self.unreachable:
+            raise OSError(errno.ECONNREFUSED, os.strerror(errno.ECONNREFUSED))
+        with self._lock:
+            # Like the kernel, the lowest free instance
+            instance = 0
+            while os.path.isdir(self._controllerPath(f'nvme{instance}')):
+                instance += 1
+            controller = f'nvme{instance}'
+            os.makedirs(self._controllerPath(controller))
+            self.connects += 1
+        self._attribute(controller, 'transport', options['transport'])
+        self._attribute(controller, 'address', f'traddr={options["traddr"]},trsvcid={options["trsvcid"]}')
+        self._attribute(controller, 'subsysnqn', options['nqn'])
+        self._attribute(controller, 'state', 'live')
+        self._attribute(controller, 'options', ','.join(f'{key}={value}' for key, value in options.items()))
+        self._addNamespaces(controller)
+        return f'instance={instance},cntlid=1\n'
+
+    def _rescanController(self, controller):
+        if not os.path.isdir(self._controllerPath(controller)):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), self._controllerPath(controller))
+        with self._lock:
+            self.rescans += 1
+        self._addNamespaces(controller)
+
+    def _deleteController(self, controller):
+        if not os.path.isdir(self._controllerPath(controller)):
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), self._controllerPath(controller))
+        for device in self.namespaces(controller).values():
+            try:
+                os.unlink(os.path.join(self.dev_root, device))
+            except FileNotFoundError:
+                pass
+        shutil.rmtree(self._controllerPath(controller))
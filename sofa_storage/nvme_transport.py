@@ -0,0 +1,98 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+from .error import SofaStorageException
+
+ADDRESS_FAMILIES = ['ipv4', 'ipv6', 'ib', 'fc']
+
+
+class TransportOptionException(SofaStorageException):
+
+    def __init__(self, option, value, reason):
+        super().__init__()
+        self.option = option
+        self.value = value
+        self.reason = reason
+
+    def __str__(self):
+        return f'Invalid NVMe-oF transport option {self.option}={self.value}: {self.reason}'
+
+
+def _integer(minimum):
+    def parse(option, value):
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise TransportOptionException(option, value, 'expected an integer') from None
+        if number < minimum:
+            raise TransportOptionException(option, value, f'must be at least {minimum}')
+        return number
+    return parse
+
+
+def _boolean(option, value):
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ('true', '1', 'yes'):
+        return True
+    if str(value).lower() in ('false', '0', 'no'):
+        return False
+    raise TransportOptionException(option, value, 'expected true or false')
+
+
+def _addressFamily(option, value):
+    if str(value).lower() not in ADDRESS_FAMILIES:
+        raise TransportOptionException(option, value, f'expected one of {", ".join(ADDRESS_FAMILIES)}')
+    return str(value).lower()
+
+
+# volume_context keys and sofa_storage.yaml NVME_TRANSPORT_DEFAULTS keys, named like the bdev_nvme_attach_controller
+# parameters they set. Queue size and in-capsule data size are not per-controller settings of the SPDK NVMe-oF host.
+TRANSPORT_OPTIONS = {
+    'adrfam': _addressFamily,
+    'num_io_queues': _integer(1),
+    'hdgst': _boolean,
+    'ddgst': _boolean,
+    'ctrlr_loss_timeout_sec': _integer(-1),
+    'reconnect_delay_sec': _integer(0),
+    'fast_io_fail_timeout_sec': _integer(0),
+}
+
+
+def _checkReconnect(options):
+    # Same rules SPDK applies, checked here so a bad combination fails before anything is attached
+    ctrlr_loss = options.get('ctrlr_loss_timeout_sec', 0)
+    reconnect_delay = options.get('reconnect_delay_sec', 0)
+    fast_io_fail = options.get('fast_io_fail_timeout_sec', 0)
+    if ctrlr_loss == 0:
+        if reconnect_delay != 0 or fast_io_fail != 0:
+            raise TransportOptionException('ctrlr_loss_timeout_sec', ctrlr_loss,
+                                           'reconnect_delay_sec and fast_io_fail_timeout_sec need a controller loss timeout')
+        return
+    if reconnect_delay == 0:
+        raise TransportOptionException('reconnect_delay_sec', reconnect_delay, 'must be set with ctrlr_loss_timeout_sec')
+    if ctrlr_loss != -1 and reconnect_delay > ctrlr_loss:
+        raise TransportOptionException('reconnect_delay_sec', reconnect_delay, 'must not exceed ctrlr_loss_timeout_sec')
+    if fast_io_fail != 0:
+        if fast_io_fail < reconnect_delay:
+            raise TransportOptionException('fast_io_fail_timeout_sec', fast_io_fail, 'must not be less than reconnect_delay_sec')
+        if ctrlr_loss != -1 and fast_io_fail > ctrlr_loss:
+            raise TransportOptionException('fast_io_fail_timeout_sec', fast_io_fail, 'must not exceed ctrlr_loss_timeout_sec')
+
+
+def transportOptions(volume_context, defaults):
+    """Returns the validated bdev_nvme_attach_controller parameters of a volume, volume_context overriding defaults."""
+    options = {}
+    for source in (defaults, volume_context):
+        for option, parse in TRANSPORT_OPTIONS.items():
+            if option in source:
+                options[option] = parse(option, source[option])
+    _checkReconnect(options)
+    options.setdefault('adrfam', 'ipv4')
+    return options
+
+
+def hasTransportOptions(volume_context):
+    return any(option in volume_context for option in TRANSPORT_OPTIONS)
@@ -0,0 +1,72 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import fcntl
+import os
+import zlib
+from contextlib import contextmanager
+
+STRIPES = 64
+
+
+class ProcessLock():
+    """Exclusive lock shared by the worker processes of the DPU server, an flock on path.
+
+    Every hold opens its own file description, so threads of one process exclude each other as well. The file keeps
+    a generation count bumped by holders that change the guarded state, hold() tells whether another holder changed
+    it since this process last held the lock.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._seen = None
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    @contextmanager
+    def hold(self, update=True):
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            data = os.pread(fd, 8, 0)
+            generation = int.from_bytes(data, 'little') if len(data) == 8 else 0
+            failed = True
+            try:
+                yield generation != self._seen
+                failed = False
+            finally:
+                if update:
+                    generation += 1
+                    os.pwrite(fd, generation.to_bytes(8, 'little'), 0)
+                if not failed:
+                    # A holder that failed half way may have missed changes, it looks again next time
+                    self._seen = generation
+        finally:
+            os.close(fd)
+
+
+class StripedProcessLock():
+    """Cross-process locks on keys, hashed onto a fixed set of lock files in directory."""
+
+    def __init__(self, directory, stripes=STRIPES):
+        self._directory = directory
+        self._stripes = stripes
+        os.makedirs(directory, exist_ok=True)
+
+    def _stripe(self, key):
+        # Not hash(), which differs between processes unless they were forked from the same parent
+        return zlib.crc32(repr(key).encode('utf-8')) % self._stripes
+
+    @contextmanager
+    def hold(self, keys):
+        fds = []
+        try:
+            # Sorted like KeyedLock, so holders of overlapping stripes cannot deadlock
+            for stripe in sorted({self._stripe(key) for key in keys}):
+                fds.append(os.open(os.path.join(self._directory, f'key-{stripe:02d}.lock'), os.O_RDWR | os.O_CREAT, 0o600))
+                fcntl.flock(fds[-1], fcntl.LOCK_EX)
+            yield
+        finally:
+            for fd in reversed(fds):
+                os.close(fd)
@@ -0,0 +1,114 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent import futures
+
+from .log import logger
+
+PUBLISH = 'publish'
+UNPUBLISH = 'unpublish'
+
+
+class RequestCache():
+    """Deduplicates retried requests keyed on (operation, volume_id, ...), e.g. the target path and the arguments.
+
+    A request arriving while the same one is running waits for it and shares its outcome. A request that succeeded
+    less than ttl seconds ago returns its result at once, until another operation starts on the same volume. At most
+    size results are kept, a ttl of 0 disables the cache.
+    """
+
+    def __init__(self, ttl, size):
+        self._ttl = ttl
+        self._size = size
+        self._lock = threading.Lock()
+        self._running = {}
+        self._done = OrderedDict()
+        self._volumes = {}
+
+    def _drop(self, key):
+        self._done.pop(key, None)
+        keys = self._volumes.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._volumes[key[1]]
+
+    def _forget(self, volume_id, keep=None):
+        # Called with the lock held, a publish must not be answered from cache once an unpublish ran and vice versa
+        for key in [key for key in self._volumes.get(volume_id, ()) if key != keep]:
+            self._drop(key)
+
+    def invalidate(self, volume_ids):
+        """Drops the results of volumes changed without going through the cache, e.g. by a batch request."""
+        with self._lock:
+            for volume_id in set(volume_ids):
+                self._forget(volume_id)
+
+    def _join(self, key):
+        with self._lock:
+            entry = self._done.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self._ttl:
+                return 'done', entry[0]
+            self._drop(key)
+            future = self._running.get(key)
+            if future is not None:
+                return 'running', future
+            self._forget(key[1], key)
+            future = self._running[key] = futures.Future()
+            return 'owner', future
+
+    def _finish(self, key, future, result=None, error=None):
+        with self._lock:
+            del self._running[key]
+            if error is None:
+                self._forget(key[1], key)
+                self._done[key] = (result, time.monotonic())
+                self._volumes.setdefault(key[1], set()).add(key)
+                while len(self._done) > self._size:
+                    self._drop(next(iter(self._done)))
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def call(self, key, method, *args):
+        if self._ttl <= 0:
+            return method(*args)
+        state, value = self._join(key)
+        if state == 'done':
+            logger.debug('Request %s answered from cache', key)
+            return value
+        if state == 'running':
+            logger.debug('Request %s joined the running one', key)
+            return value.result()
+        try:
+            result = method(*args)
+        except BaseException as e:
+            self._finish(key, value, error=e)
+            raise
+        self._finish(key, value, result)
+        return result
+
+    async def callAsync(self, key, method, *args):
+        if self._ttl <= 0:
+            return await method(*args)
+        state, value = self._join(key)
+        if state == 'done':
+            logger.debug('Request %s answered from cache', key)
+            return value
+        if state == 'running':
+            logger.debug('Request %s joined the running one', key)
+            return await asyncio.wrap_future(value)
+        try:
+            result = await method(*args)
+        except BaseException as e:
+            self._finish(key, value, error=e)
+            raise
+        self._finish(key, value, result)
+        return result
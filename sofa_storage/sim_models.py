@@ -0,0 +1,86 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import os
+import threading
+
+from random import Random
+
+from .error import SofaStorageException
+
+
+class SimModelException(SofaStorageException):
+
+    def __init__(self, name, spec, reason):
+        super().__init__()
+        self.name = name
+        self.spec = spec
+        self.reason = reason
+
+    def __str__(self):
+        return f'Invalid simulator model for {self.name} {self.spec!r}: {self.reason}'
+
+
+# Distribution name to the sampler of a latency in seconds and its parameters
+DISTRIBUTIONS = {
+    'constant': (lambda rng, value: value, ('value',)),
+    'uniform': (lambda rng, low, high: rng.uniform(low, high), ('low', 'high')),
+    'normal': (lambda rng, mean, stddev: max(0.0, rng.gauss(mean, stddev)), ('mean', 'stddev')),
+    'lognormal': (lambda rng, median, sigma: rng.lognormvariate(0, sigma) * median, ('median', 'sigma')),
+    'exponential': (lambda rng, mean: rng.expovariate(1 / mean) if mean > 0 else 0.0, ('mean',)),
+}
+
+
+def latencyModel(name, spec):
+    """Sampler of latencies for spec, e.g. {'distribution': 'lognormal', 'median': 0.002, 'sigma': 0.5}."""
+    if not isinstance(spec, dict) or spec.get('distribution') not in DISTRIBUTIONS:
+        raise SimModelException(name, spec, f'expected a distribution, one of {", ".join(DISTRIBUTIONS)}')
+    sample, parameters = DISTRIBUTIONS[spec['distribution']]
+    try:
+        values = [float(spec[parameter]) for parameter in parameters]
+    except KeyError as e:
+        raise SimModelException(name, spec, f'missing {e.args[0]}') from None
+    except (TypeError, ValueError):
+        raise SimModelException(name, spec, 'parameters must be numbers') from None
+    if any(value < 0 for value in values):
+        raise SimModelException(name, spec, 'parameters must not be negative')
+    return lambda rng: sample(rng, *values)
+
+
+def failureRate(name, rate):
+    try:
+        rate = float(rate)
+    except (TypeError, ValueError):
+        raise SimModelException(name, rate, 'expected a probability') from None
+    if not 0 <= rate <= 1:
+        raise SimModelException(name, rate, 'must be between 0 and 1')
+    return rate
+
+
+class Draws():
+    """Random streams that depend only on the seed and the call they are drawn for, not on thread scheduling.
+
+    The n-th call of a method for a key, e.g. the volume id, always draws the same numbers for the same seed. The
+    count restarts once the key is forgotten, e.g. when its volume is unpublished.
+    """
+
+    def __init__(self, seed=None):
+        self._seed = seed if seed is not None else int.from_bytes(os.urandom(8), 'little')
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    @property
+    def seed(self):
+        return self._seed
+
+    def stream(self, method, key):
+        with self._lock:
+            calls = self._calls.setdefault(key, {})
+            call = calls[method] = calls.get(method, 0) + 1
+        return Random(f'{self._seed}:{method}:{key}:{call}')  # nosec, simulated latencies are not secrets
+
+    def forget(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
@@ -0,0 +1,217 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import contextvars
+import json
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+
+import grpc
+
+TRACEPARENT_KEY = 'traceparent'
+TRACEPARENT = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+SpanContext = namedtuple('SpanContext', ['trace_id', 'span_id'])
+
+_current = contextvars.ContextVar('sofa_storage_span', default=None)
+_exporter = None
+_service = None
+
+
+class SpanExporter():
+    """Receives every finished span as a dict, export() is called on the thread that ended the span."""
+
+    def export(self, record):
+        pass
+
+
+class JsonlExporter(SpanExporter):
+    """Appends spans as JSON lines to a local file, which dpu_cli trace-show renders as waterfalls."""
+
+    def __init__(self, path):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')  # pylint: disable=R1732
+
+    def export(self, record):
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+
+def configure(service, exporter):
+    """Turns tracing on for this process, spans are tagged with service. An exporter of None turns it off."""
+    global _exporter, _service  # pylint: disable=W0603
+    _service = service
+    _exporter = exporter
+
+
+class Span():
+
+    def __init__(self, name, parent, attributes):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = attributes
+        self._token = None
+        self._start = None
+        self._started = None
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self._start = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self._started
+        _current.reset(self._token)
+        exporter = _exporter
+        if exporter is None:
+            return
+        record = {'trace_id': self.trace_id, 'span_id': self.span_id, 'parent_id': self.parent_id, 'name': self.name,
+                  'service': _service, 'start': self._start, 'duration': duration, 'attributes': self.attributes}
+        if exc_value is not None:
+            record['error'] = str(exc_value) or exc_type.__name__
+        exporter.export(record)
+
+
+class _NoSpan():
+
+    @property
+    def attributes(self):
+        return {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name, parent=None, **attributes):
+    """Context manager timing a step as a child of parent, or of the current span, or as a new trace."""
+    if _exporter is None:
+        return _NO_SPAN
+    return Span(name, parent if parent is not None else _current.get(), attributes)
+
+
+def metadata():
+    """gRPC metadata carrying the current span as a W3C traceparent, to continue the trace in the called server."""
+    current = _current.get()
+    if current is None:
+        return []
+    return [(TRACEPARENT_KEY, f'00-{current.trace_id}-{current.span_id}-01')]
+
+
+def _remoteParent(handler_call_details):
+    for key, value in handler_call_details.invocation_metadata or ():
+        if key == TRACEPARENT_KEY:
+            match = TRACEPARENT.match(value)
+            return SpanContext(match.group(1), match.group(2)) if match else None
+    return None
+
+
+def _wrap(handler, behavior):
+    return grpc.unary_unary_rpc_method_handler(behavior, request_deserializer=handler.request_deserializer,
+                                               response_serializer=handler.response_serializer)
+
+
+def _setCode(server_span, context):
+    code = context.code()
+    if code is not None:
+        server_span.attributes['code'] = code.name
+
+
+class TracingInterceptor(grpc.ServerInterceptor):
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if _exporter is None or handler is None or handler.unary_unary is None:
+            return handler
+
+        def behavior(request, context):
+            with span(handler_call_details.method, _remoteParent(handler_call_details)) as server_span:
+                try:
+                    return handler.unary_unary(request, context)
+                finally:
+                    _setCode(server_span, context)
+        return _wrap(handler, behavior)
+
+
+class AsyncTracingInterceptor(grpc.aio.ServerInterceptor):
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        if _exporter is None or handler is None or handler.unary_unary is None:
+            return handler
+
+        async def behavior(request, context):
+            with span(handler_call_details.method, _remoteParent(handler_call_details)) as server_span:
+                try:
+                    return await handler.unary_unary(request, context)
+                finally:
+                    _setCode(server_span, context)
+        return _wrap(handler, behavior)
+
+
+class ClientInterceptor(grpc.UnaryUnaryClientInterceptor):
+    """Wraps outgoing calls in a client span and passes it on in the traceparent metadata."""
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        if _exporter is None:
+            return continuation(client_call_details, request)
+        with span(client_call_details.method) as client_span:
+            details = client_call_details._replace(metadata=list(client_call_details.metadata or []) + metadata())
+            response = continuation(details, request)
+            client_span.attributes['code'] = response.code().name
+            return response
+
+
+def readSpans(paths):
+    spans = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue
+    return spans
+
+
+def waterfall(spans, trace_id=None):
+    """Renders each trace as one line per span, indented under its parent, with start offsets and durations."""
+    traces = {}
+    for entry in spans:
+        if trace_id is None or entry['trace_id'] == trace_id:
+            traces.setdefault(entry['trace_id'], []).append(entry)
+
+    lines = []
+    for trace in sorted(traces.values(), key=lambda trace: min(entry['start'] for entry in trace)):
+        start = min(entry['start'] for entry in trace)
+        ids = {entry['span_id'] for entry in trace}
+        children = {}
+        for entry in sorted(trace, key=lambda entry: entry['start']):
+            parent = entry['parent_id'] if entry['parent_id'] in ids else None
+            children.setdefault(parent, []).append(entry)
+
+        lines.append(f'trace {trace[0]["trace_id"]}')
+        stack = [(entry, 1) for entry in reversed(children.get(None, []))]
+        while stack:
+            entry, depth = stack.pop()
+            error = f' ERROR {entry["error"]}' if 'error' in entry else ''
+            lines.append(f'{(entry["start"] - start) * 1000:10.3f} ms {entry["duration"] * 1000:10.3f} ms '
+                         f'{"  " * depth}{entry["name"]} [{entry["service"]}]{error}')
+            stack.extend((child, depth + 1) for child in reversed(children.get(entry['span_id'], [])))
+    return lines
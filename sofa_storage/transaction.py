@@ -0,0 +1,51 @@
+"""
+  Copyright (c) 2021 International Business Machines
+  All rights reserved.
+  SPDX-License-Identifier: Apache-2.0
+"""
+import time
+
+from .log import logger
+from .error import SofaStorageException
+
+
+class Transaction():
+    """Runs backend steps in order and undoes the completed ones in reverse order if a later step fails."""
+
+    def __init__(self, name):
+        self.name = name
+        self.timings = []
+        self._undo = []
+
+    def step(self, name, do, undo=None):
+        start = time.monotonic()
+        try:
+            result = do()
+        finally:
+            self.timings.append((name, time.monotonic() - start))
+        if undo is not None:
+            self._undo.append((name, undo))
+        return result
+
+    def rollback(self):
+        while self._undo:
+            name, undo = self._undo.pop()
+            try:
+                undo()
+            except (SofaStorageException, OSError) as e:
+                logger.error('%s: undoing %s failed: %s', self.name, name, e)
+
+    def summary(self):
+        total = sum(duration for _, duration in self.timings)
+        steps = ', '.join(f'{name} {duration * 1000:.1f} ms' for name, duration in self.timings)
+        return f'{self.name} took {total * 1000:.1f} ms ({steps})'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            logger.error('%s failed, rolling back: %s', self.name, exc)
+            self.rollback()
+        logger.info(self.summary())
+        return False